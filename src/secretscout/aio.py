@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from .config import is_excluded
+from .git import _split_z
+from .models import Finding
+from .scanner import (
+    exclude_patterns,
+    max_file_size_for,
+    prepare_scan,
+    read_file,
+    scan_bytes,
+    skip_content,
+    walk_files,
+)
+
+# asyncio front end for services that run many scans on one event loop.
+#
+# File reads and cache hashing go to the loop's default thread pool; the regex work goes to
+# the `executor` the caller passes, so concurrent scans share one worker pool instead of each
+# starting its own. scan_bytes and its keyword arguments are picklable, so a
+# ProcessPoolExecutor works as well as a thread pool. `concurrency` bounds the files in flight
+# per scan: when the consumer stops iterating, reading stops too.
+#
+# Per-file time budgets (scan.file_timeout) are not applied here; use the executor's own
+# limits or the synchronous scan_path for that.
+
+_DONE = object()
+
+
+async def _arun_git(args: list[str], cwd: Path) -> tuple[int, bytes]:
+    proc = await asyncio.create_subprocess_exec(
+        "git",
+        *args,
+        cwd=str(cwd),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    out, _ = await proc.communicate()
+    return proc.returncode or 0, out
+
+
+async def ais_git_repo(root: Path) -> bool:
+    code, out = await _arun_git(["rev-parse", "--is-inside-work-tree"], cwd=root)
+    return code == 0 and out.strip() == b"true"
+
+
+async def atracked_files(root: Path) -> list[str]:
+    code, out = await _arun_git(["ls-files", "-z"], cwd=root)
+    return _split_z(out) if code == 0 else []
+
+
+async def astaged_files(root: Path) -> list[str]:
+    code, out = await _arun_git(["diff", "--cached", "--name-only", "--relative", "-z"], cwd=root)
+    return _split_z(out) if code == 0 else []
+
+
+async def aread_staged_file(root: Path, rel_path: str) -> bytes | None:
+    code, out = await _arun_git(["show", f":./{rel_path}"], cwd=root)
+    return out if code == 0 else None
+
+
+async def _list_files(root: Path, mode: str, patterns: list[str]) -> tuple[list[str], bool]:
+    if mode in ("staged", "tracked") and await ais_git_repo(root):
+        staged = mode == "staged"
+        files = await (astaged_files(root) if staged else atracked_files(root))
+        return [rel for rel in files if not is_excluded(rel, patterns)], staged
+    walked = await asyncio.to_thread(lambda: [rel for rel, _ in walk_files(root, patterns)])
+    return walked, False
+
+
+async def ascan_bytes(
+    rel_path: str,
+    content: bytes,
+    executor: Executor | None = None,
+    **scan_kwargs: Any,
+) -> list[Finding]:
+    """Run scan_bytes in `executor`; `scan_kwargs` as for scan_bytes (see prepare_scan)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(scan_bytes, rel_path, content, **scan_kwargs))
+
+
+async def aiter_findings(
+    root: Path,
+    mode: str = "tracked",
+    baseline_path: Path | None = None,
+    extra_exclude: list[str] | None = None,
+    use_cache: bool = True,
+    regex_engine: str | None = None,
+    executor: Executor | None = None,
+    concurrency: int = 8,
+) -> AsyncIterator[Finding]:
+    setup = await asyncio.to_thread(prepare_scan, root, baseline_path, use_cache, regex_engine, 0.0)
+    cfg = setup.cfg
+    patterns = await asyncio.to_thread(exclude_patterns, root, cfg, extra_exclude)
+    if use_cache:
+        await asyncio.to_thread(setup.cache.load)
+    rels, staged = await _list_files(root, mode, patterns)
+
+    async def scan_one(rel: str) -> list[Finding]:
+        if staged:
+            content = await aread_staged_file(root, rel)
+        else:
+            content = await asyncio.to_thread(read_file, root / rel, max_file_size_for(rel, cfg))
+        if content is None or skip_content(content, cfg):
+            return []
+        if use_cache:
+            cached = await asyncio.to_thread(setup.cache.get, rel, content)
+            if cached is not None:
+                return [f for f in map(Finding.from_dict, cached) if f.fingerprint not in setup.baseline]
+        out = await ascan_bytes(rel, content, executor, **setup.scan_kwargs)
+        if use_cache:
+            await asyncio.to_thread(setup.cache.put, rel, content, [f.to_dict() for f in out])
+        return [f for f in out if f.fingerprint not in setup.baseline]
+
+    sem = asyncio.Semaphore(max(1, concurrency))
+    results: asyncio.Queue[Any] = asyncio.Queue(maxsize=max(1, concurrency))
+    running: set[asyncio.Task[None]] = set()
+
+    async def run(rel: str) -> None:
+        try:
+            try:
+                item: Any = await scan_one(rel)
+            except Exception as err:
+                item = err
+            await results.put(item)
+        finally:
+            sem.release()
+
+    async def produce() -> None:
+        for rel in rels:
+            await sem.acquire()
+            task = asyncio.create_task(run(rel))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        await asyncio.gather(*running)
+        await results.put(_DONE)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await results.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            for f in item:
+                yield f
+        if use_cache:
+            await asyncio.to_thread(setup.cache.save)
+    finally:
+        producer.cancel()
+        for task in list(running):
+            task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await asyncio.gather(producer, *running, return_exceptions=True)
+        setup.close()
+
+
+async def ascan_path(
+    root: Path,
+    mode: str = "tracked",
+    baseline_path: Path | None = None,
+    extra_exclude: list[str] | None = None,
+    use_cache: bool = True,
+    regex_engine: str | None = None,
+    executor: Executor | None = None,
+    concurrency: int = 8,
+) -> list[Finding]:
+    return [
+        f
+        async for f in aiter_findings(
+            root,
+            mode=mode,
+            baseline_path=baseline_path,
+            extra_exclude=extra_exclude,
+            use_cache=use_cache,
+            regex_engine=regex_engine,
+            executor=executor,
+            concurrency=concurrency,
+        )
+    ]
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from .models import Finding
+
+BaselineFormat = Literal["json", "binary"]
+
+# Binary layout: header | bloom filter bits | sorted raw sha256 digests (32 bytes each).
+MAGIC = b"SSBASE01"
+BINARY_SUFFIX = ".bin"
+_HEADER = struct.Struct("<8sQQI4x")  # magic, digest count, bloom bits, bloom hash count
+DIGEST_SIZE = 32
+BLOOM_BITS_PER_ENTRY = 10
+BLOOM_HASHES = 7
+
+
+@dataclass
+class BaselineMeta:
+    """What `baseline --update` needs to rescan only what changed since the baseline."""
+
+    commit: str | None  # HEAD when the baseline was written
+    mode: str  # "tracked" or "all"
+    config: str  # config_hash of the tree; another config means a full rescan
+    created_at: float
+    # Fingerprints per file, so the baseline entries of changed or deleted files can be found.
+    files: dict[str, list[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BaselineMeta:
+        files = data.get("files") or {}
+        return cls(
+            commit=data.get("commit") or None,
+            mode=str(data.get("mode", "")),
+            config=str(data.get("config", "")),
+            created_at=float(data.get("created_at", 0.0)),
+            files={str(k): [str(fp) for fp in v] for k, v in files.items() if isinstance(v, list)},
+        )
+
+
+def meta_path(path: Path) -> Path:
+    """Sidecar holding the metadata of a binary baseline."""
+    return path.with_name(path.name + ".meta.json")
+
+
+def _bloom_nbytes(bits: int) -> int:
+    # Keep the digest table 8-byte aligned.
+    return ((bits + 63) // 64) * 8
+
+
+def _bloom_positions(digest: bytes, bits: int, k: int) -> Iterator[int]:
+    # Fingerprints are sha256 digests, so their bytes are already uniformly distributed.
+    h1 = int.from_bytes(digest[0:8], "little")
+    h2 = int.from_bytes(digest[8:16], "little") | 1
+    for i in range(k):
+        yield (h1 + i * h2) % bits
+
+
+class BinaryBaseline:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fh = path.open("rb")
+        try:
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._fh.close()
+            raise ValueError(f"Invalid binary baseline: {path}") from None
+        if len(self._mm) < _HEADER.size:
+            self.close()
+            raise ValueError(f"Invalid binary baseline: {path}")
+        magic, count, bits, k = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Invalid binary baseline: {path}")
+        self._count = int(count)
+        self._bits = int(bits)
+        self._k = int(k)
+        self._bloom_off = _HEADER.size
+        self._data_off = _HEADER.size + _bloom_nbytes(self._bits)
+        if len(self._mm) < self._data_off + self._count * DIGEST_SIZE:
+            self.close()
+            raise ValueError(f"Truncated binary baseline: {path}")
+
+    def close(self) -> None:
+        mm = getattr(self, "_mm", None)
+        if mm is not None:
+            mm.close()
+        self._fh.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        mm = self._mm
+        for i in range(self._count):
+            s = self._data_off + i * DIGEST_SIZE
+            yield mm[s : s + DIGEST_SIZE].hex()
+
+    def _bloom_may_contain(self, digest: bytes) -> bool:
+        mm = self._mm
+        base = self._bloom_off
+        for pos in _bloom_positions(digest, self._bits, self._k):
+            if not mm[base + (pos >> 3)] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def __contains__(self, fp: object) -> bool:
+        if not isinstance(fp, str) or len(fp) != DIGEST_SIZE * 2:
+            return False
+        try:
+            digest = bytes.fromhex(fp)
+        except ValueError:
+            return False
+        if self._bits and not self._bloom_may_contain(digest):
+            return False
+
+        mm = self._mm
+        off = self._data_off
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            s = off + mid * DIGEST_SIZE
+            cur = mm[s : s + DIGEST_SIZE]
+            if cur < digest:
+                lo = mid + 1
+            elif cur > digest:
+                hi = mid
+            else:
+                return True
+        return False
+
+
+def is_binary_baseline(path: Path) -> bool:
+    with path.open("rb") as fh:
+        return fh.read(len(MAGIC)) == MAGIC
+
+
+def load_baseline(path: Path | None) -> set[str] | BinaryBaseline:
+    if not path or not path.exists():
+        return set()
+    if is_binary_baseline(path):
+        return BinaryBaseline(path)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    fps = data.get("fingerprints", data) if isinstance(data, dict) else data
+    return {str(x) for x in fps} if isinstance(fps, list) else set()
+
+
+def without_known(findings: Iterable[Finding], path: Path | None) -> list[Finding]:
+    """The findings whose fingerprint is not in the baseline at `path`."""
+    known = load_baseline(path)
+    try:
+        return [f for f in findings if f.fingerprint not in known]
+    finally:
+        if isinstance(known, BinaryBaseline):
+            known.close()
+
+
+def load_baseline_meta(path: Path) -> BaselineMeta | None:
+    if is_binary_baseline(path):
+        side = meta_path(path)
+        data = json.loads(side.read_text(encoding="utf-8")) if side.exists() else None
+    else:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        data = raw.get("metadata") if isinstance(raw, dict) else None
+    return BaselineMeta.from_dict(data) if isinstance(data, dict) else None
+
+
+def write_json_baseline(path: Path, fingerprints: Iterable[str], meta: BaselineMeta | None = None) -> int:
+    fps = sorted(set(fingerprints))
+    data: dict[str, Any] = {"fingerprints": fps}
+    if meta is not None:
+        data["metadata"] = asdict(meta)
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return len(fps)
+
+
+def write_binary_baseline(path: Path, fingerprints: Iterable[str], bloom: bool = True) -> int:
+    digests = sorted({bytes.fromhex(fp) for fp in fingerprints})
+    for d in digests:
+        if len(d) != DIGEST_SIZE:
+            raise ValueError(f"Fingerprint is not a sha256 digest: {d.hex()}")
+
+    bits = max(64, len(digests) * BLOOM_BITS_PER_ENTRY) if bloom and digests else 0
+    k = BLOOM_HASHES if bits else 0
+    filt = bytearray(_bloom_nbytes(bits))
+    for d in digests if bits else ():
+        for pos in _bloom_positions(d, bits, k):
+            filt[pos >> 3] |= 1 << (pos & 7)
+
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, len(digests), bits, k))
+        fh.write(filt)
+        fh.write(b"".join(digests))
+    tmp.replace(path)
+    return len(digests)
+
+
+def format_for_path(path: Path) -> BaselineFormat:
+    # Binary only when asked for by name: a `.txt` or extensionless output stays readable.
+    return "binary" if path.suffix.lower() == BINARY_SUFFIX else "json"
+
+
+def write_baseline(
+    path: Path,
+    fingerprints: Iterable[str],
+    fmt: BaselineFormat | None = None,
+    meta: BaselineMeta | None = None,
+) -> int:
+    fmt = fmt or format_for_path(path)
+    if fmt == "binary":
+        count = write_binary_baseline(path, fingerprints)
+        if meta is not None:
+            meta_path(path).write_text(json.dumps(asdict(meta), indent=2), encoding="utf-8")
+        return count
+    return write_json_baseline(path, fingerprints, meta)
+
+
+def convert_baseline(src: Path, dst: Path, fmt: BaselineFormat | None = None) -> int:
+    if not src.exists():
+        raise FileNotFoundError(src)
+    baseline = load_baseline(src)
+    try:
+        return write_baseline(dst, baseline, fmt=fmt)
+    finally:
+        if isinstance(baseline, BinaryBaseline):
+            baseline.close()
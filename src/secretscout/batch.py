@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .models import Finding
+from .reporting import minimal_line, print_table, sort_findings, summarize, to_sarif_runs
+from .scanner import (
+    ScanSetup,
+    iter_files,
+    max_file_size_for,
+    prepare_scan,
+    read_file,
+    scan_bytes,
+    skip_content,
+)
+
+# Files are sent to workers in batches so per-task overhead (pickling the rules, IPC) is paid
+# per batch rather than per file, whatever the size of each repository.
+BATCH_FILES = 64
+BATCH_BYTES = 1024 * 1024
+
+
+@dataclass
+class RepoResult:
+    root: Path
+    findings: list[Finding] = field(default_factory=list)
+    files: int = 0
+    started_at: str = ""
+    duration: float = 0.0
+    error: str | None = None
+    exit_code: int = 0
+
+
+@dataclass
+class _Repo:
+    result: RepoResult
+    setup: ScanSetup
+    t0: float
+    pending: int = 0
+    listed: bool = False
+
+
+def read_roots(path: Path) -> list[Path]:
+    roots: list[Path] = []
+    for raw in path.read_text(encoding="utf-8").splitlines():
+        line = raw.strip()
+        if line and not line.startswith("#"):
+            roots.append(Path(line))
+    return roots
+
+
+def _scan_batch(batch: list[tuple[str, bytes]], scan_kwargs: dict[str, Any]) -> list[list[Finding]]:
+    return [scan_bytes(rel, content, **scan_kwargs) for rel, content in batch]
+
+
+class _InlineExecutor(Executor):
+    def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future[Any]:
+        fut: Future[Any] = Future()
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except Exception as err:
+            fut.set_exception(err)
+        return fut
+
+
+def _list_repo(
+    pool: Executor,
+    repo: _Repo,
+    mode: str,
+    extra_exclude: list[str] | None,
+    submit: Callable[[Executor, _Repo, list[tuple[str, bytes]]], None],
+) -> None:
+    result, setup = repo.result, repo.setup
+    batch: list[tuple[str, bytes]] = []
+    size = 0
+    for rel, staged_content in iter_files(result.root, mode=mode, extra_exclude=extra_exclude):
+        content = staged_content
+        if content is None:
+            content = read_file(result.root / rel, max_file_size_for(rel, setup.cfg))
+        if content is None or skip_content(content, setup.cfg):
+            continue
+        result.files += 1
+        if setup.use_cache:
+            cached = setup.cache.get(rel, content)
+            if cached is not None:
+                result.findings.extend(f for f in map(Finding.from_dict, cached) if f.fingerprint not in setup.baseline)
+                continue
+        batch.append((rel, content))
+        size += len(content)
+        if len(batch) >= BATCH_FILES or size >= BATCH_BYTES:
+            submit(pool, repo, batch)
+            batch, size = [], 0
+    if batch:
+        submit(pool, repo, batch)
+
+
+def scan_many(
+    roots: list[Path],
+    mode: str = "tracked",
+    baseline_path: Path | None = None,
+    extra_exclude: list[str] | None = None,
+    use_cache: bool = True,
+    jobs: int | None = None,
+    regex_engine: str | None = None,
+) -> list[RepoResult]:
+    """Scan several repositories on one shared pool of worker processes.
+
+    Each repository keeps its own config, ignore patterns, rule packs and cache; the files of
+    all of them feed the same workers, so small repositories do not leave cores idle.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    results = [RepoResult(root=r.resolve()) for r in roots]
+    in_flight: dict[Future[list[list[Finding]]], tuple[_Repo, list[tuple[str, bytes]]]] = {}
+
+    def finish(repo: _Repo) -> None:
+        try:
+            if repo.setup.use_cache:
+                repo.setup.cache.save()
+        finally:
+            repo.setup.close()
+        repo.result.duration = time.perf_counter() - repo.t0
+
+    def collect(done: set[Future[list[list[Finding]]]]) -> None:
+        for fut in done:
+            repo, batch = in_flight.pop(fut)
+            repo.pending -= 1
+            try:
+                outs = fut.result()
+            except Exception as err:
+                repo.result.error = f"{type(err).__name__}: {err}"
+                outs = []
+            for (rel, content), out in zip(batch, outs, strict=False):
+                if repo.setup.use_cache:
+                    repo.setup.cache.put(rel, content, [f.to_dict() for f in out])
+                repo.result.findings.extend(f for f in out if f.fingerprint not in repo.setup.baseline)
+            if repo.listed and not repo.pending:
+                finish(repo)
+
+    def submit(pool: Executor, repo: _Repo, batch: list[tuple[str, bytes]]) -> None:
+        # Bound the work queued ahead of the workers so memory does not grow with the repo count.
+        while len(in_flight) >= jobs * 4:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+        fut = pool.submit(_scan_batch, batch, repo.setup.scan_kwargs)
+        in_flight[fut] = (repo, batch)
+        repo.pending += 1
+
+    pool: Executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else _InlineExecutor()
+    with pool:
+        for result in results:
+            result.started_at = datetime.now(timezone.utc).isoformat()
+            t0 = time.perf_counter()
+            setup = None
+            try:
+                if not result.root.is_dir():
+                    raise FileNotFoundError(f"not a directory: {result.root}")
+                setup = prepare_scan(
+                    result.root, baseline_path, use_cache=use_cache, regex_engine=regex_engine, file_timeout=0.0
+                )
+                if use_cache:
+                    setup.cache.load()
+            except Exception as err:
+                result.error = f"{type(err).__name__}: {err}"
+                if setup is not None:
+                    setup.close()
+                continue
+            repo = _Repo(result=result, setup=setup, t0=t0)
+            try:
+                _list_repo(pool, repo, mode, extra_exclude, submit)
+            except Exception as err:
+                result.error = f"{type(err).__name__}: {err}"
+            finally:
+                repo.listed = True
+                if not repo.pending:
+                    finish(repo)
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+    return results
+
+
+MANY_FORMATS = ("table", "minimal", "json", "ndjson", "sarif")
+
+
+def render_many(results: list[RepoResult], fmt: str, max_findings: int) -> str | None:
+    """The report as text, or None for `table`, which is printed to the terminal."""
+    if fmt == "json":
+        payload = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "count": sum(len(r.findings) for r in results),
+            "summary": summarize(f for r in results for f in r.findings),
+            "repos": [
+                {
+                    "root": str(r.root),
+                    "exit_code": r.exit_code,
+                    "error": r.error,
+                    "files": r.files,
+                    "duration_s": r.duration,
+                    "count": len(r.findings),
+                    "summary": summarize(r.findings),
+                    "findings": [f.to_dict() for f in sort_findings(r.findings)],
+                }
+                for r in results
+            ],
+        }
+        return json.dumps(payload, ensure_ascii=False, indent=2)
+    if fmt == "ndjson":
+        return "\n".join(
+            json.dumps({"repo": str(r.root), **f.to_dict()}, ensure_ascii=False)
+            for r in results
+            for f in sort_findings(r.findings)
+        )
+    if fmt == "sarif":
+        return to_sarif_runs([(r.root.as_uri() + "/", r.findings) for r in results])
+    if fmt == "minimal":
+        lines: list[str] = []
+        for r in results:
+            if r.error:
+                lines.append(f"{r.root}\terror\t{r.error}")
+            lines.extend(f"{r.root}\t{minimal_line(f)}" for f in sort_findings(r.findings)[:max_findings])
+        return "\n".join(lines)
+    if fmt == "table":
+        _print_many_table(results, max_findings)
+        return None
+    raise ValueError(f"Format not supported by scan-many: {fmt} (expected one of: {', '.join(MANY_FORMATS)})")
+
+
+def _print_many_table(results: list[RepoResult], max_findings: int) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="SecretScout repositories")
+    table.add_column("Repository", style="bold")
+    table.add_column("Files", justify="right")
+    table.add_column("Findings", justify="right")
+    table.add_column("By severity")
+    table.add_column("Exit", justify="right")
+    for r in results:
+        by_sev = ", ".join(f"{k}: {v}" for k, v in summarize(r.findings).items())
+        table.add_row(str(r.root), str(r.files), str(len(r.findings)), r.error or by_sev, str(r.exit_code))
+    Console().print(table)
+    for r in results:
+        if r.findings:
+            Console().print(f"\n[bold]{r.root}[/bold]")
+            print_table(r.findings, max_findings=max_findings)
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import base64
+import json
+import platform
+import random
+import shutil
+import string
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore
+
+CORPUS_KINDS = ("source", "minified", "logs", "pem", "binary")
+
+# Throughput metrics regress when they drop, time metrics when they grow.
+HIGHER_IS_BETTER = ("files_per_s", "mb_per_s")
+LOWER_IS_BETTER = ("cold_s", "warm_s")
+
+_ALNUM = string.ascii_letters + string.digits
+
+
+@dataclass
+class CorpusInfo:
+    root: str
+    seed: int
+    density: float
+    files: int = 0
+    bytes: int = 0
+    secrets: int = 0
+    by_kind: dict[str, int] = field(default_factory=dict)
+
+
+def _rand(rng: random.Random, n: int, alphabet: str = _ALNUM) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+def fake_secret(rng: random.Random) -> str:
+    # Synthetic values that only match rule shapes; none of them is a real credential.
+    kind = rng.randrange(5)
+    if kind == 0:
+        return "ghp_" + _rand(rng, 36)
+    if kind == 1:
+        return "AKIA" + _rand(rng, 16, string.ascii_uppercase + string.digits)
+    if kind == 2:
+        return "xoxb-" + _rand(rng, 24, string.digits + string.ascii_lowercase)
+    if kind == 3:
+        return "AIza" + _rand(rng, 35)
+    return f'api_key = "{_rand(rng, 28)}"'
+
+
+def _source_file(rng: random.Random, size: int, density: float) -> tuple[str, int]:
+    lines: list[str] = []
+    secrets = 0
+    total = 0
+    n = 0
+    while total < size:
+        n += 1
+        if rng.random() < density:
+            line = f"    value_{n} = \"{fake_secret(rng)}\""
+            secrets += 1
+        else:
+            line = rng.choice(
+                [
+                    f"def func_{n}(arg, other=None):",
+                    f"    result_{n} = compute(arg, {rng.randint(0, 9999)})",
+                    f"    # {_rand(rng, rng.randint(10, 60), string.ascii_lowercase + ' ')}",
+                    "    return result",
+                    "",
+                ]
+            )
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines) + "\n", secrets
+
+
+def _minified_file(rng: random.Random, size: int, density: float) -> tuple[str, int]:
+    parts: list[str] = []
+    secrets = 0
+    total = 0
+    while total < size:
+        if rng.random() < density:
+            part = f'var k="{fake_secret(rng)}";'
+            secrets += 1
+        else:
+            part = f"function {_rand(rng, 2, string.ascii_lowercase)}(a,b){{return a.{_rand(rng, 6)}(b)}};"
+        parts.append(part)
+        total += len(part)
+    return "".join(parts) + "\n", secrets
+
+
+def _log_file(rng: random.Random, size: int, density: float) -> tuple[str, int]:
+    lines: list[str] = []
+    secrets = 0
+    total = 0
+    while total < size:
+        level = rng.choice(["INFO", "DEBUG", "WARN", "ERROR"])
+        msg = f"request_id={_rand(rng, 16)} status={rng.choice([200, 201, 404, 500])} ms={rng.randint(1, 900)}"
+        if rng.random() < density:
+            msg += f" token={fake_secret(rng)}"
+            secrets += 1
+        line = f"2024-01-01T00:00:{rng.randint(0, 59):02d}Z {level} app: {msg}"
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines) + "\n", secrets
+
+
+def _pem_file(rng: random.Random, size: int, density: float) -> tuple[str, int]:
+    blocks: list[str] = []
+    secrets = 0
+    total = 0
+    while total < size:
+        body = base64.b64encode(rng.randbytes(768)).decode("ascii")
+        wrapped = "\n".join(body[i : i + 64] for i in range(0, len(body), 64))
+        if rng.random() < density:
+            label = "PRIVATE KEY"
+            secrets += 1
+        else:
+            label = "CERTIFICATE"
+        block = f"-----BEGIN {label}-----\n{wrapped}\n-----END {label}-----\n"
+        blocks.append(block)
+        total += len(block)
+    return "".join(blocks), secrets
+
+
+def _binary_file(rng: random.Random, size: int, density: float) -> tuple[bytes, int]:
+    return b"\x89PNG\r\n\x1a\n\x00" + rng.randbytes(max(0, size - 9)), 0
+
+
+_GENERATORS: dict[str, tuple[str, int, Callable[[random.Random, int, float], tuple[Any, int]]]] = {
+    # kind: (file name pattern, file size, generator)
+    "source": ("src/pkg_{i:03d}/module_{i:05d}.py", 6 * 1024, _source_file),
+    "minified": ("static/bundle_{i:03d}.min.js", 512 * 1024, _minified_file),
+    "logs": ("logs/app_{i:04d}.log", 256 * 1024, _log_file),
+    "pem": ("certs/bundle_{i:04d}.pem", 32 * 1024, _pem_file),
+    "binary": ("assets/img_{i:05d}.png", 64 * 1024, _binary_file),
+}
+
+
+def generate_corpus(
+    dest: Path,
+    kinds: tuple[str, ...] = CORPUS_KINDS,
+    size_mb: float = 4.0,
+    density: float = 0.01,
+    seed: int = 1337,
+) -> CorpusInfo:
+    info = CorpusInfo(root=str(dest), seed=seed, density=density)
+    budget = int(size_mb * 1024 * 1024)
+    for kind in kinds:
+        if kind not in _GENERATORS:
+            raise ValueError(f"Unknown corpus kind: {kind}")
+        name_fmt, file_size, gen = _GENERATORS[kind]
+        rng = random.Random(f"{seed}:{kind}")
+        written = 0
+        i = 0
+        while written < budget:
+            size = min(file_size, budget - written)
+            content, secrets = gen(rng, size, density)
+            path = dest / name_fmt.format(i=i)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = content if isinstance(content, bytes) else content.encode("utf-8")
+            path.write_bytes(data)
+            written += len(data)
+            info.files += 1
+            info.bytes += len(data)
+            info.secrets += secrets
+            info.by_kind[kind] = info.by_kind.get(kind, 0) + 1
+            i += 1
+    return info
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[Any, float]:
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def run_bench(corpus: CorpusInfo) -> dict[str, Any]:
+    from .reporting import to_html, to_json, to_sarif
+    from .scanner import scan_path
+
+    root = Path(corpus.root)
+    shutil.rmtree(root / ".secretscout-cache", ignore_errors=True)
+
+    findings, cold = _timed(lambda: scan_path(root, mode="all", use_cache=True))
+    _, warm = _timed(lambda: scan_path(root, mode="all", use_cache=True))
+    _, nocache = _timed(lambda: scan_path(root, mode="all", use_cache=False))
+
+    report_s: dict[str, float] = {}
+    for name, render in (("json", to_json), ("sarif", to_sarif), ("html", to_html)):
+        _, report_s[name] = _timed(lambda render=render: render(findings))
+
+    mb = corpus.bytes / (1024 * 1024)
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": asdict(corpus),
+        "findings": len(findings),
+        "metrics": {
+            "cold_s": cold,
+            "warm_s": warm,
+            "nocache_s": nocache,
+            "files_per_s": corpus.files / nocache if nocache else 0.0,
+            "mb_per_s": mb / nocache if nocache else 0.0,
+            "peak_rss_mb": peak_rss_mb(),
+        },
+        "report_s": report_s,
+    }
+
+
+def compare_results(current: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.2) -> list[str]:
+    regressions: list[str] = []
+    cur = current.get("metrics", {})
+    base = baseline.get("metrics", {})
+    for key in HIGHER_IS_BETTER:
+        if base.get(key) and cur.get(key, 0.0) < base[key] * (1 - tolerance):
+            regressions.append(f"{key}: {cur.get(key, 0.0):.2f} < {base[key]:.2f} (-{tolerance:.0%} allowed)")
+    for key in LOWER_IS_BETTER:
+        if base.get(key) and cur.get(key, 0.0) > base[key] * (1 + tolerance):
+            regressions.append(f"{key}: {cur.get(key, 0.0):.3f}s > {base[key]:.3f}s (+{tolerance:.0%} allowed)")
+    return regressions
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_results(path: Path, results: dict[str, Any]) -> None:
+    path.write_text(json.dumps(results, indent=2), encoding="utf-8")
@@ -1,51 +1,312 @@
 from __future__ import annotations
 
+import hashlib
+import io
 import json
-from dataclasses import dataclass
+import os
+import shutil
+import tarfile
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-from .util import sha256_bytes
+CACHE_VERSION = 2
+# Upper bounds of the age buckets reported by `cache stats`, by time since the last hit.
+AGE_BUCKETS: tuple[tuple[str, float], ...] = (
+    ("<1d", 86400.0),
+    ("<7d", 7 * 86400.0),
+    ("<30d", 30 * 86400.0),
+)
 
 
 @dataclass
 class CacheEntry:
     sha256: str
     findings: list[dict[str, Any]]
+    last_hit: float = 0.0  # epoch seconds; 0 for entries written before it was tracked
+
+
+@dataclass
+class CacheStats:
+    entries: int
+    size: int  # bytes on disk
+    hits: int  # during the last scan that saved the cache
+    misses: int
+    saved_at: float | None
+    ages: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def hit_rate(self) -> float | None:
+        total = self.hits + self.misses
+        return self.hits / total if total else None
 
 
 class Cache:
-    def __init__(self, root: Path) -> None:
+    def __init__(self, root: Path, salt: str = "", max_entries: int = 0, max_size: int = 0) -> None:
         self.root = root
+        # Entries only match when scanned under the same config and rule packs.
+        self.salt = salt.encode("utf-8")
         self.dir = root / ".secretscout-cache"
         self.path = self.dir / "cache.json"
+        # Enforced on save by evicting the least recently hit entries; 0 disables.
+        self.max_entries = max_entries
+        self.max_size = max_size
         self._data: dict[str, CacheEntry] = {}
+        self._now = time.time()
+        # Paths hit or written during this run; set.add is atomic, so scan threads need no lock.
+        self._hit: set[str] = set()
+        self._put: set[str] = set()
+        self._stats: dict[str, Any] = {}
+
+    @property
+    def hits(self) -> int:
+        return len(self._hit)
+
+    @property
+    def misses(self) -> int:
+        return len(self._put)
 
     def load(self) -> None:
+        self._data = {}
         if not self.path.exists():
-            self._data = {}
             return
         raw = json.loads(self.path.read_text(encoding="utf-8"))
-        data: dict[str, CacheEntry] = {}
-        if isinstance(raw, dict):
-            for k, v in raw.items():
-                if not isinstance(v, dict):
-                    continue
-                data[k] = CacheEntry(sha256=str(v.get("sha256", "")), findings=list(v.get("findings", [])))
-        self._data = data
+        if not isinstance(raw, dict):
+            return
+        if raw.get("version") == CACHE_VERSION:
+            self._stats = dict(raw.get("stats") or {})
+            raw = raw.get("entries") or {}
+        # Otherwise the flat {path: entry} layout of version 1.
+        for k, v in raw.items():
+            if not isinstance(v, dict):
+                continue
+            self._data[k] = CacheEntry(
+                sha256=str(v.get("sha256", "")),
+                findings=list(v.get("findings", [])),
+                last_hit=float(v.get("last_hit", 0.0)),
+            )
 
     def save(self) -> None:
         self.dir.mkdir(parents=True, exist_ok=True)
-        payload = {k: {"sha256": v.sha256, "findings": v.findings} for k, v in self._data.items()}
-        self.path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        if self._hit or self._put:
+            self._stats = {"hits": self.hits, "misses": self.misses, "saved_at": self._now}
+        # Entries are encoded one by one, most recently hit first, so the size limit applies
+        # to what is actually written.
+        encoded: list[tuple[float, str, str]] = []
+        for k, v in self._data.items():
+            entry = {"sha256": v.sha256, "findings": v.findings, "last_hit": v.last_hit}
+            line = f"{json.dumps(k, ensure_ascii=False)}: {json.dumps(entry, ensure_ascii=False)}"
+            encoded.append((v.last_hit, k, line))
+        encoded.sort(key=lambda e: -e[0])
+        keep = len(encoded)
+        if self.max_entries:
+            keep = min(keep, self.max_entries)
+        if self.max_size:
+            total = 0
+            for i, (_, _, line) in enumerate(encoded[:keep]):
+                total += len(line.encode("utf-8")) + 2
+                if total > self.max_size:
+                    keep = i
+                    break
+        for _, k, _ in encoded[keep:]:
+            del self._data[k]
+        head = json.dumps({"version": CACHE_VERSION, "stats": self._stats})[:-1]
+        body = ",\n".join(line for _, _, line in encoded[:keep])
+        self.path.write_text(f'{head}, "entries": {{\n{body}\n}}}}\n', encoding="utf-8")
 
-    def get(self, rel_path: str, content: bytes) -> list[dict[str, Any]] | None:
+    def get(
+        self, rel_path: str, content: bytes, digest: str | None = None
+    ) -> list[dict[str, Any]] | None:
         ent = self._data.get(rel_path)
         if not ent:
             return None
-        if ent.sha256 != sha256_bytes(content):
+        if ent.sha256 != (digest or self.digest(content)):
             return None
+        ent.last_hit = self._now
+        self._hit.add(rel_path)
         return ent.findings
 
-    def put(self, rel_path: str, content: bytes, findings: list[dict[str, Any]]) -> None:
-        self._data[rel_path] = CacheEntry(sha256=sha256_bytes(content), findings=findings)
+    def put(
+        self,
+        rel_path: str,
+        content: bytes,
+        findings: list[dict[str, Any]],
+        digest: str | None = None,
+    ) -> None:
+        self._data[rel_path] = CacheEntry(
+            sha256=digest or self.digest(content), findings=findings, last_hit=self._now
+        )
+        self._put.add(rel_path)
+
+    def has_findings(self, rel_path: str) -> bool:
+        """Whether the path had findings when last scanned, whatever its content is now."""
+        ent = self._data.get(rel_path)
+        return bool(ent and ent.findings)
+
+    def digest(self, content: bytes) -> str:
+        h = hashlib.sha256(self.salt)
+        h.update(content)
+        return h.hexdigest()
+
+    def prune_unseen(self) -> int:
+        """Drop entries for paths neither hit nor written in this run; call after a full scan."""
+        seen = self._hit | self._put
+        return self._drop([k for k in self._data if k not in seen])
+
+    def prune(self, max_age: float | None = None) -> int:
+        """Drop entries of files that no longer exist and, with `max_age`, entries not hit since."""
+        stale = [
+            k
+            for k, v in self._data.items()
+            if not (self.root / k).is_file()
+            or (max_age is not None and self._now - v.last_hit > max_age)
+        ]
+        return self._drop(stale)
+
+    def _drop(self, keys: list[str]) -> int:
+        for k in keys:
+            del self._data[k]
+        return len(keys)
+
+    def clear(self, shared_dir: Path | None = None) -> None:
+        """Drop every entry, compiled rule packs, and the content store and scan-image layer
+        records kept in `shared_dir` (see shared_cache_dir; the repository's cache dir if None)."""
+        self._data = {}
+        self.path.unlink(missing_ok=True)
+        shutil.rmtree(self.dir / "rulepacks", ignore_errors=True)
+        for store_dir in {self.dir, shared_dir or self.dir}:
+            shutil.rmtree(store_dir / "content", ignore_errors=True)
+            shutil.rmtree(store_dir / "layers", ignore_errors=True)
+
+    def stats(self) -> CacheStats:
+        ages = dict.fromkeys([name for name, _ in AGE_BUCKETS] + ["older"], 0)
+        for v in self._data.values():
+            age = self._now - v.last_hit
+            ages[next((name for name, limit in AGE_BUCKETS if age < limit), "older")] += 1
+        saved_at = self._stats.get("saved_at")
+        return CacheStats(
+            entries=len(self._data),
+            size=self.path.stat().st_size if self.path.exists() else 0,
+            hits=int(self._stats.get("hits", 0)),
+            misses=int(self._stats.get("misses", 0)),
+            saved_at=float(saved_at) if saved_at is not None else None,
+            ages=ages,
+        )
+
+
+# ---- Content-addressed store (cache.mode = "content") ----
+
+CLEAN_MAGIC = b"SSCLEAN1"
+KEY_SIZE = 20  # git blob ids are sha1; longer (sha256) ids are truncated
+_STORE_PREFIX = "content/"
+
+
+def shared_cache_dir(root: Path, configured: str = "") -> Path:
+    """Directory of the content store: $SECRETSCOUT_CACHE_DIR, then [cache] dir, then the repo."""
+    raw = os.environ.get("SECRETSCOUT_CACHE_DIR") or configured
+    if not raw:
+        return root / ".secretscout-cache"
+    path = Path(raw).expanduser()
+    return path if path.is_absolute() else root / path
+
+
+# Store files list keys most recently used first, so eviction keeps the head of the file.
+
+
+def _read_keys(data: bytes, source: object) -> dict[bytes, None]:
+    """Keys of a store file in file order (an insertion-ordered dict, used as an ordered set)."""
+    if not data.startswith(CLEAN_MAGIC) or (len(data) - len(CLEAN_MAGIC)) % KEY_SIZE:
+        raise ValueError(f"Invalid content cache file: {source}")
+    view = memoryview(data)[len(CLEAN_MAGIC) :]
+    return dict.fromkeys(bytes(view[i : i + KEY_SIZE]) for i in range(0, len(view), KEY_SIZE))
+
+
+def _write_keys(path: Path, keys: Iterable[bytes]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(CLEAN_MAGIC + b"".join(keys))
+    os.replace(tmp, path)
+
+
+class ContentStore:
+    """Blobs known to have no findings under one ruleset, keyed by git blob id.
+
+    Only clean blobs are recorded: they need no per-path data, so an entry holds for any path,
+    branch or fork with the same content, and nothing about findings leaves the repository.
+    Files with findings go through the per-path Cache as before; they are few.
+    """
+
+    def __init__(self, dir: Path, ruleset: str, max_entries: int = 0) -> None:
+        self.dir = dir
+        self.path = dir / "content" / f"{ruleset[:32]}.bin"
+        self.max_entries = max_entries
+        self._keys: dict[bytes, None] = {}  # most recently used first
+        self._used: set[bytes] = set()  # looked up or added during this run
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def load(self) -> None:
+        self._keys = _read_keys(self.path.read_bytes(), self.path) if self.path.exists() else {}
+
+    def is_clean(self, blob: str) -> bool:
+        key = bytes.fromhex(blob)[:KEY_SIZE]
+        if key in self._keys:
+            self._used.add(key)
+            return True
+        return False
+
+    def add(self, blob: str) -> None:
+        key = bytes.fromhex(blob)[:KEY_SIZE]
+        self._keys[key] = None
+        self._used.add(key)
+
+    def save(self) -> None:
+        # Keys used by this run go first, then what other scans sharing the directory wrote
+        # meanwhile (in their order), then the rest as loaded; eviction drops the tail.
+        keys = dict.fromkeys(self._used)
+        if self.path.exists():
+            keys.update(_read_keys(self.path.read_bytes(), self.path))
+        keys.update(self._keys)
+        if self.max_entries and len(keys) > self.max_entries:
+            keys = dict.fromkeys(list(keys)[: self.max_entries])
+        self._keys = keys
+        _write_keys(self.path, keys)
+
+
+def export_store(dir: Path, archive: Path) -> int:
+    """Write every content store file under `dir` to a .tar.gz; returns the number of entries."""
+    total = 0
+    with tarfile.open(archive, "w:gz") as tar:
+        for path in sorted((dir / "content").glob("*.bin")):
+            data = path.read_bytes()
+            total += len(_read_keys(data, path))
+            info = tarfile.TarInfo(f"{_STORE_PREFIX}{path.name}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return total
+
+
+def import_store(dir: Path, archive: Path) -> int:
+    """Merge the content store files of an exported archive into `dir`; returns new entries."""
+    added = 0
+    with tarfile.open(archive, "r:gz") as tar:
+        for member in tar:
+            name = member.name.removeprefix(_STORE_PREFIX)
+            # Only flat store files are taken, so an archive cannot write anywhere else.
+            if not member.isfile() or not member.name.startswith(_STORE_PREFIX) or "/" in name:
+                continue
+            if not name.endswith(".bin") or not all(c in "0123456789abcdef" for c in name[:-4]):
+                continue
+            fh = tar.extractfile(member)
+            if fh is None:
+                continue
+            incoming = _read_keys(fh.read(), f"{archive}:{member.name}")
+            path = dir / "content" / name
+            current = _read_keys(path.read_bytes(), path) if path.exists() else {}
+            merged = current | incoming
+            added += len(merged) - len(current)
+            _write_keys(path, merged)
+    return added
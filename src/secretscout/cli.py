@@ -5,9 +5,30 @@ from typing import Annotated
 
 import typer
 
-from .commands import cmd_baseline, cmd_init, cmd_scan, cmd_stats
-from .reporting import Format
-from .rules_cmd import list_rules, show_rule
+from .baseline import BaselineFormat
+from .bench import CORPUS_KINDS
+from .commands import (
+    cmd_baseline,
+    cmd_bench,
+    cmd_cache_clear,
+    cmd_cache_export,
+    cmd_cache_import,
+    cmd_cache_prune,
+    cmd_cache_stats,
+    cmd_convert_baseline,
+    cmd_diff,
+    cmd_history,
+    cmd_init,
+    cmd_merge,
+    cmd_scan,
+    cmd_scan_image,
+    cmd_scan_many,
+    cmd_scan_stream,
+    cmd_stats,
+    to_shard,
+)
+from .metrics import MetricsFormat
+from .models import Format
 
 app = typer.Typer(
     add_completion=False,
@@ -23,7 +44,7 @@ PathArg = Annotated[
 
 FormatOpt = Annotated[
     Format,
-    typer.Option("--format", help="table|minimal|json|sarif|html"),
+    typer.Option("--format", help="table|minimal|json|ndjson|sarif|html"),
 ]
 
 OutputOpt = Annotated[
@@ -38,7 +59,12 @@ FailOnOpt = Annotated[
 
 BaselineOpt = Annotated[
     Path | None,
-    typer.Option("--baseline", help="Baseline JSON file to ignore known findings."),
+    typer.Option("--baseline", help="Baseline file (JSON or binary) to ignore known findings."),
+]
+
+BaselineFormatOpt = Annotated[
+    BaselineFormat | None,
+    typer.Option("--format", help="json|binary (default: binary if the output ends in .bin, else json)."),
 ]
 
 StagedOpt = Annotated[
@@ -71,12 +97,111 @@ MaxFindingsOpt = Annotated[
     typer.Option("--max-findings", help="Limit output findings."),
 ]
 
+FromLastOpt = Annotated[
+    bool,
+    typer.Option("--from-last", help="Use the last stored scan results instead of re-scanning."),
+]
+
+ProfileOpt = Annotated[
+    bool,
+    typer.Option("--profile", help="Print per-stage/per-rule timings and the slowest files/lines."),
+]
+
+ProfileOutOpt = Annotated[
+    Path | None,
+    typer.Option("--profile-out", help="Write profiling data as JSON (implies profiling)."),
+]
+
+RegexEngineOpt = Annotated[
+    str | None,
+    typer.Option("--regex-engine", help="re|re2|auto (re2 needs google-re2; default from config)."),
+]
+
+FileTimeoutOpt = Annotated[
+    float | None,
+    typer.Option("--file-timeout", help="Per-file scan budget in seconds (0 disables)."),
+]
+
+ShardOpt = Annotated[
+    str | None,
+    typer.Option("--shard", help="Scan only shard INDEX/COUNT of the files (e.g. 2/4, 1-based)."),
+]
+
+ShardByOpt = Annotated[
+    str,
+    typer.Option("--shard-by", help="hash (stable per path) | size (balance bytes across shards)."),
+]
+
+MetricsOutOpt = Annotated[
+    Path | None,
+    typer.Option("--metrics-out", help="Write scan metrics (files, bytes, skips, cache, findings, stage times)."),
+]
+
+MetricsFormatOpt = Annotated[
+    MetricsFormat | None,
+    typer.Option("--metrics-format", help="json|prometheus (default: prometheus for .prom files, else json)."),
+]
+
+ProgressOpt = Annotated[
+    bool,
+    typer.Option("--progress", help="Show progress on stderr (a live bar on a terminal, else a line every 10s)."),
+]
+
+TimeBudgetOpt = Annotated[
+    float | None,
+    typer.Option(
+        "--time-budget",
+        min=0.1,
+        help="Stop scanning after this many seconds, riskiest files first, and report coverage.",
+    ),
+]
+
+ScanFilesArg = Annotated[
+    list[Path] | None,
+    typer.Argument(help="Only scan these files (relative to the working directory), e.g. from pre-commit."),
+]
+
+FilesFromOpt = Annotated[
+    Path | None,
+    typer.Option("--files-from", help="Only scan the files listed in this file (- for stdin), one per line."),
+]
+
+NullSeparatedOpt = Annotated[
+    bool,
+    typer.Option("-z", "--null", help="--files-from entries are NUL-separated (git ... -z, find -print0)."),
+]
+
+PathspecOpt = Annotated[
+    list[str] | None,
+    typer.Option(
+        "--pathspec",
+        help="Only list files matching this git pathspec, relative to PATH (e.g. 'services/payments/**'). "
+        "Repeatable.",
+    ),
+]
+
+IncrementalOpt = Annotated[
+    bool,
+    typer.Option(
+        "--incremental",
+        help="Rescan only files changed since the last incremental scan (git diff and status) "
+        "and reuse the stored results for the rest.",
+    ),
+]
+
 # ---- Commands ----
 
 
+ScanPathArg = Annotated[
+    Path,
+    typer.Argument(help="Directory to scan, or - to scan stdin as a stream."),
+]
+
+
 @app.command()
 def scan(
-    path: PathArg = Path("."),
+    path: ScanPathArg = Path("."),
+    files: ScanFilesArg = None,
     format: FormatOpt = "table",
     output: OutputOpt = None,
     fail_on: FailOnOpt = "high",
@@ -87,8 +212,43 @@ def scan(
     exclude: ExcludeOpt = None,
     no_cache: NoCacheOpt = False,
     max_findings: MaxFindingsOpt = None,
+    from_last: FromLastOpt = False,
+    profile: ProfileOpt = False,
+    profile_out: ProfileOutOpt = None,
+    regex_engine: RegexEngineOpt = None,
+    file_timeout: FileTimeoutOpt = None,
+    shard: ShardOpt = None,
+    shard_by: ShardByOpt = "hash",
+    metrics_out: MetricsOutOpt = None,
+    metrics_format: MetricsFormatOpt = None,
+    progress: ProgressOpt = False,
+    time_budget: TimeBudgetOpt = None,
+    incremental: IncrementalOpt = False,
+    files_from: FilesFromOpt = None,
+    null: NullSeparatedOpt = False,
+    pathspec: PathspecOpt = None,
 ) -> None:
-    """Scan a path for potential secrets."""
+    """Scan a path (or stdin with -) for potential secrets, optionally only some files of it."""
+    if str(path) == "-":
+        raise typer.Exit(
+            code=cmd_scan_stream(
+                fmt=format,
+                output=output,
+                fail_on=fail_on,
+                baseline=baseline,
+                max_findings=max_findings,
+                regex_engine=regex_engine,
+            )
+        )
+    if path.is_file():
+        # `secretscout scan a.py b.py` would otherwise scan b.py relative to a.py.
+        raise typer.BadParameter(
+            f"'{path}' is a file; PATH must be a directory. Pass files after it, "
+            f"e.g. `secretscout scan . {path}`.",
+            param_hint="PATH",
+        )
+    if not path.is_dir():
+        raise typer.BadParameter(f"Directory '{path}' does not exist.", param_hint="PATH")
     code = cmd_scan(
         path=path,
         fmt=format,
@@ -101,10 +261,128 @@ def scan(
         exclude=exclude or [],
         no_cache=no_cache,
         max_findings=max_findings,
+        from_last=from_last,
+        profile=profile,
+        profile_out=profile_out,
+        regex_engine=regex_engine,
+        file_timeout=file_timeout,
+        shard=to_shard(shard, shard_by),
+        metrics_out=metrics_out,
+        metrics_format=metrics_format,
+        progress=progress,
+        time_budget=time_budget,
+        incremental=incremental,
+        files=files,
+        files_from=files_from,
+        null_separated=null,
+        pathspecs=pathspec,
     )
     raise typer.Exit(code=code)
 
 
+@app.command("scan-many")
+def scan_many(
+    roots: Annotated[list[Path] | None, typer.Argument(help="Repository roots to scan.")] = None,
+    roots_from: Annotated[
+        Path | None,
+        typer.Option("--roots-from", exists=True, dir_okay=False, help="File with one repository root per line."),
+    ] = None,
+    format: FormatOpt = "table",
+    output: OutputOpt = None,
+    fail_on: FailOnOpt = "high",
+    baseline: BaselineOpt = None,
+    staged: StagedOpt = False,
+    tracked: TrackedOpt = False,
+    all_files: AllFilesOpt = False,
+    exclude: ExcludeOpt = None,
+    no_cache: NoCacheOpt = False,
+    max_findings: MaxFindingsOpt = None,
+    jobs: Annotated[
+        int | None,
+        typer.Option("--jobs", "-j", min=1, help="Worker processes shared by all repositories (default: CPU count)."),
+    ] = None,
+    regex_engine: RegexEngineOpt = None,
+) -> None:
+    """Scan many repositories on one shared worker pool and print an aggregate report."""
+    raise typer.Exit(
+        code=cmd_scan_many(
+            roots=roots or [],
+            roots_file=roots_from,
+            fmt=format,
+            output=output,
+            fail_on=fail_on,
+            baseline=baseline,
+            staged=staged,
+            tracked=tracked,
+            all_files=all_files,
+            exclude=exclude or [],
+            no_cache=no_cache,
+            max_findings=max_findings,
+            jobs=jobs,
+            regex_engine=regex_engine,
+        )
+    )
+
+
+@app.command("scan-image")
+def scan_image(
+    images: Annotated[
+        list[Path],
+        typer.Argument(exists=True, help="`docker save` archives or OCI image layouts (tar or directory)."),
+    ],
+    format: FormatOpt = "table",
+    output: OutputOpt = None,
+    fail_on: FailOnOpt = "high",
+    baseline: BaselineOpt = None,
+    exclude: ExcludeOpt = None,
+    no_cache: NoCacheOpt = False,
+    max_findings: MaxFindingsOpt = None,
+    regex_engine: RegexEngineOpt = None,
+) -> None:
+    """Scan container images offline, each layer once; files deleted by later layers are listed apart."""
+    raise typer.Exit(
+        code=cmd_scan_image(
+            images,
+            fmt=format,
+            output=output,
+            fail_on=fail_on,
+            baseline=baseline,
+            exclude=exclude or [],
+            no_cache=no_cache,
+            max_findings=max_findings,
+            regex_engine=regex_engine,
+        )
+    )
+
+
+@app.command()
+def merge(
+    reports: Annotated[list[Path], typer.Argument(exists=True, dir_okay=False, help="JSON or NDJSON reports.")],
+    format: FormatOpt = "json",
+    output: OutputOpt = None,
+    fail_on: FailOnOpt = "high",
+    max_findings: MaxFindingsOpt = None,
+) -> None:
+    """Merge JSON/NDJSON reports (e.g. from --shard jobs) into one report."""
+    raise typer.Exit(code=cmd_merge(reports, fmt=format, output=output, fail_on=fail_on, max_findings=max_findings))
+
+
+@app.command()
+def diff(
+    old: Annotated[Path, typer.Argument(exists=True, dir_okay=False, help="Base report (JSON or NDJSON).")],
+    new: Annotated[Path, typer.Argument(exists=True, dir_okay=False, help="Head report (JSON or NDJSON).")],
+    format: FormatOpt = "table",
+    output: OutputOpt = None,
+    fail_on: FailOnOpt = "high",
+    max_findings: MaxFindingsOpt = None,
+    show: Annotated[str, typer.Option("--show", help="new|fixed: which findings to output.")] = "new",
+) -> None:
+    """Compare two reports; exit 1 if NEW adds findings at or above --fail-on."""
+    raise typer.Exit(
+        code=cmd_diff(old, new, fmt=format, output=output, fail_on=fail_on, max_findings=max_findings, show=show)
+    )
+
+
 @app.command()
 def init(path: PathArg = Path(".")) -> None:
     """Generate default config and ignore files."""
@@ -128,9 +406,34 @@ def baseline(
         bool,
         typer.Option("--tracked/--all", help="By default, baseline git-tracked files."),
     ] = True,
+    format: BaselineFormatOpt = None,
+    update: Annotated[
+        bool,
+        typer.Option(
+            "--update",
+            help="Update an existing baseline: rescan files changed since it was written and prune "
+            "fingerprints of changed or deleted code.",
+        ),
+    ] = False,
+    accept_new: Annotated[
+        bool,
+        typer.Option("--accept-new", help="With --update, also add new findings to the baseline."),
+    ] = False,
 ) -> None:
     """Create a baseline file to ignore known findings."""
-    raise typer.Exit(code=cmd_baseline(path, output, tracked))
+    raise typer.Exit(
+        code=cmd_baseline(path, output, tracked, fmt=format, update=update, accept_new=accept_new)
+    )
+
+
+@app.command("convert-baseline")
+def convert_baseline(
+    src: Annotated[Path, typer.Argument(exists=True, dir_okay=False, help="Existing baseline file.")],
+    dst: Annotated[Path, typer.Argument(dir_okay=False, help="Converted baseline file.")],
+    format: BaselineFormatOpt = None,
+) -> None:
+    """Convert a baseline between JSON and the compact binary format."""
+    raise typer.Exit(code=cmd_convert_baseline(src, dst, fmt=format))
 
 
 @app.command()
@@ -140,6 +443,11 @@ def stats(
     tracked: TrackedOpt = False,
     all_files: AllFilesOpt = False,
     baseline: BaselineOpt = None,
+    from_last: FromLastOpt = False,
+    rule: Annotated[
+        str | None,
+        typer.Option("--rule", help="Only count findings of this rule id."),
+    ] = None,
 ) -> None:
     """Show a summary of findings."""
     raise typer.Exit(
@@ -149,6 +457,55 @@ def stats(
             tracked=tracked,
             all_files=all_files,
             baseline=baseline,
+            from_last=from_last,
+            rule=rule,
+        )
+    )
+
+
+@app.command()
+def history(
+    path: PathArg = Path("."),
+    limit: Annotated[int, typer.Option("--limit", help="Number of scans to show.")] = 20,
+) -> None:
+    """Show stored scan results over time."""
+    raise typer.Exit(code=cmd_history(path, limit))
+
+
+@app.command()
+def bench(
+    corpus: Annotated[
+        Path | None,
+        typer.Option("--corpus", help="Keep the generated corpus in this directory."),
+    ] = None,
+    kind: Annotated[
+        list[str] | None,
+        typer.Option("--kind", help=f"Corpus kind (repeatable): {'|'.join(CORPUS_KINDS)}."),
+    ] = None,
+    size_mb: Annotated[float, typer.Option("--size-mb", help="MiB to generate per corpus kind.")] = 4.0,
+    density: Annotated[float, typer.Option("--density", help="Probability of a secret per line/chunk.")] = 0.01,
+    seed: Annotated[int, typer.Option("--seed", help="Seed for reproducible corpora.")] = 1337,
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="Write machine-readable results (JSON)."),
+    ] = None,
+    compare: Annotated[
+        Path | None,
+        typer.Option("--compare", exists=True, dir_okay=False, help="Stored results to compare against."),
+    ] = None,
+    tolerance: Annotated[float, typer.Option("--tolerance", help="Allowed relative regression.")] = 0.2,
+) -> None:
+    """Benchmark the scanner on a synthetic corpus."""
+    raise typer.Exit(
+        code=cmd_bench(
+            corpus,
+            kinds=kind or list(CORPUS_KINDS),
+            size_mb=size_mb,
+            density=density,
+            seed=seed,
+            results_out=output,
+            compare=compare,
+            tolerance=tolerance,
         )
     )
 
@@ -159,15 +516,74 @@ rules_app = typer.Typer(help="Manage and inspect rules.")
 app.add_typer(rules_app, name="rules")
 
 
+RulesPathOpt = Annotated[
+    Path,
+    typer.Option("--path", exists=True, file_okay=False, dir_okay=True, help="Project whose rule packs to include."),
+]
+
+
 @rules_app.command("list")
-def rules_list() -> None:
-    """List available rules."""
-    list_rules()
+def rules_list(path: RulesPathOpt = Path(".")) -> None:
+    """List available rules, including custom rule packs."""
+    from .rules_cmd import list_rules
+
+    list_rules(path)
 
 
 @rules_app.command("show")
 def rules_show(
     rule_id: Annotated[str, typer.Argument(help="Rule id (e.g. github-token).")],
+    path: RulesPathOpt = Path("."),
 ) -> None:
     """Show details for a single rule."""
-    show_rule(rule_id)
+    from .rules_cmd import show_rule
+
+    show_rule(rule_id, path)
+
+
+# ---- Cache subcommands ----
+
+cache_app = typer.Typer(help="Inspect and maintain the scan cache.")
+app.add_typer(cache_app, name="cache")
+
+
+@cache_app.command("stats")
+def cache_stats(path: PathArg = Path(".")) -> None:
+    """Show cache size, entry count, last hit rate and entry ages."""
+    raise typer.Exit(code=cmd_cache_stats(path))
+
+
+@cache_app.command("prune")
+def cache_prune(
+    path: PathArg = Path("."),
+    max_age: Annotated[
+        float | None,
+        typer.Option("--max-age", help="Also drop entries not hit for this many days."),
+    ] = None,
+) -> None:
+    """Drop entries of deleted files and apply the configured size limits."""
+    raise typer.Exit(code=cmd_cache_prune(path, max_age))
+
+
+@cache_app.command("clear")
+def cache_clear(path: PathArg = Path(".")) -> None:
+    """Delete the scan cache (stored scan history is kept)."""
+    raise typer.Exit(code=cmd_cache_clear(path))
+
+
+ArchiveArg = Annotated[Path, typer.Argument(dir_okay=False, help="Archive file (.tar.gz).")]
+
+
+@cache_app.command("export")
+def cache_export(archive: ArchiveArg, path: PathArg = Path(".")) -> None:
+    """Write the content-addressed store to one compressed archive (e.g. for a CI cache step)."""
+    raise typer.Exit(code=cmd_cache_export(path, archive))
+
+
+@cache_app.command("import")
+def cache_import(
+    archive: Annotated[Path, typer.Argument(exists=True, dir_okay=False, help="Archive from `cache export`.")],
+    path: PathArg = Path("."),
+) -> None:
+    """Merge an exported archive into the content-addressed store."""
+    raise typer.Exit(code=cmd_cache_import(path, archive))
@@ -1,16 +1,52 @@
 from __future__ import annotations
 
 import json
+import os
+import sys
+import tarfile
+import tempfile
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
 
 import typer
-from rich.console import Console
 
-from .config import load_config
-from .fix import apply_fix
-from .models import Severity
-from .reporting import Format, emit
+from .baseline import (
+    BaselineFormat,
+    BaselineMeta,
+    BinaryBaseline,
+    convert_baseline,
+    is_binary_baseline,
+    load_baseline,
+    load_baseline_meta,
+    without_known,
+    write_baseline,
+)
+from .cache import Cache, export_store, import_store, shared_cache_dir
+from .config import config_hash, load_config, scan_key
+from .git import changed_since, head_commit
+from .metrics import MetricsFormat, ScanMetrics
+from .models import Finding, Format, Severity
+from .reporting import emit, iter_report_findings, minimal_line
 from .scanner import scan_path
+from .shard import Shard, parse_shard
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from .profiling import Profiler
+    from .progress import ScanProgress
+
+# rich, sqlite3 and the bench/profiling helpers are imported inside the commands that use
+# them: `scan --format minimal` in a pre-commit hook should not pay for them on every commit.
+
+
+def _console(stderr: bool = False) -> Console:
+    from rich.console import Console
+
+    return Console(stderr=stderr)
 
 
 def to_severity(value: str) -> Severity:
@@ -23,6 +59,170 @@ def to_severity(value: str) -> Severity:
 
 
 
+def resolve_mode(staged: bool, tracked: bool, all_files: bool) -> str:
+    mode = "tracked"
+    if staged:
+        mode = "staged"
+    elif all_files:
+        mode = "all"
+    elif tracked:
+        mode = "tracked"
+    return mode
+
+
+def run_and_record(
+    root: Path,
+    mode: str,
+    baseline: Path | None,
+    exclude: list[str],
+    use_cache: bool,
+    profiler: Profiler | None = None,
+    regex_engine: str | None = None,
+    file_timeout: float | None = None,
+    shard: Shard | None = None,
+    metrics: ScanMetrics | None = None,
+    progress: ScanProgress | None = None,
+    time_budget: float | None = None,
+    incremental: bool = False,
+    files: list[str] | None = None,
+    pathspecs: list[str] | None = None,
+) -> list[Finding]:
+    started = datetime.now(timezone.utc)
+    t0 = time.perf_counter()
+    if incremental:
+        from .incremental import incremental_scan
+
+        findings, _ = incremental_scan(
+            root,
+            baseline_path=None,
+            extra_exclude=exclude,
+            regex_engine=regex_engine,
+            use_cache=use_cache,
+            profiler=profiler,
+            file_timeout=file_timeout,
+            metrics=metrics,
+            progress=progress,
+        )
+    else:
+        findings = scan_path(
+            root,
+            mode=mode,
+            baseline_path=None,
+            extra_exclude=exclude,
+            use_cache=use_cache,
+            profiler=profiler,
+            regex_engine=regex_engine,
+            file_timeout=file_timeout,
+            shard=shard,
+            metrics=metrics,
+            progress=progress,
+            only=files,
+            time_budget=time_budget,
+            pathspecs=pathspecs,
+        )
+    # A shard, a file list or pathspec, or a scan cut short by its time budget, is partial;
+    # storing it would make --from-last report a fraction of the repo.
+    cut = metrics is not None and metrics.coverage is not None and not metrics.coverage.complete
+    partial = shard is not None or files is not None or bool(pathspecs)
+    if use_cache and not partial and not cut:
+        key = scan_key(root, exclude, regex_engine)
+        record_scan(root, mode, findings, started.isoformat(), time.perf_counter() - t0, key)
+    # Stored unfiltered, so --from-last can apply any baseline.
+    kept = without_known(findings, baseline)
+    if metrics is not None and len(kept) != len(findings):
+        metrics.findings.clear()
+        metrics.add_findings(kept)
+    return kept
+
+
+def record_scan(
+    root: Path, mode: str, findings: list[Finding], started_at: str, duration: float, key: str
+) -> None:
+    from .store import ResultsStore
+
+    store = ResultsStore(root)
+    try:
+        store.record(
+            mode,
+            findings,
+            started_at=started_at,
+            duration=duration,
+            config_hash=key,
+            commit=head_commit(root),
+        )
+    finally:
+        store.close()
+
+
+def load_last(
+    root: Path,
+    mode: str,
+    baseline: Path | None,
+    exclude: list[str] | None = None,
+    regex_engine: str | None = None,
+) -> list[Finding] | None:
+    """Findings of the last stored scan, filtered by `baseline`.
+
+    None if there is none, or if it ran under another config, rule packs, --exclude or
+    --regex-engine: its results would not be what a scan finds now.
+    """
+    from .store import ResultsStore
+
+    store = ResultsStore(root)
+    try:
+        last = store.last_scan(mode=mode)
+        if last is None or last.config_hash != scan_key(root, exclude, regex_engine):
+            return None
+        findings = store.findings(last.id)
+    finally:
+        store.close()
+    return without_known(findings, baseline)
+
+
+def cmd_scan_stream(
+    fmt: Format,
+    output: Path | None,
+    fail_on: str,
+    baseline: Path | None,
+    max_findings: int | None,
+    regex_engine: str | None = None,
+    stream: BinaryIO | None = None,
+) -> int:
+    from .stream import stream_findings
+
+    root = Path(".").resolve()
+    threshold = to_severity(fail_on)
+    findings = stream_findings(stream or sys.stdin.buffer, root, baseline, regex_engine)
+
+    if fmt in ("ndjson", "minimal"):
+        # Written as found and not kept, so memory stays flat on endless input.
+        out = output.open("w", encoding="utf-8") if output else sys.stdout
+        failed = False
+        count = 0
+        try:
+            for f in findings:
+                out.write((json.dumps(f.to_dict(), ensure_ascii=False) if fmt == "ndjson" else minimal_line(f)) + "\n")
+                out.flush()
+                failed = failed or f.severity.ge(threshold)
+                count += 1
+            if fmt == "minimal" and not count:
+                out.write("OK\n")
+        finally:
+            if output:
+                out.close()
+        return 1 if failed else 0
+
+    collected = list(findings)
+    mf = int(max_findings) if max_findings is not None else load_config(root).report.max_findings
+    payload = emit(collected, fmt=fmt, max_findings=mf)
+    if payload is not None:
+        if output:
+            output.write_text(payload, encoding="utf-8")
+        else:
+            typer.echo(payload)
+    return 1 if any(f.severity.ge(threshold) for f in collected) else 0
+
+
 def cmd_scan(
     path: Path,
     fmt: Format,
@@ -35,71 +235,444 @@ def cmd_scan(
     exclude: list[str],
     no_cache: bool,
     max_findings: int | None,
+    from_last: bool = False,
+    profile: bool = False,
+    profile_out: Path | None = None,
+    regex_engine: str | None = None,
+    file_timeout: float | None = None,
+    shard: Shard | None = None,
+    metrics_out: Path | None = None,
+    metrics_format: MetricsFormat | None = None,
+    progress: bool = False,
+    time_budget: float | None = None,
+    incremental: bool = False,
+    files: list[Path] | None = None,
+    files_from: Path | None = None,
+    null_separated: bool = False,
+    pathspecs: list[str] | None = None,
 ) -> int:
     root = path.resolve()
-
-    mode = "tracked"
-    if staged:
-        mode = "staged"
-    elif all_files:
-        mode = "all"
-    elif tracked:
-        mode = "tracked"
+    mode = resolve_mode(staged, tracked, all_files)
+    targets = None
+    if files or files_from is not None:
+        listed = read_file_list(files_from, null_separated) if files_from is not None else []
+        targets = relative_files(root, [*(files or []), *listed])
+    if targets is not None and pathspecs:
+        raise typer.BadParameter("cannot be combined with file arguments or --files-from", param_hint="--pathspec")
+    if (targets is not None or pathspecs) and (from_last or incremental):
+        raise typer.BadParameter(
+            "--from-last and --incremental cover the whole tree, not a file list or pathspec",
+            param_hint="FILES",
+        )
+    if incremental and (mode != "tracked" or shard is not None or time_budget or from_last):
+        raise typer.BadParameter(
+            "only applies to full scans of tracked files (not with --staged, --all, --shard, "
+            "--time-budget or --from-last)",
+            param_hint="--incremental",
+        )
 
     cfg = load_config(root)
     mf = int(max_findings) if max_findings is not None else cfg.report.max_findings
 
-    findings = scan_path(
-        root,
+    profiler = None
+    if profile or profile_out:
+        from .profiling import Profiler
+
+        profiler = Profiler()
+
+    coverage = None
+    if from_last:
+        stored = load_last(root, mode, baseline, exclude, regex_engine)
+        if stored is None:
+            _console(stderr=True).print(
+                f"[red]No stored {mode} scan found for this config.[/red] Run a scan first."
+            )
+            return 2
+        findings = stored
+    else:
+        # Coverage is collected in the metrics, so they are kept whenever there is a budget.
+        metrics = ScanMetrics() if metrics_out or time_budget else None
+        reporter = None
+        if progress:
+            from .progress import ScanProgress
+
+            reporter = ScanProgress()
+        with reporter if reporter is not None else nullcontext():
+            findings = run_and_record(
+                root,
+                mode,
+                baseline,
+                exclude or [],
+                use_cache=not no_cache,
+                profiler=profiler,
+                regex_engine=regex_engine,
+                file_timeout=file_timeout,
+                shard=shard,
+                metrics=metrics,
+                progress=reporter,
+                time_budget=time_budget,
+                incremental=incremental,
+                files=targets,
+                pathspecs=pathspecs or None,
+            )
+        if metrics is not None:
+            coverage = metrics.coverage
+            if metrics_out is not None:
+                metrics.write(metrics_out, metrics_format)
+
+    with profiler.stage("report") if profiler is not None else nullcontext():
+        payload = emit(findings, fmt=fmt, max_findings=mf, coverage=coverage)
+        if payload is not None:
+            if output:
+                output.write_text(payload, encoding="utf-8")
+            else:
+                typer.echo(payload)
+
+    if profiler is not None:
+        if profile:
+            profiler.print_summary()
+        if profile_out:
+            profiler.write_json(profile_out)
+
+    threshold = to_severity(fail_on)
+    return 1 if any(f.severity.ge(threshold) for f in findings) else 0
+
+
+def read_file_list(path: Path, null_separated: bool = False) -> list[str]:
+    """Paths listed in a file (- for stdin), one per line or NUL-separated as from `git ... -z`."""
+    data = sys.stdin.buffer.read() if str(path) == "-" else path.read_bytes()
+    if null_separated:
+        return [os.fsdecode(p) for p in data.split(b"\0") if p]
+    return [line for line in (os.fsdecode(p).rstrip("\r") for p in data.split(b"\n")) if line.strip()]
+
+
+def relative_files(root: Path, files: list[Path | str]) -> list[str]:
+    """Paths given relative to the working directory, as paths relative to the scanned root."""
+    out: list[str] = []
+    for f in files:
+        # Only the directory is resolved, so a symlinked file keeps its own name.
+        full = Path(f).absolute()
+        full = full.parent.resolve() / full.name
+        try:
+            out.append(full.relative_to(root).as_posix())
+        except ValueError:
+            raise typer.BadParameter(f"'{f}' is not under {root}", param_hint="FILES") from None
+    return out
+
+
+def to_shard(value: str | None, by: str) -> Shard | None:
+    if value is None:
+        return None
+    try:
+        return parse_shard(value, by)
+    except ValueError as err:
+        raise typer.BadParameter(str(err), param_hint="--shard") from err
+
+
+def cmd_merge(reports: list[Path], fmt: Format, output: Path | None, fail_on: str, max_findings: int | None) -> int:
+    # Shards never overlap, but re-run CI jobs can produce the same report twice.
+    seen: set[str] = set()
+    findings: list[Finding] = []
+    for report in reports:
+        for f in iter_report_findings(report):
+            if f.fingerprint not in seen:
+                seen.add(f.fingerprint)
+                findings.append(f)
+
+    mf = int(max_findings) if max_findings is not None else load_config(Path(".")).report.max_findings
+    payload = emit(findings, fmt=fmt, max_findings=mf)
+    if payload is not None:
+        if output:
+            output.write_text(payload, encoding="utf-8")
+        else:
+            typer.echo(payload)
+    threshold = to_severity(fail_on)
+    return 1 if any(f.severity.ge(threshold) for f in findings) else 0
+
+
+def cmd_diff(
+    old: Path,
+    new: Path,
+    fmt: Format,
+    output: Path | None,
+    fail_on: str,
+    max_findings: int | None,
+    show: str = "new",
+) -> int:
+    from .diff import diff_reports
+
+    if show not in ("new", "fixed"):
+        raise typer.BadParameter("must be new or fixed", param_hint="--show")
+    threshold = to_severity(fail_on)
+    result = diff_reports(old, new)
+    added = list(result.iter_added())
+    findings = added if show == "new" else list(result.iter_fixed())
+
+    typer.echo(
+        f"{len(result.added)} new, {len(result.fixed)} fixed, {result.unchanged} unchanged"
+        f" ({result.moved} moved)",
+        err=True,
+    )
+    mf = int(max_findings) if max_findings is not None else load_config(Path(".")).report.max_findings
+    payload = emit(findings, fmt=fmt, max_findings=mf)
+    if payload is not None:
+        if output:
+            output.write_text(payload, encoding="utf-8")
+        else:
+            typer.echo(payload)
+    return 1 if any(f.severity.ge(threshold) for f in added) else 0
+
+
+def cmd_scan_many(
+    roots: list[Path],
+    roots_file: Path | None,
+    fmt: Format,
+    output: Path | None,
+    fail_on: str,
+    baseline: Path | None,
+    staged: bool,
+    tracked: bool,
+    all_files: bool,
+    exclude: list[str],
+    no_cache: bool,
+    max_findings: int | None,
+    jobs: int | None = None,
+    regex_engine: str | None = None,
+) -> int:
+    from .batch import MANY_FORMATS, read_roots, render_many, scan_many
+
+    if fmt not in MANY_FORMATS:
+        raise typer.BadParameter(f"scan-many supports: {', '.join(MANY_FORMATS)}", param_hint="--format")
+    if fmt == "table" and output is not None:
+        raise typer.BadParameter("the table format prints to the terminal; pick another --format", param_hint="--output")
+    paths = [*roots, *(read_roots(roots_file) if roots_file else [])]
+    if not paths:
+        _console(stderr=True).print("[red]No repositories given.[/red] Pass paths or --roots-from.")
+        return 2
+
+    mode = resolve_mode(staged, tracked, all_files)
+    threshold = to_severity(fail_on)
+    results = scan_many(
+        paths,
         mode=mode,
-        baseline_path=baseline,
-        extra_exclude=exclude or [],
+        baseline_path=None,
+        extra_exclude=exclude,
         use_cache=not no_cache,
+        jobs=jobs,
+        regex_engine=regex_engine,
     )
+    for r in results:
+        if r.error:
+            r.exit_code = 2
+            continue
+        if not no_cache:
+            key = scan_key(r.root, exclude, regex_engine)
+            record_scan(r.root, mode, r.findings, r.started_at, r.duration, key)
+        r.findings = without_known(r.findings, baseline)
+        r.exit_code = 1 if any(f.severity.ge(threshold) for f in r.findings) else 0
 
-    payload = emit(findings, fmt=fmt, max_findings=mf)
+    mf = int(max_findings) if max_findings is not None else load_config(Path(".")).report.max_findings
+    payload = render_many(results, fmt, mf)
     if payload is not None:
         if output:
             output.write_text(payload, encoding="utf-8")
         else:
             typer.echo(payload)
+    return max((r.exit_code for r in results), default=0)
+
+
+def cmd_scan_image(
+    images: list[Path],
+    fmt: Format,
+    output: Path | None,
+    fail_on: str,
+    baseline: Path | None,
+    exclude: list[str],
+    no_cache: bool,
+    max_findings: int | None,
+    regex_engine: str | None = None,
+) -> int:
+    from .image import IMAGE_FORMATS, render_images, scan_images
 
+    if fmt not in IMAGE_FORMATS:
+        raise typer.BadParameter(f"scan-image supports: {', '.join(IMAGE_FORMATS)}", param_hint="--format")
+    if fmt == "table" and output is not None:
+        raise typer.BadParameter("the table format prints to the terminal; pick another --format", param_hint="--output")
+    root = Path(".").resolve()
     threshold = to_severity(fail_on)
-    return 1 if any(f.severity.ge(threshold) for f in findings) else 0
+    results = scan_images(
+        images,
+        root,
+        baseline_path=baseline,
+        extra_exclude=exclude,
+        use_cache=not no_cache,
+        regex_engine=regex_engine,
+    )
+    for r in results:
+        if r.error:
+            r.exit_code = 2
+            continue
+        # A deleted file is still in a layer of the image, so it fails the scan too.
+        r.exit_code = 1 if any(f.severity.ge(threshold) for f in r.findings + r.deleted) else 0
+
+    mf = int(max_findings) if max_findings is not None else load_config(root).report.max_findings
+    payload = render_images(results, fmt, mf)
+    if payload is not None:
+        if output:
+            output.write_text(payload, encoding="utf-8")
+        else:
+            typer.echo(payload)
+    return max((r.exit_code for r in results), default=0)
+
 
+def _baseline_meta(root: Path, mode: str, files: dict[str, list[str]]) -> BaselineMeta:
+    return BaselineMeta(
+        commit=head_commit(root),
+        mode=mode,
+        config=config_hash(root),
+        created_at=time.time(),
+        files={k: sorted(set(v)) for k, v in sorted(files.items())},
+    )
 
-def cmd_baseline(path: Path, output: Path, tracked: bool) -> int:
+
+def cmd_baseline(
+    path: Path,
+    output: Path,
+    tracked: bool,
+    fmt: BaselineFormat | None = None,
+    update: bool = False,
+    accept_new: bool = False,
+) -> int:
     root = path.resolve()
     mode = "tracked" if tracked else "all"
+    if update and output.exists():
+        return _update_baseline(root, output, mode, fmt, accept_new)
     findings = scan_path(root, mode=mode, baseline_path=None, use_cache=False)
-    fingerprints = sorted({f.fingerprint for f in findings})
-    output.write_text(json.dumps({"fingerprints": fingerprints}, indent=2), encoding="utf-8")
-    Console().print(f"✅ Wrote baseline with {len(fingerprints)} fingerprints to {output}")
+    files: dict[str, list[str]] = {}
+    for f in findings:
+        files.setdefault(f.file, []).append(f.fingerprint)
+    count = write_baseline(
+        output, (f.fingerprint for f in findings), fmt=fmt, meta=_baseline_meta(root, mode, files)
+    )
+    _console().print(f"✅ Wrote baseline with {count} fingerprints to {output}")
+    return 0
+
+
+def _update_baseline(
+    root: Path, output: Path, mode: str, fmt: BaselineFormat | None, accept_new: bool
+) -> int:
+    """Rescan what changed since the baseline was written and apply the difference.
+
+    Fingerprints of changed or deleted code that no longer match are pruned; new findings
+    are only added with `accept_new`, so an update cannot silently accept a new secret.
+    """
+    baseline = load_baseline(output)
+    try:
+        old = set(baseline)
+    finally:
+        if isinstance(baseline, BinaryBaseline):
+            baseline.close()
+    meta = load_baseline_meta(output)
+    old_files = {fp: k for k, v in meta.files.items() for fp in v} if meta is not None else {}
+    fmt = fmt or ("binary" if is_binary_baseline(output) else "json")
+
+    # Only tracked-mode baselines rescan a subset: git knows what changed since the recorded
+    # commit. Anything else (no metadata, another config, untracked files) rescans the whole
+    # tree, through the cache.
+    changed: set[str] | None = None
+    if (
+        meta is not None
+        and meta.commit
+        and meta.mode == mode == "tracked"
+        and meta.config == config_hash(root)
+    ):
+        paths = changed_since(root, meta.commit)
+        changed = set(paths) if paths is not None else None
+    findings = scan_path(root, mode=mode, baseline_path=None, use_cache=True, only=changed)
+
+    if changed is None:
+        files: dict[str, list[str]] = {}
+        in_scope = old
+    else:
+        prior = meta.files if meta is not None else {}
+        files = {k: v for k, v in prior.items() if k not in changed}
+        in_scope = {fp for fp, k in old_files.items() if k in changed}
+    found = {f.fingerprint for f in findings}
+    removed = in_scope - found
+    new = [f for f in findings if f.fingerprint not in old]
+    accepted = (old - removed) | ({f.fingerprint for f in new} if accept_new else set())
+    for f in findings:
+        if f.fingerprint in accepted:
+            files.setdefault(f.file, []).append(f.fingerprint)
+    new_meta = _baseline_meta(root, mode, files)
+    if new and not accept_new:
+        # The refused findings stay pending: keep the old commit so the next update (with
+        # --accept-new) rescans the same paths.
+        new_meta.commit = meta.commit if meta is not None and changed is not None else None
+    count = write_baseline(output, accepted, fmt=fmt, meta=new_meta)
+
+    con = _console()
+    for f in new:
+        mark = "[green]+[/green]" if accept_new else "[yellow]![/yellow]"
+        con.print(f"{mark} {f.file}:{f.line} {f.rule_id} {f.fingerprint[:12]}")
+    for fp in sorted(removed):
+        con.print(f"[red]-[/red] {old_files.get(fp, '?')} {fp[:12]}")
+    scope = "whole tree" if changed is None else f"{len(changed)} changed paths"
+    con.print(
+        f"✅ Updated baseline {output} ({scope}): {len(new) if accept_new else 0} added, "
+        f"{len(removed)} removed, {count} fingerprints"
+    )
+    if new and not accept_new:
+        con.print(
+            f"[yellow]{len(new)} new findings were not added; "
+            "review them and rerun with --accept-new.[/yellow]"
+        )
+        return 1
+    return 0
+
+
+def cmd_convert_baseline(src: Path, dst: Path, fmt: BaselineFormat | None = None) -> int:
+    count = convert_baseline(src, dst, fmt=fmt)
+    _console().print(f"✅ Converted baseline with {count} fingerprints to {dst}")
     return 0
 
 
 def cmd_init(path: Path) -> int:
+    from .fix import apply_fix
+
     root = path.resolve()
     changes = apply_fix(root)
-    con = Console()
+    con = _console()
     for c in changes:
         con.print(f"[green]✔[/green] {c}")
     con.print("Done. If you use pre-commit: `pip install pre-commit && pre-commit install`")
     return 0
 
 
-def cmd_stats(path: Path, staged: bool, tracked: bool, all_files: bool, baseline: Path | None) -> int:
+def cmd_stats(
+    path: Path,
+    staged: bool,
+    tracked: bool,
+    all_files: bool,
+    baseline: Path | None,
+    from_last: bool = False,
+    rule: str | None = None,
+) -> int:
     root = path.resolve()
-    mode = "tracked"
-    if staged:
-        mode = "staged"
-    elif all_files:
-        mode = "all"
-    elif tracked:
-        mode = "tracked"
+    mode = resolve_mode(staged, tracked, all_files)
+
+    con = _console()
+    if from_last:
+        stored = load_last(root, mode, baseline)
+        if stored is None:
+            con.print(f"[red]No stored {mode} scan found for this config.[/red] Run a scan first.")
+            return 2
+        findings = stored
+    else:
+        findings = run_and_record(root, mode, baseline, [], use_cache=True)
 
-    findings = scan_path(root, mode=mode, baseline_path=baseline)
-    con = Console()
+    if rule:
+        findings = [f for f in findings if f.rule_id == rule]
     if not findings:
         con.print("[bold green]✅ No findings.[/bold green]")
         return 0
@@ -117,3 +690,158 @@ def cmd_stats(path: Path, staged: bool, tracked: bool, all_files: bool, baseline
     con.print("[bold]Top rules:[/bold]", dict(sorted(by_rule.items(), key=lambda kv: -kv[1])[:10]))
     con.print("[bold]Top files:[/bold]", dict(sorted(by_file.items(), key=lambda kv: -kv[1])[:10]))
     return 0
+
+
+def _open_cache(path: Path) -> Cache:
+    root = path.resolve()
+    cfg = load_config(root)
+    cache = Cache(root, max_entries=cfg.cache.max_entries, max_size=cfg.cache.max_size)
+    cache.load()
+    return cache
+
+
+def _human_size(n: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def cmd_cache_stats(path: Path) -> int:
+    st = _open_cache(path).stats()
+    con = _console()
+    con.print(f"[bold]Entries:[/bold] {st.entries}")
+    con.print(f"[bold]Size:[/bold] {_human_size(st.size)}")
+    if st.hit_rate is None:
+        con.print("[bold]Last scan:[/bold] -")
+    else:
+        when = datetime.fromtimestamp(st.saved_at or 0, timezone.utc).isoformat(timespec="seconds")
+        con.print(
+            f"[bold]Last scan:[/bold] {when}, {st.hits} hits / {st.misses} misses ({st.hit_rate:.0%} hit rate)"
+        )
+    con.print("[bold]Last hit:[/bold]", st.ages)
+    cfg = load_config(path.resolve())
+    if cfg.cache.mode == "content":
+        store_dir = shared_cache_dir(path.resolve(), cfg.cache.dir) / "content"
+        files = list(store_dir.glob("*.bin"))
+        size = sum(f.stat().st_size for f in files)
+        con.print(f"[bold]Content store:[/bold] {store_dir} ({len(files)} rulesets, {_human_size(size)})")
+    return 0
+
+
+def cmd_cache_prune(path: Path, max_age_days: float | None) -> int:
+    cache = _open_cache(path)
+    before = cache.stats().entries
+    cache.prune(max_age=max_age_days * 86400 if max_age_days is not None else None)
+    cache.save()  # applies max_entries / max_size
+    after = cache.stats()
+    _console().print(f"Pruned {before - after.entries} entries; {after.entries} left ({_human_size(after.size)}).")
+    return 0
+
+
+def cmd_cache_clear(path: Path) -> int:
+    root = path.resolve()
+    _open_cache(root).clear(shared_cache_dir(root, load_config(root).cache.dir))
+    _console().print("Cache cleared.")
+    return 0
+
+
+def cmd_cache_export(path: Path, archive: Path) -> int:
+    root = path.resolve()
+    n = export_store(shared_cache_dir(root, load_config(root).cache.dir), archive)
+    _console().print(f"Exported {n} clean blob entries to {archive}.")
+    return 0
+
+
+def cmd_cache_import(path: Path, archive: Path) -> int:
+    root = path.resolve()
+    try:
+        n = import_store(shared_cache_dir(root, load_config(root).cache.dir), archive)
+    except (OSError, ValueError, tarfile.TarError) as err:
+        _console(stderr=True).print(f"[red]Cannot import {archive}:[/red] {err}")
+        return 2
+    _console().print(f"Imported {n} new clean blob entries.")
+    return 0
+
+
+def cmd_history(path: Path, limit: int) -> int:
+    from rich.table import Table
+
+    from .store import ResultsStore
+
+    root = path.resolve()
+    store = ResultsStore(root)
+    try:
+        scans = store.history(limit=limit)
+    finally:
+        store.close()
+
+    con = _console()
+    if not scans:
+        con.print("No stored scans.")
+        return 0
+
+    table = Table(title="SecretScout scan history")
+    table.add_column("ID", style="bold")
+    table.add_column("Started")
+    table.add_column("Mode")
+    table.add_column("Commit")
+    table.add_column("Duration")
+    table.add_column("Findings")
+    for sc in scans:
+        table.add_row(
+            str(sc.id),
+            sc.started_at,
+            sc.mode,
+            (sc.commit or "-")[:12],
+            f"{sc.duration:.2f}s",
+            str(sc.finding_count),
+        )
+    con.print(table)
+    return 0
+
+
+def cmd_bench(
+    corpus_dir: Path | None,
+    kinds: list[str],
+    size_mb: float,
+    density: float,
+    seed: int,
+    results_out: Path | None,
+    compare: Path | None,
+    tolerance: float,
+) -> int:
+    from rich.table import Table
+
+    from .bench import compare_results, generate_corpus, load_results, run_bench, write_results
+
+    con = _console()
+    with tempfile.TemporaryDirectory(prefix="secretscout-bench-") as tmp:
+        dest = corpus_dir.resolve() if corpus_dir else Path(tmp)
+        dest.mkdir(parents=True, exist_ok=True)
+        corpus = generate_corpus(dest, kinds=tuple(kinds), size_mb=size_mb, density=density, seed=seed)
+        con.print(f"Corpus: {corpus.files} files, {corpus.bytes / (1024 * 1024):.1f} MiB, {corpus.secrets} secrets")
+        results = run_bench(corpus)
+
+    table = Table(title="SecretScout benchmark")
+    table.add_column("Metric", style="bold")
+    table.add_column("Value")
+    for key, value in results["metrics"].items():
+        table.add_row(key, "-" if value is None else f"{value:.3f}")
+    for name, value in results["report_s"].items():
+        table.add_row(f"report_{name}_s", f"{value:.3f}")
+    con.print(table)
+
+    if results_out:
+        write_results(results_out, results)
+        con.print(f"Wrote results to {results_out}")
+
+    if compare:
+        regressions = compare_results(results, load_results(compare), tolerance=tolerance)
+        for r in regressions:
+            con.print(f"[red]Regression:[/red] {r}")
+        if regressions:
+            return 1
+        con.print("[green]No regressions against baseline.[/green]")
+    return 0
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import fnmatch
+import hashlib
+import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from . import __version__
+
 try:
     import tomllib  # py311+
 except Exception:  # pragma: no cover
@@ -16,8 +20,16 @@ except Exception:  # pragma: no cover
 class ScanConfig:
     max_file_size: int
     exclude: list[str]
-    threads: int
+    threads: int  # 0: sized per scan from the CPU count and the amount of content
     first_lines_ignore_file_marker: int
+    regex_engine: str = "re"
+    file_timeout: float = 0.0
+    long_line_threshold: int = 8192
+    long_line_window: int = 4096
+    long_line_overlap: int = 512
+    long_line_policy: str = "window"
+    long_line_sample: int = 8
+    max_structured_file_size: int = 16 * 1024 * 1024
 
 
 @dataclass
@@ -33,6 +45,15 @@ class RulesConfig:
     disable: list[str]
     allowlist: list[str]
     path_allowlist: list[str]
+    packs: list[str] = field(default_factory=list)
+
+
+@dataclass
+class CacheConfig:
+    max_entries: int = 500000  # 0: unlimited
+    max_size: int = 256 * 1024 * 1024  # bytes of cache.json; 0: unlimited
+    mode: str = "path"  # path | content (also share clean blobs through `dir`)
+    dir: str = ""  # content store directory; default .secretscout-cache
 
 
 @dataclass
@@ -40,11 +61,13 @@ class Config:
     scan: ScanConfig
     report: ReportConfig
     rules: RulesConfig
+    cache: CacheConfig = field(default_factory=CacheConfig)
 
 
 DEFAULTS: dict[str, Any] = {
     "scan": {
         "max_file_size": 1048576,
+        "max_structured_file_size": 16 * 1024 * 1024,
         "exclude": [
             ".git/**",
             ".venv/**",
@@ -57,11 +80,19 @@ DEFAULTS: dict[str, Any] = {
             ".pytest_cache/**",
             ".secretscout-cache/**",
         ],
-        "threads": 8,
+        "threads": "auto",
         "first_lines_ignore_file_marker": 5,
+        "regex_engine": "re",
+        "file_timeout": 0.0,
+        "long_line_threshold": 8192,
+        "long_line_window": 4096,
+        "long_line_overlap": 512,
+        "long_line_policy": "window",
+        "long_line_sample": 8,
     },
     "report": {"fail_on": "high", "max_findings": 200, "redact_head": 4, "redact_tail": 4},
-    "rules": {"disable": [], "allowlist": [], "path_allowlist": []},
+    "rules": {"disable": [], "allowlist": [], "path_allowlist": [], "packs": []},
+    "cache": {"max_entries": 500000, "max_size": 256 * 1024 * 1024, "mode": "path", "dir": ""},
 }
 
 
@@ -87,21 +118,40 @@ def load_ignore_file(root: Path) -> list[str]:
     return pats
 
 
+def _threads(value: Any) -> int:
+    if str(value).lower() == "auto":
+        return 0
+    return max(1, int(value))
+
+
 def load_config(root: Path) -> Config:
     raw = load_toml_config(root)
 
     scan = {**DEFAULTS["scan"], **raw.get("scan", {})}
     report = {**DEFAULTS["report"], **raw.get("report", {})}
     rules = {**DEFAULTS["rules"], **raw.get("rules", {})}
+    cache = {**DEFAULTS["cache"], **raw.get("cache", {})}
 
     scan_cfg = ScanConfig(
         max_file_size=int(scan.get("max_file_size", DEFAULTS["scan"]["max_file_size"])),
         exclude=list(scan.get("exclude", DEFAULTS["scan"]["exclude"])),
-        threads=max(1, int(scan.get("threads", DEFAULTS["scan"]["threads"]))),
+        threads=_threads(scan.get("threads", DEFAULTS["scan"]["threads"])),
         first_lines_ignore_file_marker=max(
             1, int(scan.get("first_lines_ignore_file_marker", DEFAULTS["scan"]["first_lines_ignore_file_marker"]))
         ),
+        regex_engine=str(scan.get("regex_engine", DEFAULTS["scan"]["regex_engine"])),
+        file_timeout=max(0.0, float(scan.get("file_timeout", DEFAULTS["scan"]["file_timeout"]))),
+        long_line_threshold=max(256, int(scan.get("long_line_threshold", DEFAULTS["scan"]["long_line_threshold"]))),
+        long_line_window=max(256, int(scan.get("long_line_window", DEFAULTS["scan"]["long_line_window"]))),
+        long_line_overlap=max(0, int(scan.get("long_line_overlap", DEFAULTS["scan"]["long_line_overlap"]))),
+        long_line_policy=str(scan.get("long_line_policy", DEFAULTS["scan"]["long_line_policy"])),
+        long_line_sample=max(1, int(scan.get("long_line_sample", DEFAULTS["scan"]["long_line_sample"]))),
+        max_structured_file_size=int(
+            scan.get("max_structured_file_size", DEFAULTS["scan"]["max_structured_file_size"])
+        ),
     )
+    if scan_cfg.long_line_policy not in ("window", "sample", "skip"):
+        raise ValueError(f"scan.long_line_policy must be window, sample or skip (got {scan_cfg.long_line_policy!r})")
     report_cfg = ReportConfig(
         fail_on=str(report.get("fail_on", DEFAULTS["report"]["fail_on"])),
         max_findings=max(1, int(report.get("max_findings", DEFAULTS["report"]["max_findings"]))),
@@ -112,8 +162,45 @@ def load_config(root: Path) -> Config:
         disable=list(rules.get("disable", [])),
         allowlist=list(rules.get("allowlist", [])),
         path_allowlist=list(rules.get("path_allowlist", [])),
+        packs=[str(p) for p in rules.get("packs", [])],
+    )
+    cache_cfg = CacheConfig(
+        max_entries=max(0, int(cache["max_entries"])),
+        max_size=max(0, int(cache["max_size"])),
+        mode=str(cache["mode"]),
+        dir=str(cache["dir"]),
     )
-    return Config(scan=scan_cfg, report=report_cfg, rules=rules_cfg)
+    if cache_cfg.mode not in ("path", "content"):
+        raise ValueError(f"cache.mode must be path or content (got {cache_cfg.mode!r})")
+    return Config(scan=scan_cfg, report=report_cfg, rules=rules_cfg, cache=cache_cfg)
+
+
+def config_hash(root: Path) -> str:
+    h = hashlib.sha256()
+    h.update(__version__.encode("utf-8"))
+    for name in (".secretscout.toml", ".secretscoutignore"):
+        path = root / name
+        h.update(b"\0")
+        h.update(name.encode("utf-8"))
+        h.update(b"\0")
+        if path.exists():
+            h.update(path.read_bytes())
+    # Rule packs change what a scan finds, so their content is part of the hash too.
+    for pack in load_toml_config(root).get("rules", {}).get("packs", []):
+        path = root / str(pack)
+        h.update(b"\0")
+        h.update(str(pack).encode("utf-8"))
+        h.update(b"\0")
+        if path.exists():
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def scan_key(root: Path, extra_exclude: list[str] | None = None, regex_engine: str | None = None) -> str:
+    """config_hash plus the command-line settings that change what a scan finds."""
+    h = hashlib.sha256(config_hash(root).encode("utf-8"))
+    h.update(json.dumps([sorted(extra_exclude or []), regex_engine or ""]).encode("utf-8"))
+    return h.hexdigest()
 
 
 def is_excluded(rel_path: str, patterns: list[str]) -> bool:
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from .models import Finding
+from .reporting import iter_report_records
+
+# Findings are reduced to two 64-bit keys so that reports with millions of entries fit in a
+# few arrays of machine integers:
+#   - the fingerprint (rule, file, line, match): the exact identity of a finding;
+#   - a line-insensitive key (rule, file, match hash): the same finding after the code around
+#     it moved, which changes its line and therefore its fingerprint. Reports written before
+#     findings carried a match hash fall back to the redacted snippet, which cannot tell a
+#     rotated secret with the same first and last characters from a moved one.
+
+
+def _secondary_key(d: dict[str, Any]) -> int:
+    match = d.get("match_hash")
+    raw = f"{d['rule_id']}\0{d['file']}\0{match if match else 'snippet:' + d.get('snippet', '')}".encode()
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "big")
+
+
+def _fp_key(fp: str) -> int:
+    try:
+        return int(fp[:16], 16)
+    except ValueError:  # not a hex fingerprint (hand-written report)
+        return int.from_bytes(hashlib.blake2b(fp.encode(), digest_size=8).digest(), "big")
+
+
+@dataclass
+class _Index:
+    fps: array = field(default_factory=lambda: array("Q"))
+    sks: array = field(default_factory=lambda: array("Q"))
+
+
+def _index(path: Path) -> _Index:
+    idx = _Index()
+    for d in iter_report_records(path):
+        idx.fps.append(_fp_key(str(d["fingerprint"])))
+        idx.sks.append(_secondary_key(d))
+    return idx
+
+
+def _unmatched(side: _Index, other: _Index, other_fps: set[int], side_fps: set[int]) -> tuple[set[int], int]:
+    # Entries of `side` matched neither by fingerprint nor (as a multiset) by secondary key.
+    pool = Counter(sk for fp, sk in zip(other.fps, other.sks, strict=True) if fp not in side_fps)
+    out: set[int] = set()
+    moved = 0
+    for i, (fp, sk) in enumerate(zip(side.fps, side.sks, strict=True)):
+        if fp in other_fps:
+            continue
+        if pool[sk] > 0:
+            pool[sk] -= 1
+            moved += 1
+        else:
+            out.add(i)
+    return out, moved
+
+
+@dataclass
+class ReportDiff:
+    old: Path
+    new: Path
+    added: set[int]  # entry positions in the new report
+    fixed: set[int]  # entry positions in the old report
+    unchanged: int
+    moved: int
+
+    def iter_added(self) -> Iterator[Finding]:
+        return _select(self.new, self.added)
+
+    def iter_fixed(self) -> Iterator[Finding]:
+        return _select(self.old, self.fixed)
+
+
+def _defer(line: str) -> Callable[[], Any]:
+    return partial(json.loads, line)
+
+
+def _select(path: Path, positions: set[int]) -> Iterator[Finding]:
+    if not positions:
+        return
+    # Only the selected NDJSON lines are parsed; the rest are skipped as text.
+    for i, rec in enumerate(iter_report_records(path, loads=_defer)):
+        if i in positions:
+            yield Finding.from_dict(rec() if callable(rec) else rec)
+
+
+def diff_reports(old: Path, new: Path) -> ReportDiff:
+    a = _index(old)
+    b = _index(new)
+    a_fps = set(a.fps)
+    b_fps = set(b.fps)
+    added, moved = _unmatched(b, a, a_fps, b_fps)
+    fixed, _ = _unmatched(a, b, b_fps, a_fps)
+    return ReportDiff(
+        old=old,
+        new=new,
+        added=added,
+        fixed=fixed,
+        unchanged=len(b.fps) - len(added),
+        moved=moved,
+    )
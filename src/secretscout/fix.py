@@ -7,7 +7,16 @@ PRE_COMMIT_SNIPPET = """\
   hooks:
     - id: secretscout
       name: SecretScout (defensive secret scan)
-      entry: secretscout scan --staged --format minimal --fail-on high
+      entry: secretscout-hook --fail-on high
+      language: system
+      # Staged files are passed in and pre-commit splits them across its parallel processes.
+      pass_filenames: true
+      require_serial: false
+"""
+
+# The hook written by earlier versions, which scanned the whole index in one process.
+_SERIAL_HOOK = """\
+      entry: secretscout-hook --fail-on high
       language: system
       pass_filenames: false
 """
@@ -49,8 +58,14 @@ def apply_fix(root: Path) -> list[str]:
 
     pc = root / ".pre-commit-config.yaml"
     if pc.exists():
-        append_if_missing(pc, marker="id: secretscout", block=PRE_COMMIT_SNIPPET)
-        changes.append("Updated .pre-commit-config.yaml (added SecretScout hook if missing).")
+        text = pc.read_text(encoding="utf-8")
+        if _SERIAL_HOOK in text:
+            hook = PRE_COMMIT_SNIPPET[PRE_COMMIT_SNIPPET.index("      entry:") :]
+            pc.write_text(text.replace(_SERIAL_HOOK, hook), encoding="utf-8")
+            changes.append("Updated .pre-commit-config.yaml (SecretScout hook now takes file names).")
+        else:
+            append_if_missing(pc, marker="id: secretscout", block=PRE_COMMIT_SNIPPET)
+            changes.append("Updated .pre-commit-config.yaml (added SecretScout hook if missing).")
     else:
         pc.write_text("repos:\n" + PRE_COMMIT_SNIPPET, encoding="utf-8")
         changes.append("Created .pre-commit-config.yaml (with SecretScout hook).")
@@ -62,7 +77,7 @@ def apply_fix(root: Path) -> list[str]:
 [scan]
 max_file_size = 1048576
 exclude = [".git/**", ".venv/**", "venv/**", "node_modules/**", "dist/**", "build/**", ".secretscout-cache/**"]
-threads = 8
+threads = "auto"
 first_lines_ignore_file_marker = 5
 
 [report]
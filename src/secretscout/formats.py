@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import re
+from collections.abc import Callable, Iterable
+from typing import Any
+
+# A format handler gets the decoded text of a structured file and returns it with embedded
+# payloads (notebook images, binary HAR bodies, lockfile hashes) replaced by empty JSON
+# strings, and base64 text bodies by their decoded, JSON-escaped text. Payloads never span a
+# line break in the encoded file, so every line keeps its number and findings point into the
+# original file. Files that do not parse are unchanged.
+Handler = Callable[[str], str]
+
+# One JSON string token, quotes included (the unrolled form is much faster on long strings).
+_JSON_STRING = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"')
+_DATA_URI = re.compile(r"(data:[\w.+-]+/[\w.+-]+;base64,)[A-Za-z0-9+/=\\]{16,}")
+_BINARY_MIME_PREFIXES = ("image/", "audio/", "video/", "font/")
+_BINARY_MIMES = frozenset({"application/pdf", "application/octet-stream", "application/zip"})
+
+
+def _strings(value: Any) -> Iterable[str]:
+    # nbformat stores multiline data either as one string or as a list of lines.
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        yield from (v for v in value if isinstance(v, str))
+
+
+def _is_binary_mime(mime: str) -> bool:
+    mime = mime.split(";", 1)[0].strip().lower()
+    if mime.endswith("+xml"):  # image/svg+xml and friends are text
+        return False
+    return mime.startswith(_BINARY_MIME_PREFIXES) or mime in _BINARY_MIMES
+
+
+def mask_json_strings(text: str, payloads: set[str], decoded: dict[str, str] | None = None) -> str:
+    """Replace the JSON string tokens of `text` whose value is in `payloads` with "".
+
+    Values in `decoded` are replaced with the JSON string of their decoded text instead;
+    escaping keeps it on one line.
+    """
+    swap = dict.fromkeys(payloads, "") | (decoded or {})
+    if swap:
+        tokens: dict[str, str] = {}
+        for value, new in swap.items():
+            token = json.dumps(new, ensure_ascii=False)
+            tokens[json.dumps(value)[1:-1]] = token
+            tokens[json.dumps(value, ensure_ascii=False)[1:-1]] = token
+        text = _JSON_STRING.sub(lambda m: tokens.get(m.group(1), m.group(0)), text)
+    # Inline images in markdown or HTML outputs.
+    return _DATA_URI.sub(r"\1", text)
+
+
+def _notebook_payloads(doc: dict[str, Any]) -> set[str]:
+    payloads: set[str] = set()
+    for cell in doc.get("cells") or []:
+        if not isinstance(cell, dict):
+            continue
+        for attachment in (cell.get("attachments") or {}).values():
+            for data in (attachment or {}).values():
+                payloads.update(_strings(data))
+        for output in cell.get("outputs") or []:
+            for mime, data in ((output or {}).get("data") or {}).items():
+                if _is_binary_mime(mime):
+                    payloads.update(_strings(data))
+    return payloads
+
+
+def _har_contents(doc: dict[str, Any]) -> Iterable[dict[str, Any]]:
+    for entry in (doc.get("log") or {}).get("entries") or []:
+        content = ((entry or {}).get("response") or {}).get("content") or {}
+        if isinstance(content, dict):
+            yield content
+
+
+def _har_payloads(doc: dict[str, Any]) -> set[str]:
+    payloads: set[str] = set()
+    for content in _har_contents(doc):
+        if _is_binary_mime(str(content.get("mimeType", ""))):
+            payloads.update(_strings(content.get("text")))
+    return payloads
+
+
+def _har_decoded(doc: dict[str, Any]) -> dict[str, str]:
+    # Tools base64-encode JSON and text API responses too, and those are where tokens are.
+    decoded: dict[str, str] = {}
+    for content in _har_contents(doc):
+        if content.get("encoding") != "base64" or _is_binary_mime(str(content.get("mimeType", ""))):
+            continue
+        for body in _strings(content.get("text")):
+            try:
+                decoded[body] = base64.b64decode(body).decode("utf-8")
+            except (binascii.Error, UnicodeDecodeError):
+                decoded[body] = ""  # not text after all
+    return decoded
+
+
+def _lockfile_payloads(doc: dict[str, Any]) -> set[str]:
+    # Subresource integrity hashes: high entropy by design, never secrets.
+    payloads: set[str] = set()
+    stack: list[Any] = [doc]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            integrity = node.get("integrity")
+            if isinstance(integrity, str):
+                payloads.add(integrity)
+            stack.extend(v for v in node.values() if isinstance(v, dict | list))
+        elif isinstance(node, list):
+            stack.extend(node)
+    return payloads
+
+
+def _json_handler(
+    payloads: Callable[[dict[str, Any]], set[str]],
+    decoded: Callable[[dict[str, Any]], dict[str, str]] | None = None,
+) -> Handler:
+    def handle(text: str) -> str:
+        try:
+            doc = json.loads(text)
+        except ValueError:
+            return text
+        if not isinstance(doc, dict):
+            return text
+        return mask_json_strings(text, payloads(doc), decoded(doc) if decoded is not None else None)
+
+    return handle
+
+
+# Keys starting with a dot match the extension, others the whole (lowercased) file name.
+HANDLERS: dict[str, Handler] = {
+    ".ipynb": _json_handler(_notebook_payloads),
+    ".har": _json_handler(_har_payloads, _har_decoded),
+    "package-lock.json": _json_handler(_lockfile_payloads),
+    "npm-shrinkwrap.json": _json_handler(_lockfile_payloads),
+}
+
+
+def handler_kind(rel_path: str) -> str | None:
+    """The HANDLERS key that applies to a path: its file name or its suffix."""
+    name = rel_path.rsplit("/", 1)[-1].lower()
+    if name in HANDLERS:
+        return name
+    dot = name.rfind(".")
+    return name[dot:] if dot > 0 and name[dot:] in HANDLERS else None
+
+
+def handler_for(rel_path: str) -> Handler | None:
+    kind = handler_kind(rel_path)
+    return HANDLERS[kind] if kind is not None else None
@@ -14,28 +14,114 @@ def _run_git(args: list[str], cwd: Path) -> subprocess.CompletedProcess:
     )
 
 
+def _split_z(out: bytes) -> list[str]:
+    return [s.decode("utf-8", errors="replace") for s in out.split(b"\0") if s]
+
 
 def is_git_repo(root: Path) -> bool:
     p = _run_git(["rev-parse", "--is-inside-work-tree"], cwd=root)
     return p.returncode == 0 and p.stdout.strip() == b"true"
 
 
-def tracked_files(root: Path) -> list[str]:
-    p = _run_git(["ls-files", "-z"], cwd=root)
+def _pathspec_args(pathspecs: list[str] | None) -> list[str]:
+    # Pathspecs go to git itself, so unrelated subtrees of a monorepo are never listed.
+    return ["--", *pathspecs] if pathspecs else []
+
+
+def tracked_files(root: Path, pathspecs: list[str] | None = None) -> list[str]:
+    p = _run_git(["ls-files", "-z", *_pathspec_args(pathspecs)], cwd=root)
     if p.returncode != 0:
         return []
-    return [s.decode("utf-8", errors="replace") for s in p.stdout.split(b"\0") if s]
+    return _split_z(p.stdout)
+
+
+def index_blob_ids(root: Path, pathspecs: list[str] | None = None) -> dict[str, str]:
+    """Map tracked regular files whose working copy matches the index to their blob id."""
+    p = _run_git(["ls-files", "-s", "-z", *_pathspec_args(pathspecs)], cwd=root)
+    if p.returncode != 0:
+        return {}
+    ids: dict[str, str] = {}
+    for entry in _split_z(p.stdout):
+        meta, _, rel = entry.partition("\t")
+        mode, blob, stage = meta.split(" ")
+        # Symlinks and submodules do not read as their blob; conflicted paths have several.
+        if mode in ("100644", "100755") and stage == "0":
+            ids[rel] = blob
+    # ls-files prints paths relative to `root`, git diff from the top unless --relative.
+    d = _run_git(["diff", "--name-only", "--relative", "-z", *_pathspec_args(pathspecs)], cwd=root)
+    if d.returncode != 0:
+        return {}
+    for rel in _split_z(d.stdout):
+        ids.pop(rel, None)
+    return ids
 
 
-def staged_files(root: Path) -> list[str]:
-    p = _run_git(["diff", "--cached", "--name-only", "-z"], cwd=root)
+def changed_since(root: Path, commit: str) -> list[str] | None:
+    """Tracked paths under `root` whose working copy differs from `commit`, deleted ones included.
+
+    Paths are relative to `root`, which may be a subdirectory of the repository. None if the
+    commit is not known (history rewritten, shallow clone).
+    """
+    p = _run_git(["diff", "--name-only", "--relative", "--no-renames", "-z", commit, "--"], cwd=root)
+    if p.returncode != 0:
+        return None
+    return _split_z(p.stdout)
+
+
+def changed_between(root: Path, old: str, new: str) -> list[str] | None:
+    """Paths under `root` that differ between two commits, relative to it.
+
+    None if either commit is unknown (history rewritten).
+    """
+    p = _run_git(["diff", "--name-only", "--relative", "--no-renames", "-z", old, new, "--"], cwd=root)
+    if p.returncode != 0:
+        return None
+    return _split_z(p.stdout)
+
+
+def dirty_files(root: Path, untracked: bool = False) -> list[str] | None:
+    """Paths under `root` with staged or unstaged changes (and untracked files if asked).
+
+    git status prints paths from the top of the repository; they are made relative to `root`.
+    """
+    prefix = _run_git(["rev-parse", "--show-prefix"], cwd=root)
+    if prefix.returncode != 0:
+        return None
+    base = prefix.stdout.decode("utf-8", errors="replace").strip()
+    args = ["status", "--porcelain", "-z", "--no-renames", f"--untracked-files={'all' if untracked else 'no'}", "."]
+    p = _run_git(args, cwd=root)
+    if p.returncode != 0:
+        return None
+    # Entries are "XY path"; without rename detection there is no second path.
+    paths = [entry[3:] for entry in _split_z(p.stdout) if len(entry) > 3]
+    return [rel[len(base) :] for rel in paths if rel.startswith(base)]
+
+
+def recently_changed(root: Path, days: int) -> set[str]:
+    """Paths under `root` touched by commits of the last `days` days, relative to it."""
+    p = _run_git(["log", f"--since={days}.days", "--name-only", "--relative", "--format=", "-z"], cwd=root)
+    if p.returncode != 0:
+        return set()
+    return {rel.strip("\n") for rel in _split_z(p.stdout)}
+
+
+def staged_files(root: Path, pathspecs: list[str] | None = None) -> list[str]:
+    p = _run_git(["diff", "--cached", "--name-only", "--relative", "-z", *_pathspec_args(pathspecs)], cwd=root)
     if p.returncode != 0:
         return []
-    return [s.decode("utf-8", errors="replace") for s in p.stdout.split(b"\0") if s]
+    return _split_z(p.stdout)
 
 
 def read_staged_file(root: Path, rel_path: str) -> bytes | None:
-    p = _run_git(["show", f":{rel_path}"], cwd=root)
+    # `:path` is relative to the top of the repository, `:./path` to `root`.
+    p = _run_git(["show", f":./{rel_path}"], cwd=root)
     if p.returncode != 0:
         return None
     return p.stdout
+
+
+def head_commit(root: Path) -> str | None:
+    p = _run_git(["rev-parse", "--verify", "-q", "HEAD"], cwd=root)
+    if p.returncode != 0:
+        return None
+    return p.stdout.decode("utf-8", errors="replace").strip() or None
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from .config import load_config
+from .models import Severity
+from .reporting import print_minimal
+from .scanner import scan_path
+
+# Pre-commit entry point equivalent to `secretscout scan --staged --format minimal`.
+# It deliberately avoids typer and rich, which dominate start-up time for small commits.
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="secretscout-hook",
+        description="Scan staged changes for secrets (minimal output, for git hooks).",
+    )
+    parser.add_argument("--fail-on", default="high", help="Exit 1 if findings severity >= this.")
+    parser.add_argument("--baseline", type=Path, default=None, help="Baseline file to ignore known findings.")
+    parser.add_argument("--path", type=Path, default=Path("."), help="Repository root (default: .).")
+    parser.add_argument("--no-cache", action="store_true", help="Disable cache.")
+    # pre-commit passes the staged files (pass_filenames), split across its parallel runs; their
+    # staged content is scanned. Without any, the whole index is.
+    parser.add_argument("filenames", nargs="*", help="Staged files to scan (default: all staged changes).")
+    args = parser.parse_args(argv)
+
+    try:
+        threshold = Severity(args.fail_on.lower())
+    except ValueError:
+        parser.error("--fail-on must be one of: low, medium, high, critical")
+
+    root = args.path.resolve()
+    cfg = load_config(root)
+    only = None
+    if args.filenames:
+        only = []
+        for name in args.filenames:
+            rel = os.path.relpath(os.path.abspath(name), root)
+            if rel != ".." and not rel.startswith(".." + os.sep):
+                only.append(rel.replace(os.sep, "/"))
+    findings = scan_path(
+        root, mode="staged", baseline_path=args.baseline, use_cache=not args.no_cache, only=only
+    )
+    print_minimal(findings, max_findings=cfg.report.max_findings)
+    return 1 if any(f.severity.ge(threshold) for f in findings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
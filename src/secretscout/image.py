@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tarfile
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any
+
+from .cache import shared_cache_dir
+from .config import is_excluded
+from .models import Finding
+from .reporting import _sarif_log, minimal_line, print_table, sarif_run, sort_findings, summarize
+from .scanner import (
+    ScanSetup,
+    exclude_patterns,
+    max_file_size_for,
+    prepare_scan,
+    ruleset_hash,
+    scan_bytes,
+    skip_reason,
+)
+
+# Layers are scanned once per digest: within a run for images sharing base layers, and across
+# runs through small per-layer records in the cache directory. Findings are stored with the
+# path inside the image, so a rebuilt image with the same files keeps its fingerprints.
+WHITEOUT_PREFIX = ".wh."
+OPAQUE_WHITEOUT = ".wh..wh..opq"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+@dataclass
+class LayerScan:
+    digest: str
+    files: int = 0  # regular files scanned
+    paths: list[str] = field(default_factory=list)  # every regular file, to find overwrites
+    whiteouts: list[str] = field(default_factory=list)  # paths deleted from lower layers
+    opaque: list[str] = field(default_factory=list)  # directories whose lower content is hidden
+    findings: list[Finding] = field(default_factory=list)
+    cached: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "digest": self.digest,
+            "files": self.files,
+            "paths": self.paths,
+            "whiteouts": self.whiteouts,
+            "opaque": self.opaque,
+            "findings": [f.to_dict() for f in self.findings],
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> LayerScan:
+        return cls(
+            digest=str(d["digest"]),
+            files=int(d.get("files", 0)),
+            paths=list(d.get("paths", [])),
+            whiteouts=list(d.get("whiteouts", [])),
+            opaque=list(d.get("opaque", [])),
+            findings=[Finding.from_dict(f) for f in d.get("findings", [])],
+            cached=True,
+        )
+
+
+@dataclass
+class ImageResult:
+    name: str
+    source: Path
+    findings: list[Finding] = field(default_factory=list)
+    # In a layer but deleted or overwritten by a later one: not in the final filesystem, still
+    # readable by anyone who has the image.
+    deleted: list[Finding] = field(default_factory=list)
+    layers: int = 0
+    layers_cached: int = 0
+    files: int = 0
+    duration: float = 0.0
+    error: str | None = None
+    exit_code: int = 0
+
+
+@dataclass
+class _ImageRef:
+    name: str
+    layers: list[tuple[str, str]]  # (digest, file name in the archive or layout)
+
+
+class _Source:
+    """A `docker save` archive or an OCI image layout, as a tarball or a directory."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fh = None if path.is_dir() else path.open("rb")
+        try:
+            self._tar = (
+                None if self._fh is None else tarfile.TarFile.open(fileobj=self._fh, mode="r:*")
+            )
+        except tarfile.TarError:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+
+    def exists(self, name: str) -> bool:
+        if self._tar is None:
+            return (self.path / name).is_file()
+        try:
+            self._tar.getmember(name)
+        except KeyError:
+            return False
+        return True
+
+    def open(self, name: str) -> IO[bytes]:
+        if self._tar is None:
+            return (self.path / name).open("rb")
+        fh = self._tar.extractfile(name)
+        if fh is None:
+            raise ValueError(f"Not a file in {self.path}: {name}")
+        return fh
+
+    def read_json(self, name: str) -> Any:
+        with self.open(name) as fh:
+            return json.loads(fh.read())
+
+
+def _blob_name(digest: str) -> str:
+    alg, _, hexdigest = digest.partition(":")
+    return f"blobs/{alg}/{hexdigest}"
+
+
+def _list_images(src: _Source) -> list[_ImageRef]:
+    if src.exists("manifest.json"):
+        # docker save. Layer digests come from the config (uncompressed diff ids), which
+        # stay the same whether the layer was pulled, built or saved by another tool.
+        images: list[_ImageRef] = []
+        for entry in src.read_json("manifest.json"):
+            config = src.read_json(entry["Config"]) if entry.get("Config") else {}
+            diff_ids = (config.get("rootfs") or {}).get("diff_ids") or []
+            layers = []
+            for i, name in enumerate(entry.get("Layers") or []):
+                digest = diff_ids[i] if i < len(diff_ids) else f"file:{name}"
+                layers.append((digest, name))
+            tags = entry.get("RepoTags") or []
+            images.append(_ImageRef(tags[0] if tags else str(entry.get("Config", "image")), layers))
+        return images
+    if src.exists("index.json"):
+        return list(_oci_images(src, src.read_json("index.json"), None))
+    raise ValueError(f"Not a docker save archive or OCI image layout: {src.path}")
+
+
+def _oci_images(src: _Source, index: dict[str, Any], name: str | None) -> Iterator[_ImageRef]:
+    for desc in index.get("manifests") or []:
+        ref = (desc.get("annotations") or {}).get("org.opencontainers.image.ref.name") or name
+        platform = desc.get("platform") or {}
+        label = ref or desc["digest"][:19]
+        if platform:
+            label += f" ({platform.get('os', '?')}/{platform.get('architecture', '?')})"
+        doc = src.read_json(_blob_name(desc["digest"]))
+        if "manifests" in doc:  # a multi-platform index
+            yield from _oci_images(src, doc, ref)
+            continue
+        yield _ImageRef(
+            label,
+            [(layer["digest"], _blob_name(layer["digest"])) for layer in doc.get("layers") or []],
+        )
+
+
+def _normalise(name: str) -> str:
+    while name.startswith("./"):
+        name = name[2:]
+    return name.lstrip("/")
+
+
+def scan_layer(fh: IO[bytes], digest: str, setup: ScanSetup, patterns: list[str]) -> LayerScan:
+    """Stream one layer tar (plain or gzip) and scan its regular files."""
+    layer = LayerScan(digest=digest)
+    with tarfile.open(fileobj=fh, mode="r|*") as tar:
+        for member in tar:
+            path = _normalise(member.name)
+            parent, _, base = path.rpartition("/")
+            if base == OPAQUE_WHITEOUT:
+                layer.opaque.append(parent)
+                continue
+            if base.startswith(WHITEOUT_PREFIX):
+                layer.whiteouts.append(
+                    f"{parent}/{base[len(WHITEOUT_PREFIX) :]}"
+                    if parent
+                    else base[len(WHITEOUT_PREFIX) :]
+                )
+                continue
+            if not member.isfile():
+                continue
+            layer.paths.append(path)
+            if is_excluded(path, patterns) or member.size > max_file_size_for(path, setup.cfg):
+                continue
+            data = tar.extractfile(member)
+            content = data.read() if data is not None else b""
+            if skip_reason(content, setup.cfg) is not None:
+                continue
+            layer.files += 1
+            layer.findings.extend(scan_bytes(path, content, **setup.scan_kwargs))
+    return layer
+
+
+def _open_layer(src: _Source, name: str) -> IO[bytes]:
+    with src.open(name) as fh:
+        if fh.read(4) == _ZSTD_MAGIC:
+            raise ValueError(f"zstd-compressed layers are not supported: {name}")
+    return src.open(name)
+
+
+def _hidden_above(path: str, upper: list[tuple[set[str], set[str], set[str]]]) -> bool:
+    """Whether a later layer overwrites `path` or deletes it or one of its directories."""
+    dirs = set()
+    d = path
+    while "/" in d:
+        d = d.rpartition("/")[0]
+        dirs.add(d)
+    for paths, whiteouts, opaque in upper:
+        if path in paths or path in whiteouts or dirs & whiteouts or dirs & opaque or "" in opaque:
+            return True
+    return False
+
+
+def _record_path(record_dir: Path, digest: str) -> Path:
+    return record_dir / (digest.replace(":", "-").replace("/", "_") + ".json")
+
+
+def _load_record(record_dir: Path | None, digest: str) -> LayerScan | None:
+    if record_dir is None:
+        return None
+    path = _record_path(record_dir, digest)
+    try:
+        return LayerScan.from_dict(json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_record(record_dir: Path, layer: LayerScan) -> None:
+    record_dir.mkdir(parents=True, exist_ok=True)
+    path = _record_path(record_dir, layer.digest)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(layer.to_dict(), ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _scan_image(
+    src: _Source,
+    ref: _ImageRef,
+    setup: ScanSetup,
+    patterns: list[str],
+    seen: dict[str, LayerScan],
+    record_dir: Path | None,
+) -> ImageResult:
+    t0 = time.perf_counter()
+    result = ImageResult(name=ref.name, source=src.path, layers=len(ref.layers))
+    layers: list[LayerScan] = []
+    try:
+        for digest, name in ref.layers:
+            layer = seen.get(digest) or _load_record(record_dir, digest)
+            if layer is None:
+                with _open_layer(src, name) as fh:
+                    layer = scan_layer(fh, digest, setup, patterns)
+                if record_dir is not None:
+                    _save_record(record_dir, layer)
+            if digest in seen or layer.cached:
+                result.layers_cached += 1
+            seen[digest] = layer
+            layers.append(layer)
+    except (OSError, ValueError, KeyError, tarfile.TarError) as err:
+        result.error = f"{type(err).__name__}: {err}"
+    hides = [(set(layer.paths), set(layer.whiteouts), set(layer.opaque)) for layer in layers]
+    for i, layer in enumerate(layers):
+        result.files += layer.files
+        for f in layer.findings:
+            if f.fingerprint in setup.baseline:
+                continue
+            f = replace(f, layer=layer.digest)
+            (result.deleted if _hidden_above(f.file, hides[i + 1 :]) else result.findings).append(f)
+    result.duration = time.perf_counter() - t0
+    return result
+
+
+def scan_images(
+    sources: list[Path],
+    root: Path,
+    baseline_path: Path | None = None,
+    extra_exclude: list[str] | None = None,
+    use_cache: bool = True,
+    regex_engine: str | None = None,
+) -> list[ImageResult]:
+    """Scan the images of `docker save` archives and OCI layouts, each layer digest once.
+
+    Config, excludes, rule packs and the cache directory come from `root`; exclude patterns
+    apply to the paths inside the image.
+    """
+    setup = prepare_scan(
+        root, baseline_path, use_cache=use_cache, regex_engine=regex_engine, file_timeout=0.0
+    )
+    try:
+        patterns = exclude_patterns(root, setup.cfg, extra_exclude)
+        # Layer records hold findings before baseline filtering, so they only depend on the rules,
+        # the excludes and the path allowlist.
+        salt = hashlib.sha256(ruleset_hash(setup.scan_kwargs).encode("utf-8"))
+        for p in [*patterns, "\0", *(a.pattern for a in setup.scan_kwargs["path_allowlist"])]:
+            salt.update(b"\0" + p.encode("utf-8"))
+        record_dir = shared_cache_dir(root, setup.cfg.cache.dir) / "layers" / salt.hexdigest()[:16]
+        seen: dict[str, LayerScan] = {}
+        results: list[ImageResult] = []
+        for path in sources:
+            try:
+                src = _Source(path)
+            except (OSError, tarfile.TarError) as err:
+                results.append(
+                    ImageResult(name=str(path), source=path, error=f"{type(err).__name__}: {err}")
+                )
+                continue
+            try:
+                for ref in _list_images(src):
+                    results.append(
+                        _scan_image(src, ref, setup, patterns, seen, record_dir if use_cache else None)
+                    )
+            except (OSError, ValueError, KeyError, tarfile.TarError) as err:
+                results.append(
+                    ImageResult(name=str(path), source=path, error=f"{type(err).__name__}: {err}")
+                )
+            finally:
+                src.close()
+        return results
+    finally:
+        setup.close()
+
+
+IMAGE_FORMATS = ("table", "minimal", "json", "ndjson", "sarif")
+
+
+def render_images(results: list[ImageResult], fmt: str, max_findings: int) -> str | None:
+    """The report as text, or None for `table`, which is printed to the terminal."""
+    if fmt == "json":
+        payload = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "count": sum(len(r.findings) for r in results),
+            "deleted_count": sum(len(r.deleted) for r in results),
+            "summary": summarize(f for r in results for f in r.findings),
+            "images": [
+                {
+                    "image": r.name,
+                    "source": str(r.source),
+                    "exit_code": r.exit_code,
+                    "error": r.error,
+                    "layers": r.layers,
+                    "layers_cached": r.layers_cached,
+                    "files": r.files,
+                    "duration_s": r.duration,
+                    "count": len(r.findings),
+                    "summary": summarize(r.findings),
+                    "findings": [f.to_dict() for f in sort_findings(r.findings)],
+                    "deleted": [f.to_dict() for f in sort_findings(r.deleted)],
+                }
+                for r in results
+            ],
+        }
+        return json.dumps(payload, ensure_ascii=False, indent=2)
+    if fmt == "ndjson":
+        return "\n".join(
+            json.dumps({"image": r.name, "deleted": deleted, **f.to_dict()}, ensure_ascii=False)
+            for r in results
+            for deleted, group in ((False, r.findings), (True, r.deleted))
+            for f in sort_findings(group)
+        )
+    if fmt == "sarif":
+        runs = []
+        for r in results:
+            found = r.findings + r.deleted
+            run = sarif_run(found)
+            # A file copied unchanged into an upper layer has the same fingerprint in both;
+            # only the copy below is deleted.
+            deleted = {(f.layer, f.file, f.fingerprint) for f in r.deleted}
+            for res, f in zip(run["results"], sort_findings(found), strict=True):
+                res["properties"]["layer"] = f.layer
+                res["properties"]["deleted"] = (f.layer, f.file, f.fingerprint) in deleted
+            run["properties"] = {"image": r.name}
+            runs.append(run)
+        return json.dumps(_sarif_log(runs), ensure_ascii=False, indent=2)
+    if fmt == "minimal":
+        lines: list[str] = []
+        for r in results:
+            if r.error:
+                lines.append(f"{r.name}\terror\t{r.error}")
+            lines.extend(f"{r.name}\t{minimal_line(f)}" for f in sort_findings(r.findings)[:max_findings])
+            lines.extend(f"{r.name}\tdeleted\t{minimal_line(f)}" for f in sort_findings(r.deleted)[:max_findings])
+        return "\n".join(lines)
+    if fmt == "table":
+        _print_images_table(results, max_findings)
+        return None
+    raise ValueError(
+        f"Format not supported by scan-image: {fmt} (expected one of: {', '.join(IMAGE_FORMATS)})"
+    )
+
+
+def _print_images_table(results: list[ImageResult], max_findings: int) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="SecretScout images")
+    table.add_column("Image", style="bold")
+    table.add_column("Layers (cached)", justify="right")
+    table.add_column("Files", justify="right")
+    table.add_column("Findings", justify="right")
+    table.add_column("Deleted", justify="right")
+    table.add_column("Exit", justify="right")
+    for r in results:
+        table.add_row(
+            r.name,
+            f"{r.layers} ({r.layers_cached})",
+            str(r.files),
+            r.error or str(len(r.findings)),
+            str(len(r.deleted)),
+            str(r.exit_code),
+        )
+    console = Console()
+    console.print(table)
+    for r in results:
+        if r.findings:
+            console.print(f"\n[bold]{r.name}[/bold]")
+            print_table(r.findings, max_findings=max_findings)
+        if r.deleted:
+            console.print(f"\n[bold]{r.name}[/bold]: deleted by a later layer, still in the image")
+            print_table(r.deleted, max_findings=max_findings)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .baseline import without_known
+from .config import scan_key
+from .git import changed_between, dirty_files, head_commit, is_git_repo
+from .models import Finding
+from .scanner import scan_path
+
+STATE_VERSION = 1
+
+
+@dataclass
+class IncrementalState:
+    """What the last completed tracked scan saw, so the next one only rescans what changed."""
+
+    commit: str
+    key: str  # config, rule packs, excludes and engine; anything else means a full scan
+    dirty: list[str] = field(default_factory=list)  # modified at the time; rescanned next run
+    findings: list[dict[str, Any]] = field(default_factory=list)  # before baseline filtering
+
+
+def state_path(root: Path) -> Path:
+    return root / ".secretscout-cache" / "incremental.json"
+
+
+def load_state(root: Path) -> IncrementalState | None:
+    try:
+        raw = json.loads(state_path(root).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(raw, dict) or raw.get("version") != STATE_VERSION:
+        return None
+    return IncrementalState(
+        commit=str(raw.get("commit", "")),
+        key=str(raw.get("key", "")),
+        dirty=[str(p) for p in raw.get("dirty", [])],
+        findings=list(raw.get("findings", [])),
+    )
+
+
+def save_state(root: Path, state: IncrementalState) -> None:
+    path = state_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"version": STATE_VERSION, **asdict(state)}
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def incremental_scan(
+    root: Path,
+    baseline_path: Path | None = None,
+    extra_exclude: list[str] | None = None,
+    regex_engine: str | None = None,
+    **scan_options: Any,
+) -> tuple[list[Finding], bool]:
+    """Scan the tracked files, rescanning only those changed since the last incremental scan.
+
+    Candidates are the files changed between the recorded commit and HEAD, plus those
+    modified in the working tree now or at the last scan; the stored findings of every other
+    file are reused. Returns the findings and whether a full scan was needed.
+    """
+    if not is_git_repo(root):
+        findings = scan_path(
+            root,
+            mode="tracked",
+            baseline_path=baseline_path,
+            extra_exclude=extra_exclude,
+            regex_engine=regex_engine,
+            **scan_options,
+        )
+        return findings, True
+
+    key = scan_key(root, extra_exclude, regex_engine)
+    head = head_commit(root)
+    dirty = dirty_files(root)
+    state = load_state(root)
+    candidates: set[str] | None = None
+    stored: list[Finding] = []
+    if state is not None and state.key == key and head and dirty is not None:
+        changed = changed_between(root, state.commit, head)
+        if changed is not None:
+            candidates = {*changed, *dirty, *state.dirty}
+            stored = [f for f in map(Finding.from_dict, state.findings) if f.file not in candidates]
+
+    found = scan_path(
+        root,
+        mode="tracked",
+        baseline_path=None,
+        extra_exclude=extra_exclude,
+        regex_engine=regex_engine,
+        only=candidates,
+        **scan_options,
+    )
+    findings = stored + found
+    if head:
+        state = IncrementalState(
+            commit=head,
+            key=key,
+            dirty=sorted(dirty or []),
+            findings=[f.to_dict() for f in findings],
+        )
+        save_state(root, state)
+    return without_known(findings, baseline_path), candidates is None
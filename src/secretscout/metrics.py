@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import time
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+from .models import Coverage, Finding
+
+MetricsFormat = Literal["json", "prometheus"]
+
+SKIP_REASONS = ("excluded", "size", "binary", "ignore_marker", "unreadable", "time_budget")
+FILE_SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024)
+FILE_SECONDS_BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0)
+
+
+def _histogram(values: Iterable[float], buckets: tuple[float, ...]) -> dict[str, Any]:
+    counts = [0] * (len(buckets) + 1)
+    total = 0.0
+    n = 0
+    for v in values:
+        counts[bisect_left(buckets, v)] += 1
+        total += v
+        n += 1
+    cumulative: dict[str, int] = {}
+    running = 0
+    for le, c in zip([*map(str, buckets), "+Inf"], counts, strict=True):
+        running += c
+        cumulative[le] = running
+    return {"buckets": cumulative, "sum": total, "count": n}
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+@dataclass
+class ScanMetrics:
+    """Counters of one scan_path run. Updated from the listing loop and merged per file group,
+    so collecting them costs a few integer additions per file."""
+
+    mode: str = ""
+    files_listed: int = 0
+    files_scanned: int = 0  # read and matched, or answered by a cache
+    files_deduplicated: int = 0  # copies of a content matched for another path
+    bytes_scanned: int = 0
+    skipped: Counter[str] = field(default_factory=Counter)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    content_store_hits: int = 0
+    findings: Counter[tuple[str, str]] = field(default_factory=Counter)  # (rule id, severity)
+    stages: dict[str, float] = field(default_factory=dict)  # wall seconds
+    duration: float = 0.0
+    finished_at: float = 0.0
+    file_sizes: list[int] = field(default_factory=list)
+    file_seconds: list[float] = field(default_factory=list)
+    coverage: Coverage | None = None  # only with a time budget
+
+    def add_findings(self, findings: Iterable[Finding]) -> None:
+        self.findings.update((f.rule_id, f.severity.value) for f in findings)
+
+    @property
+    def cache_hit_ratio(self) -> float | None:
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else None
+
+    def to_dict(self) -> dict[str, Any]:
+        by_rule: Counter[str] = Counter()
+        by_severity: Counter[str] = Counter()
+        for (rule_id, severity), n in self.findings.items():
+            by_rule[rule_id] += n
+            by_severity[severity] += n
+        return {
+            "mode": self.mode,
+            "finished_at": self.finished_at,
+            "duration_s": self.duration,
+            "files": {
+                "listed": self.files_listed,
+                "scanned": self.files_scanned,
+                "deduplicated": self.files_deduplicated,
+                "skipped": {reason: self.skipped.get(reason, 0) for reason in SKIP_REASONS},
+            },
+            "bytes_scanned": self.bytes_scanned,
+            "cache": {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "hit_ratio": self.cache_hit_ratio,
+                "content_store_hits": self.content_store_hits,
+            },
+            "findings": {"by_rule": dict(by_rule), "by_severity": dict(by_severity)},
+            "stages_s": dict(self.stages),
+            "file_size_bytes": _histogram(self.file_sizes, FILE_SIZE_BUCKETS),
+            "file_scan_seconds": _histogram(self.file_seconds, FILE_SECONDS_BUCKETS),
+            "coverage": self.coverage.to_dict() if self.coverage is not None else None,
+        }
+
+    def to_prometheus(self) -> str:
+        lines: list[str] = []
+
+        def metric(
+            name: str, kind: str, help_text: str, samples: Iterable[tuple[str, float]]
+        ) -> None:
+            lines.append(f"# HELP secretscout_{name} {help_text}")
+            lines.append(f"# TYPE secretscout_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"secretscout_{name}{labels} {_number(value)}")
+
+        def histogram(name: str, help_text: str, data: dict[str, Any]) -> None:
+            samples = [(f'_bucket{{le="{le}"}}', float(n)) for le, n in data["buckets"].items()]
+            samples += [("_sum", data["sum"]), ("_count", float(data["count"]))]
+            lines.append(f"# HELP secretscout_{name} {help_text}")
+            lines.append(f"# TYPE secretscout_{name} histogram")
+            lines.extend(
+                f"secretscout_{name}{suffix} {_number(value)}" for suffix, value in samples
+            )
+
+        mode = f'{{mode="{self.mode}"}}'
+        metric(
+            "files_listed", "gauge", "Files listed after exclusion.", [(mode, self.files_listed)]
+        )
+        metric(
+            "files_scanned",
+            "gauge",
+            "Files scanned or answered by a cache.",
+            [(mode, self.files_scanned)],
+        )
+        metric(
+            "files_deduplicated",
+            "gauge",
+            "Files whose identical content was matched once.",
+            [(mode, self.files_deduplicated)],
+        )
+        metric(
+            "files_skipped",
+            "gauge",
+            "Files skipped, by reason.",
+            [
+                (f'{{mode="{self.mode}",reason="{r}"}}', self.skipped.get(r, 0))
+                for r in SKIP_REASONS
+            ],
+        )
+        metric(
+            "bytes_scanned", "gauge", "Bytes of the scanned files.", [(mode, self.bytes_scanned)]
+        )
+        metric("cache_hits", "gauge", "Per-path cache hits.", [(mode, self.cache_hits)])
+        metric("cache_misses", "gauge", "Per-path cache misses.", [(mode, self.cache_misses)])
+        metric(
+            "content_store_hits",
+            "gauge",
+            "Clean blobs answered by the content store.",
+            [(mode, self.content_store_hits)],
+        )
+        metric(
+            "findings",
+            "gauge",
+            "Findings after baseline filtering.",
+            [
+                (f'{{mode="{self.mode}",rule="{rule_id}",severity="{severity}"}}', n)
+                for (rule_id, severity), n in sorted(self.findings.items())
+            ],
+        )
+        metric(
+            "stage_seconds",
+            "gauge",
+            "Wall time per scan stage.",
+            [(f'{{mode="{self.mode}",stage="{s}"}}', v) for s, v in self.stages.items()],
+        )
+        metric("duration_seconds", "gauge", "Wall time of the scan.", [(mode, self.duration)])
+        metric(
+            "last_run_timestamp_seconds",
+            "gauge",
+            "When the scan finished.",
+            [(mode, self.finished_at)],
+        )
+        histogram(
+            "file_size_bytes",
+            "Size of the distinct file contents read.",
+            _histogram(self.file_sizes, FILE_SIZE_BUCKETS),
+        )
+        histogram(
+            "file_scan_seconds",
+            "Time to scan one distinct file content.",
+            _histogram(self.file_seconds, FILE_SECONDS_BUCKETS),
+        )
+        return "\n".join(lines) + "\n"
+
+    def finish(self, t0: float) -> None:
+        self.duration = time.perf_counter() - t0
+        self.finished_at = time.time()
+
+    def write(self, path: Path, fmt: MetricsFormat | None = None) -> None:
+        fmt = fmt or ("prometheus" if path.suffix in (".prom", ".txt") else "json")
+        if fmt == "prometheus":
+            # node_exporter's textfile collector may read at any time: replace the file atomically.
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(self.to_prometheus(), encoding="utf-8")
+            tmp.replace(path)
+        else:
+            path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from typing import Any, Literal
+
+Format = Literal["table", "minimal", "json", "ndjson", "sarif", "html"]
 
 
 class Severity(str, Enum):
@@ -28,6 +30,41 @@ class Rule:
     pattern: str
     multiline: bool = False
     tags: tuple[str, ...] = ()
+    # Lowercase literals of which at least one must occur for the pattern to match;
+    # used to skip the regex cheaply. Empty means "always run".
+    keywords: tuple[str, ...] = ()
+
+
+@dataclass
+class Coverage:
+    """How much of the listed files a scan with a time budget got through."""
+
+    files_scanned: int
+    files_total: int
+    bytes_scanned: int
+    bytes_total: int
+
+    @property
+    def complete(self) -> bool:
+        return self.files_scanned >= self.files_total
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "files_scanned": self.files_scanned,
+            "files_total": self.files_total,
+            "bytes_scanned": self.bytes_scanned,
+            "bytes_total": self.bytes_total,
+            "complete": self.complete,
+        }
+
+    def line(self) -> str:
+        mb = 1024 * 1024
+        pct = self.bytes_scanned / self.bytes_total if self.bytes_total else 1.0
+        note = "" if self.complete else " (time budget reached)"
+        return (
+            f"Coverage: {self.files_scanned}/{self.files_total} files, "
+            f"{self.bytes_scanned / mb:.1f}/{self.bytes_total / mb:.1f} MB ({pct:.0%}){note}"
+        )
 
 
 @dataclass
@@ -41,9 +78,12 @@ class Finding:
     match: str
     snippet: str
     fingerprint: str
+    offset: int | None = None  # byte offset of the line in a stream; None for files
+    layer: str | None = None  # digest of the image layer holding the file; None for files
+    match_hash: str | None = None  # short hash of the unredacted match, to follow it across lines
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        d = {
             "rule_id": self.rule_id,
             "rule_title": self.rule_title,
             "severity": self.severity.value,
@@ -54,3 +94,27 @@ class Finding:
             "snippet": self.snippet,
             "fingerprint": self.fingerprint,
         }
+        if self.offset is not None:
+            d["offset"] = self.offset
+        if self.layer is not None:
+            d["layer"] = self.layer
+        if self.match_hash is not None:
+            d["match_hash"] = self.match_hash
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> Finding:
+        return cls(
+            rule_id=str(d["rule_id"]),
+            rule_title=str(d.get("rule_title", d["rule_id"])),
+            severity=Severity(str(d["severity"])),
+            file=str(d["file"]),
+            line=int(d["line"]),
+            col=int(d["col"]),
+            match=str(d["match"]),
+            snippet=str(d["snippet"]),
+            fingerprint=str(d["fingerprint"]),
+            offset=int(d["offset"]) if d.get("offset") is not None else None,
+            layer=str(d["layer"]) if d.get("layer") is not None else None,
+            match_hash=str(d["match_hash"]) if d.get("match_hash") is not None else None,
+        )
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import heapq
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .schedule import PoolStats
+
+
+@dataclass
+class Timing:
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+    def add(self, wall: float, cpu: float, calls: int = 1) -> None:
+        self.wall += wall
+        self.cpu += cpu
+        self.calls += calls
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"wall_s": self.wall, "cpu_s": self.cpu, "calls": self.calls}
+
+
+class FileProfile:
+    """Per-file, single-threaded accumulator merged into a Profiler once the file is done."""
+
+    def __init__(self, path: str, top_n: int) -> None:
+        self.path = path
+        self.top_n = top_n
+        self.stages: dict[str, Timing] = {}
+        self.rules: dict[str, Timing] = {}
+        self.lines: list[tuple[float, int]] = []
+
+    def stage(self, name: str, wall: float, cpu: float) -> None:
+        t = self.stages.get(name)
+        if t is None:
+            t = self.stages[name] = Timing()
+        t.add(wall, cpu)
+
+    def rule(self, rule_id: str, wall: float, cpu: float) -> None:
+        t = self.rules.get(rule_id)
+        if t is None:
+            t = self.rules[rule_id] = Timing()
+        t.add(wall, cpu)
+
+    def line(self, lineno: int, wall: float) -> None:
+        _push(self.lines, (wall, lineno), self.top_n)
+
+
+class Profiler:
+    def __init__(self, top_n: int = 10) -> None:
+        self.top_n = top_n
+        self.stages: dict[str, Timing] = {}
+        self.rules: dict[str, Timing] = {}
+        self._files: list[tuple[float, str]] = []
+        self._lines: list[tuple[float, str, int]] = []
+        self._lock = threading.Lock()
+        self.pool: PoolStats | None = None
+
+    def add_stage(self, name: str, wall: float, cpu: float, calls: int = 1) -> None:
+        with self._lock:
+            self.stages.setdefault(name, Timing()).add(wall, cpu, calls)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        w0 = time.perf_counter()
+        c0 = time.thread_time()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - w0, time.thread_time() - c0)
+
+    def file_profile(self, path: str) -> FileProfile:
+        return FileProfile(path, self.top_n)
+
+    def merge(self, fp: FileProfile, wall: float) -> None:
+        with self._lock:
+            for name, t in fp.stages.items():
+                self.stages.setdefault(name, Timing()).add(t.wall, t.cpu, t.calls)
+            for rule_id, t in fp.rules.items():
+                self.rules.setdefault(rule_id, Timing()).add(t.wall, t.cpu, t.calls)
+            _push(self._files, (wall, fp.path), self.top_n)
+            for line_wall, lineno in fp.lines:
+                _push(self._lines, (line_wall, fp.path, lineno), self.top_n)
+
+    def slowest_files(self) -> list[tuple[float, str]]:
+        return sorted(self._files, reverse=True)
+
+    def slowest_lines(self) -> list[tuple[float, str, int]]:
+        return sorted(self._lines, reverse=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stages": {k: v.to_dict() for k, v in self.stages.items()},
+            "pool": self.pool.to_dict() if self.pool is not None else None,
+            "rules": {k: v.to_dict() for k, v in self.rules.items()},
+            "slowest_files": [{"file": f, "wall_s": w} for w, f in self.slowest_files()],
+            "slowest_lines": [{"file": f, "line": ln, "wall_s": w} for w, f, ln in self.slowest_lines()],
+        }
+
+    def write_json(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    def print_summary(self) -> None:
+        from rich.console import Console
+        from rich.table import Table
+
+        con = Console(stderr=True)
+        for title, data in (("Stages", self.stages), ("Rules", self.rules)):
+            table = Table(title=f"SecretScout profile: {title.lower()}")
+            table.add_column(title[:-1], style="bold")
+            table.add_column("Wall (s)", justify="right")
+            table.add_column("CPU (s)", justify="right")
+            table.add_column("Calls", justify="right")
+            for name, t in sorted(data.items(), key=lambda kv: -kv[1].wall):
+                table.add_row(name, f"{t.wall:.4f}", f"{t.cpu:.4f}", str(t.calls))
+            con.print(table)
+
+        if self.pool is not None:
+            p = self.pool
+            con.print(
+                f"Workers: {p.workers}, chunks: {p.chunks}, busy {p.busy:.4f}s of {p.wall:.4f}s wall, "
+                f"utilisation {p.utilisation:.0%}"
+            )
+
+        table = Table(title=f"Slowest files (top {self.top_n})")
+        table.add_column("File", style="bold")
+        table.add_column("Wall (s)", justify="right")
+        for wall, path in self.slowest_files():
+            table.add_row(path, f"{wall:.4f}")
+        con.print(table)
+
+        table = Table(title=f"Slowest lines (top {self.top_n})")
+        table.add_column("Location", style="bold")
+        table.add_column("Wall (s)", justify="right")
+        for wall, path, lineno in self.slowest_lines():
+            table.add_row(f"{path}:{lineno}", f"{wall:.4f}")
+        con.print(table)
+
+
+def _push(heap: list, item: tuple, n: int) -> None:
+    if len(heap) < n:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from typing import Any, TextIO
+
+# Interval between progress lines when stderr is not a terminal.
+LOG_INTERVAL = 10.0
+REFRESH = 0.25
+
+
+class ScanProgress:
+    """Progress counters of one scan, drawn by a background thread.
+
+    scan_path updates the counters only from its own thread (listing, then chunk completions),
+    and the drawing thread only reads them, so the workers never take a lock for progress.
+    """
+
+    def __init__(self, stream: TextIO | None = None, interactive: bool | None = None) -> None:
+        self.stream = stream if stream is not None else sys.stderr
+        self.interactive = self.stream.isatty() if interactive is None else interactive
+        self.files_total = 0
+        self.bytes_total = 0
+        self.files_done = 0
+        self.bytes_done = 0
+        self.findings = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.listing = True
+        self._scan_t0: float | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._rich: Any = None
+        self._task: Any = None
+
+    # ---- updates (scan thread) ----
+
+    def discovered(self, files: int, size: int) -> None:
+        self.files_total += files
+        self.bytes_total += size
+
+    def listed(self) -> None:
+        self.listing = False
+        self._scan_t0 = time.perf_counter()
+
+    def done(self, files: int, size: int, findings: int = 0) -> None:
+        self.files_done += files
+        self.bytes_done += size
+        self.findings += findings
+
+    def cache(self, hits: int, misses: int) -> None:
+        self.cache_hits = hits
+        self.cache_misses = misses
+
+    # ---- derived values ----
+
+    @property
+    def rate(self) -> float:
+        """Bytes per second since scanning (not listing) started."""
+        if self._scan_t0 is None:
+            return 0.0
+        elapsed = time.perf_counter() - self._scan_t0
+        return self.bytes_done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float | None:
+        rate = self.rate
+        if self.listing or rate <= 0:
+            return None
+        return max(0.0, (self.bytes_total - self.bytes_done) / rate)
+
+    def line(self) -> str:
+        mb = 1024 * 1024
+        if self.listing:
+            return f"listing: {self.files_total} files, {self.bytes_total / mb:.1f} MB found"
+        lookups = self.cache_hits + self.cache_misses
+        cache = f"{self.cache_hits / lookups:.0%}" if lookups else "-"
+        eta = self.eta
+        return (
+            f"{self.files_done}/{self.files_total} files, "
+            f"{self.bytes_done / mb:.1f}/{self.bytes_total / mb:.1f} MB, "
+            f"{self.rate / mb:.1f} MB/s, cache {cache}, {self.findings} findings, "
+            f"ETA {'-' if eta is None else f'{eta:.0f}s'}"
+        )
+
+    # ---- drawing (background thread) ----
+
+    def __enter__(self) -> ScanProgress:
+        if self.interactive:
+            from rich.console import Console
+            from rich.progress import BarColumn, Progress, TextColumn
+
+            self._rich = Progress(
+                TextColumn("[bold]scan[/bold]"),
+                BarColumn(),
+                TextColumn("{task.description}"),
+                console=Console(file=self.stream),
+                transient=True,
+                auto_refresh=False,
+            )
+            self._rich.start()
+            self._task = self._rich.add_task(self.line(), total=None)
+        self._thread = threading.Thread(target=self._run, name="secretscout-progress", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._rich is not None:
+            self._rich.stop()
+        elif exc[0] is None:
+            self._draw()
+
+    def _run(self) -> None:
+        interval = REFRESH if self.interactive else LOG_INTERVAL
+        while not self._stop.wait(interval):
+            self._draw()
+
+    def _draw(self) -> None:
+        if self._rich is not None:
+            total = None if self.listing else max(1, self.bytes_total)
+            self._rich.update(self._task, description=self.line(), completed=self.bytes_done, total=total)
+            self._rich.refresh()
+        else:
+            print(f"secretscout: {self.line()}", file=self.stream, flush=True)
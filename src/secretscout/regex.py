@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Literal
+
+try:
+    import re2  # google-re2: linear-time matching, optional
+except ImportError:  # pragma: no cover - optional dependency
+    re2 = None  # type: ignore
+
+RegexEngine = Literal["re", "re2", "auto"]
+
+ENGINES: tuple[str, ...] = ("re", "re2", "auto")
+
+
+def re2_available() -> bool:
+    return re2 is not None
+
+
+def check_engine(engine: str) -> None:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown regex engine: {engine} (expected one of: {', '.join(ENGINES)})")
+    if engine == "re2" and re2 is None:
+        raise RuntimeError("regex_engine = 're2' requires the google-re2 package (pip install secretscout[re2])")
+
+
+def _inline_flags(flags: int) -> str:
+    out = ""
+    if flags & re.IGNORECASE:
+        out += "i"
+    if flags & re.MULTILINE:
+        out += "m"
+    if flags & re.DOTALL:
+        out += "s"
+    return f"(?{out})" if out else ""
+
+
+@lru_cache(maxsize=1024)
+def compile_pattern(pattern: str, flags: int = 0, engine: RegexEngine = "re") -> Any:
+    if engine != "re" and re2 is not None:
+        opts = re2.Options()
+        opts.log_errors = False
+        try:
+            return re2.compile(_inline_flags(flags) + pattern, opts)
+        except re2.error:
+            # Backreferences, lookarounds etc.: keep the backtracking engine for this pattern.
+            pass
+    return re.compile(pattern, flags)
+
+
+def uses_re2(pattern: str, flags: int = 0, engine: RegexEngine = "re") -> bool:
+    return not isinstance(compile_pattern(pattern, flags, engine), re.Pattern)
@@ -2,17 +2,14 @@ from __future__ import annotations
 
 import html
 import json
+import sys
 from collections import Counter
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
-from typing import Literal
+from pathlib import Path
+from typing import Any
 
-from rich.console import Console
-from rich.table import Table
-
-from .models import Finding, Severity
-
-Format = Literal["table", "minimal", "json", "sarif", "html"]
+from .models import Coverage, Finding, Format, Severity
 
 
 def summarize(findings: Iterable[Finding]) -> dict[str, int]:
@@ -25,8 +22,13 @@ def sort_findings(findings: list[Finding]) -> list[Finding]:
     return sorted(findings, key=lambda f: (-order[f.severity], f.file, f.line, f.col))
 
 
-def print_table(findings: list[Finding], max_findings: int) -> None:
+def print_table(findings: list[Finding], max_findings: int, coverage: Coverage | None = None) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
     console = Console()
+    if coverage is not None:
+        console.print(coverage.line(), style=None if coverage.complete else "yellow")
     if not findings:
         console.print("[bold green]✅ No secrets found.[/bold green]")
         return
@@ -51,26 +53,103 @@ def print_table(findings: list[Finding], max_findings: int) -> None:
         console.print(f"[yellow]Showing first {max_findings}/{len(f_sorted)} findings.[/yellow]")
 
 
-def print_minimal(findings: list[Finding], max_findings: int) -> None:
-    console = Console()
+def minimal_line(f: Finding) -> str:
+    return f"{f.severity.value}\t{f.rule_id}\t{f.file}:{f.line}:{f.col}\t{f.match}"
+
+
+def print_minimal(findings: list[Finding], max_findings: int, coverage: Coverage | None = None) -> None:
+    # Plain print: one finding per line, no markup or wrapping, and no rich import in hooks.
     f_sorted = sort_findings(findings)[:max_findings]
     for f in f_sorted:
-        console.print(f"{f.severity.value}\t{f.rule_id}\t{f.file}:{f.line}:{f.col}\t{f.match}")
+        print(minimal_line(f))
     if not f_sorted:
-        console.print("OK")
+        print("OK")
+    if coverage is not None:
+        # On stderr, so stdout stays one finding per line.
+        print(coverage.line(), file=sys.stderr)
 
 
-def to_json(findings: list[Finding]) -> str:
-    payload = {
+def to_json(findings: list[Finding], coverage: Coverage | None = None) -> str:
+    payload: dict[str, Any] = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "count": len(findings),
         "summary": summarize(findings),
-        "findings": [f.to_dict() for f in sort_findings(findings)],
     }
+    if coverage is not None:
+        payload["coverage"] = coverage.to_dict()
+    payload["findings"] = [f.to_dict() for f in sort_findings(findings)]
     return json.dumps(payload, ensure_ascii=False, indent=2)
 
 
-def to_sarif(findings: list[Finding]) -> str:
+def iter_report_records(path: Path, loads: Callable[[str], Any] = json.loads) -> Iterator[Any]:
+    """Read raw finding dicts from a JSON (scan or scan-many) or NDJSON report.
+
+    Only NDJSON is streamed: it is read line by line, so memory does not grow with the report,
+    and `loads` is applied to each line after the first and may defer parsing. A JSON report is
+    parsed whole.
+    """
+    with path.open(encoding="utf-8") as fh:
+        first = ""
+        for first in fh:
+            if first.strip():
+                break
+        if not first.strip():
+            return
+        if first.lstrip().startswith("{") and first.rstrip().endswith("}"):
+            # NDJSON, or a JSON report that fits on one line.
+            data = json.loads(first)
+            if "findings" not in data and "repos" not in data:
+                # Records other than findings (the {"coverage": ...} line of a time-budgeted
+                # scan) have no rule_id. A deferred `loads` is only given lines that can hold one.
+                if "rule_id" in data:
+                    yield data
+                for line in fh:
+                    if not line.strip():
+                        continue
+                    if loads is json.loads:
+                        rec = json.loads(line)
+                        if isinstance(rec, dict) and "rule_id" in rec:
+                            yield rec
+                    elif '"rule_id"' in line:
+                        yield loads(line)
+                return
+        else:
+            data = json.loads(first + fh.read())
+    if "repos" in data:
+        for repo in data["repos"]:
+            yield from repo.get("findings", [])
+        return
+    yield from data.get("findings", [])
+
+
+def iter_report_findings(path: Path) -> Iterator[Finding]:
+    for d in iter_report_records(path):
+        yield Finding.from_dict(d)
+
+
+def to_ndjson(findings: list[Finding], coverage: Coverage | None = None) -> str:
+    lines = [json.dumps(f.to_dict(), ensure_ascii=False) for f in sort_findings(findings)]
+    if coverage is not None:
+        lines.append(json.dumps({"coverage": coverage.to_dict()}))
+    return "\n".join(lines)
+
+
+def to_sarif(findings: list[Finding], coverage: Coverage | None = None) -> str:
+    run = sarif_run(findings)
+    if coverage is not None:
+        run["properties"] = {"coverage": coverage.to_dict()}
+    return json.dumps(_sarif_log([run]), ensure_ascii=False, indent=2)
+
+
+def _sarif_log(runs: list[dict]) -> dict:
+    return {
+        "version": "2.1.0",
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "runs": runs,
+    }
+
+
+def sarif_run(findings: list[Finding], base_uri: str | None = None) -> dict:
     rules_map: dict[str, dict] = {}
     results: list[dict] = []
 
@@ -106,20 +185,24 @@ def to_sarif(findings: list[Finding]) -> str:
             }
         )
 
-    sarif = {
-        "version": "2.1.0",
-        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
-        "runs": [
-            {
-                "tool": {"driver": {"name": "SecretScout", "rules": list(rules_map.values())}},
-                "results": results,
-            }
-        ],
+    run: dict = {
+        "tool": {"driver": {"name": "SecretScout", "rules": list(rules_map.values())}},
+        "results": results,
     }
-    return json.dumps(sarif, ensure_ascii=False, indent=2)
+    if base_uri is not None:
+        # Lets one log hold several repositories: file URIs resolve against their repo root.
+        run["originalUriBaseIds"] = {"SRCROOT": {"uri": base_uri}}
+        for r in results:
+            r["locations"][0]["physicalLocation"]["artifactLocation"]["uriBaseId"] = "SRCROOT"
+    return run
+
+
+def to_sarif_runs(groups: list[tuple[str, list[Finding]]]) -> str:
+    runs = [sarif_run(findings, base_uri=base) for base, findings in groups]
+    return json.dumps(_sarif_log(runs), ensure_ascii=False, indent=2)
 
 
-def to_html(findings: list[Finding]) -> str:
+def to_html(findings: list[Finding], coverage: Coverage | None = None) -> str:
     f_sorted = sort_findings(findings)
     now = datetime.utcnow().isoformat() + "Z"
     rows = []
@@ -136,6 +219,7 @@ def to_html(findings: list[Finding]) -> str:
         )
     body = "\n".join(rows) if rows else "<tr><td colspan='6'>No findings</td></tr>"
     summary = summarize(f_sorted)
+    cov = f"<br/>\n{html.escape(coverage.line())}" if coverage is not None else ""
 
     return f"""<!doctype html>
 <html>
@@ -162,7 +246,7 @@ code {{ font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, mono
 <div class="meta">
 Generated: {html.escape(now)}<br/>
 Count: {len(f_sorted)}<br/>
-Summary: {html.escape(json.dumps(summary))}
+Summary: {html.escape(json.dumps(summary))}{cov}
 </div>
 
 <table>
@@ -185,17 +269,21 @@ Summary: {html.escape(json.dumps(summary))}
 """
 
 
-def emit(findings: list[Finding], fmt: Format, max_findings: int) -> str | None:
+def emit(
+    findings: list[Finding], fmt: Format, max_findings: int, coverage: Coverage | None = None
+) -> str | None:
     if fmt == "table":
-        print_table(findings, max_findings=max_findings)
+        print_table(findings, max_findings=max_findings, coverage=coverage)
         return None
     if fmt == "minimal":
-        print_minimal(findings, max_findings=max_findings)
+        print_minimal(findings, max_findings=max_findings, coverage=coverage)
         return None
     if fmt == "json":
-        return to_json(findings)
+        return to_json(findings, coverage)
+    if fmt == "ndjson":
+        return to_ndjson(findings, coverage)
     if fmt == "sarif":
-        return to_sarif(findings)
+        return to_sarif(findings, coverage)
     if fmt == "html":
-        return to_html(findings)
+        return to_html(findings, coverage)
     raise ValueError(f"Unknown format: {fmt}")
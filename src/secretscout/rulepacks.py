@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+from .models import Rule, Severity
+from .rules import DEFAULT_RULES
+
+try:
+    import tomllib  # py311+
+except Exception:  # pragma: no cover
+    tomllib = None  # type: ignore
+
+ARTIFACT_VERSION = 1
+_ID_RE = re.compile(r"^[a-z0-9][a-z0-9._-]*$")
+
+
+class RulePackError(ValueError):
+    pass
+
+
+def _parse_pack(path: Path, raw: bytes) -> list[dict[str, Any]]:
+    text = raw.decode("utf-8")
+    if path.suffix.lower() == ".json":
+        data = json.loads(text)
+    else:
+        if tomllib is None:
+            raise RuntimeError("tomllib not available; use Python 3.11+ or a JSON rule pack")
+        data = tomllib.loads(text)
+    entries = data.get("rules") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise RulePackError(f"{path}: expected a list of rules under 'rules'")
+    return entries
+
+
+def _strings(where: str, table: dict[str, Any], key: str) -> tuple[str, ...]:
+    # A bare string would otherwise be iterated into single characters.
+    value = table.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise RulePackError(f"{where}: '{key}' must be a list of strings")
+    return tuple(value)
+
+
+def _validate(path: Path, idx: int, entry: Any, seen: set[str]) -> Rule:
+    where = f"{path}: rule #{idx + 1}"
+    if not isinstance(entry, dict):
+        raise RulePackError(f"{where}: expected a table/object")
+    for key in ("id", "pattern", "severity"):
+        if not entry.get(key):
+            raise RulePackError(f"{where}: missing required field '{key}'")
+
+    rule_id = str(entry["id"])
+    where = f"{path}: rule {rule_id!r}"
+    if not _ID_RE.match(rule_id):
+        raise RulePackError(f"{where}: id must be lowercase letters, digits, '.', '_' or '-'")
+    if rule_id in seen:
+        raise RulePackError(f"{where}: duplicate rule id")
+    seen.add(rule_id)
+
+    try:
+        severity = Severity(str(entry["severity"]).lower())
+    except ValueError:
+        raise RulePackError(f"{where}: severity must be one of: low, medium, high, critical") from None
+
+    pattern = str(entry["pattern"])
+    multiline = bool(entry.get("multiline", False))
+    try:
+        compiled = re.compile(pattern, re.MULTILINE if multiline else 0)
+    except re.error as err:
+        raise RulePackError(f"{where}: invalid pattern: {err}") from None
+
+    keywords = _strings(where, entry, "keywords")
+    if any(k != k.lower() or not k for k in keywords):
+        raise RulePackError(f"{where}: keywords must be non-empty lowercase literals")
+
+    tests = entry.get("tests", {})
+    if not isinstance(tests, dict):
+        raise RulePackError(f"{where}: 'tests' must be a table with 'positive'/'negative' lists")
+    for sample in _strings(f"{where}: tests", tests, "positive"):
+        if not compiled.search(sample):
+            raise RulePackError(f"{where}: positive test vector does not match: {sample!r}")
+        if keywords and not any(k in sample.lower() for k in keywords):
+            raise RulePackError(f"{where}: positive test vector contains none of the keywords: {sample!r}")
+    for sample in _strings(f"{where}: tests", tests, "negative"):
+        if compiled.search(sample):
+            raise RulePackError(f"{where}: negative test vector matches: {sample!r}")
+
+    return Rule(
+        id=rule_id,
+        title=str(entry.get("title", rule_id)),
+        description=str(entry.get("description", "")),
+        severity=severity,
+        pattern=pattern,
+        multiline=multiline,
+        tags=_strings(where, entry, "tags"),
+        keywords=keywords,
+    )
+
+
+def _rule_to_dict(r: Rule) -> dict[str, Any]:
+    return {
+        "id": r.id,
+        "title": r.title,
+        "description": r.description,
+        "severity": r.severity.value,
+        "pattern": r.pattern,
+        "multiline": r.multiline,
+        "tags": list(r.tags),
+        "keywords": list(r.keywords),
+    }
+
+
+def _rule_from_dict(d: dict[str, Any]) -> Rule:
+    return Rule(
+        id=str(d["id"]),
+        title=str(d["title"]),
+        description=str(d["description"]),
+        severity=Severity(str(d["severity"])),
+        pattern=str(d["pattern"]),
+        multiline=bool(d["multiline"]),
+        tags=tuple(d["tags"]),
+        keywords=tuple(d["keywords"]),
+    )
+
+
+def compile_rule_packs(paths: list[Path]) -> list[Rule]:
+    seen = {r.id for r in DEFAULT_RULES}
+    out: list[Rule] = []
+    for path in paths:
+        if not path.exists():
+            raise RulePackError(f"Rule pack not found: {path}")
+        for idx, entry in enumerate(_parse_pack(path, path.read_bytes())):
+            out.append(_validate(path, idx, entry, seen))
+    return out
+
+
+def packs_hash(paths: list[Path]) -> str:
+    h = hashlib.sha256()
+    h.update(f"{ARTIFACT_VERSION}:{__version__}".encode())
+    for path in paths:
+        h.update(b"\0")
+        h.update(str(path).encode("utf-8"))
+        h.update(b"\0")
+        h.update(path.read_bytes() if path.exists() else b"")
+    return h.hexdigest()
+
+
+def load_rule_packs(root: Path, packs: list[str], use_cache: bool = True) -> list[Rule]:
+    if not packs:
+        return []
+    paths = [(root / p) for p in packs]
+    key = packs_hash(paths)
+    artifact = root / ".secretscout-cache" / "rulepacks" / f"{key}.json"
+
+    if use_cache and artifact.exists():
+        try:
+            data = json.loads(artifact.read_text(encoding="utf-8"))
+            return [_rule_from_dict(d) for d in data["rules"]]
+        except (ValueError, KeyError, TypeError):
+            pass  # corrupt artifact: rebuild below
+
+    rules = compile_rule_packs(paths)
+    if use_cache:
+        artifact.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": ARTIFACT_VERSION, "rules": [_rule_to_dict(r) for r in rules]}
+        artifact.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    return rules
+
+
+def all_rules(root: Path, packs: list[str], use_cache: bool = True) -> list[Rule]:
+    return [*DEFAULT_RULES, *load_rule_packs(root, packs, use_cache=use_cache)]
@@ -11,6 +11,7 @@ DEFAULT_RULES: list[Rule] = [
         pattern=r"-----BEGIN (?:RSA |EC |OPENSSH |DSA )?PRIVATE KEY-----",
         multiline=True,
         tags=("key", "pem"),
+        keywords=("-----begin ",),
     ),
     Rule(
         id="aws-access-key-id",
@@ -19,6 +20,7 @@ DEFAULT_RULES: list[Rule] = [
         severity=Severity.high,
         pattern=r"\b(AKIA|ASIA|AGPA|AIDA|AROA|AIPA|ANPA|ANVA|ASCA|AKIAR)[0-9A-Z]{16}\b",
         tags=("aws",),
+        keywords=("akia", "asia", "agpa", "aida", "aroa", "aipa", "anpa", "anva", "asca"),
     ),
     Rule(
         id="github-token",
@@ -27,6 +29,7 @@ DEFAULT_RULES: list[Rule] = [
         severity=Severity.high,
         pattern=r"\b(ghp|gho|ghu|ghs|ghr|github_pat)_[A-Za-z0-9_]{20,}\b",
         tags=("github",),
+        keywords=("ghp_", "gho_", "ghu_", "ghs_", "ghr_", "github_pat_"),
     ),
     Rule(
         id="slack-token",
@@ -35,6 +38,7 @@ DEFAULT_RULES: list[Rule] = [
         severity=Severity.high,
         pattern=r"\b(xox[baprs]-[0-9A-Za-z-]{10,48})\b",
         tags=("slack",),
+        keywords=("xox",),
     ),
     Rule(
         id="telegram-bot-token",
@@ -43,6 +47,7 @@ DEFAULT_RULES: list[Rule] = [
         severity=Severity.high,
         pattern=r"\b\d{6,12}:[A-Za-z0-9_-]{30,}\b",
         tags=("telegram",),
+        keywords=(":",),
     ),
     Rule(
         id="google-api-key",
@@ -51,6 +56,7 @@ DEFAULT_RULES: list[Rule] = [
         severity=Severity.high,
         pattern=r"\bAIza[0-9A-Za-z\-_]{30,}\b",
         tags=("google",),
+        keywords=("aiza",),
     ),
     Rule(
         id="sendgrid-key",
@@ -59,6 +65,7 @@ DEFAULT_RULES: list[Rule] = [
         severity=Severity.high,
         pattern=r"\bSG\.[A-Za-z0-9_\-]{20,}\.[A-Za-z0-9_\-]{20,}\b",
         tags=("sendgrid",),
+        keywords=("sg.",),
     ),
     Rule(
         id="stripe-secret",
@@ -67,22 +74,25 @@ DEFAULT_RULES: list[Rule] = [
         severity=Severity.high,
         pattern=r"\bsk_live_[0-9a-zA-Z]{20,}\b",
         tags=("stripe",),
+        keywords=("sk_live_",),
     ),
     Rule(
         id="discord-token",
         title="Discord token",
         description="Discord token (three base64url segments)",
         severity=Severity.high,
-        pattern=r"\b[MN][A-Za-z0-9_-]{23,}\.[A-Za-z0-9_-]{6,}\.[A-Za-z0-9_-]{27,}\b",
+        pattern=r"\b[MN][A-Za-z0-9_-]{23,27}\.[A-Za-z0-9_-]{6,7}\.[A-Za-z0-9_-]{27,64}\b",
         tags=("discord",),
+        keywords=(".",),
     ),
     Rule(
         id="jwt",
         title="JWT",
         description="JWT (three base64url segments)",
         severity=Severity.medium,
-        pattern=r"\beyJ[A-Za-z0-9_\-]+\.[A-Za-z0-9_\-]+\.[A-Za-z0-9_\-]+\b",
+        pattern=r"\beyJ[A-Za-z0-9_\-]{1,1024}\.[A-Za-z0-9_\-]{1,8192}\.[A-Za-z0-9_\-]{1,2048}\b",
         tags=("jwt",),
+        keywords=("eyj",),
     ),
     Rule(
         id="generic-credential",
@@ -91,5 +101,6 @@ DEFAULT_RULES: list[Rule] = [
         severity=Severity.medium,
         pattern=r"(?i)\b(api[_-]?key|secret|token|password|passwd|access[_-]?token|client[_-]?secret)\b\s*[:=]\s*['\"]?([A-Za-z0-9_\-\/\+=]{8,})",
         tags=("generic",),
+        keywords=("key", "secret", "token", "passw"),
     ),
 ]
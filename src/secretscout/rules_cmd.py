@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 from rich.console import Console
 from rich.table import Table
 
-from .rules import DEFAULT_RULES
+from .config import load_config
+from .models import Rule
+from .rulepacks import all_rules
+
+
+def _rules(root: Path) -> list[Rule]:
+    cfg = load_config(root)
+    return all_rules(root, cfg.rules.packs)
 
 
-def list_rules() -> None:
+def list_rules(root: Path = Path(".")) -> None:
     con = Console()
     table = Table(title="SecretScout rules")
     table.add_column("ID", style="bold")
@@ -14,14 +23,14 @@ def list_rules() -> None:
     table.add_column("Title")
     table.add_column("Tags")
 
-    for r in DEFAULT_RULES:
+    for r in _rules(root):
         table.add_row(r.id, r.severity.value, r.title, ", ".join(r.tags))
     con.print(table)
 
 
-def show_rule(rule_id: str) -> None:
+def show_rule(rule_id: str, root: Path = Path(".")) -> None:
     con = Console()
-    rule = next((r for r in DEFAULT_RULES if r.id == rule_id), None)
+    rule = next((r for r in _rules(root) if r.id == rule_id), None)
     if not rule:
         con.print(f"[red]Rule not found:[/red] {rule_id}")
         return
@@ -29,3 +38,5 @@ def show_rule(rule_id: str) -> None:
     con.print(rule.title)
     con.print(rule.description)
     con.print(f"pattern: {rule.pattern}")
+    if rule.keywords:
+        con.print(f"keywords: {', '.join(rule.keywords)}")
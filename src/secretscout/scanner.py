@@ -1,56 +1,209 @@
 from __future__ import annotations
 
-import json
+import fnmatch
+import hashlib
 import re
-from collections.abc import Iterable
+import time
+from collections.abc import Callable, Collection, Container, Iterable, Iterator, Sequence
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass, replace
 from pathlib import Path
-
-from .cache import Cache
-from .config import is_excluded, load_config, load_ignore_file
-from .git import is_git_repo, read_staged_file, staged_files, tracked_files
-from .models import Finding, Rule, Severity
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from . import __version__
+from .baseline import BinaryBaseline, load_baseline
+from .cache import Cache, ContentStore, shared_cache_dir
+from .config import Config, config_hash, is_excluded, load_config, load_ignore_file
+from .formats import HANDLERS, handler_for, handler_kind
+from .git import (
+    index_blob_ids,
+    is_git_repo,
+    read_staged_file,
+    recently_changed,
+    staged_files,
+    tracked_files,
+)
+from .metrics import ScanMetrics
+from .models import Coverage, Finding, Rule, Severity
+from .regex import RegexEngine, check_engine, compile_pattern
+from .risk import RECENT_SECONDS, prioritise
+from .rulepacks import load_rule_packs
 from .rules import DEFAULT_RULES
-from .util import fingerprint, iter_entropy_candidates, looks_like_high_entropy_token, redact
-
-
-def load_baseline(path: Path | None) -> set[str]:
-    if not path or not path.exists():
-        return set()
-    data = json.loads(path.read_text(encoding="utf-8"))
-    fps = data.get("fingerprints", data) if isinstance(data, dict) else data
-    return {str(x) for x in fps} if isinstance(fps, list) else set()
-
-
-def build_rules(disable: list[str], allowlist: list[str]) -> tuple[list[Rule], list[re.Pattern[str]]]:
-    rules = [r for r in DEFAULT_RULES if r.id not in set(disable)]
+from .schedule import PoolStats, auto_workers, plan_chunks
+from .shard import Shard, select_shard
+from .util import (
+    ENTROPY_KEYWORDS,
+    blob_id,
+    fingerprint,
+    iter_entropy_candidates,
+    looks_like_high_entropy_token,
+    match_hash,
+    redact,
+)
+
+if TYPE_CHECKING:
+    from .profiling import FileProfile, Profiler
+    from .progress import ScanProgress
+    from .watchdog import TimedScanPool
+
+T = TypeVar("T")
+
+
+def build_rules(
+    disable: list[str], allowlist: list[str], extra: list[Rule] | None = None
+) -> tuple[list[Rule], list[re.Pattern[str]]]:
+    rules = [r for r in [*DEFAULT_RULES, *(extra or [])] if r.id not in set(disable)]
     allow = [re.compile(p) for p in allowlist]
     return rules, allow
 
 
-def iter_files(root: Path, mode: str, extra_exclude: list[str] | None = None) -> Iterable[tuple[str, bytes | None]]:
-    cfg = load_config(root)
-    ignore_pats = load_ignore_file(root)
-    patterns = cfg.scan.exclude + ignore_pats + (extra_exclude or [])
+def exclude_patterns(root: Path, cfg: Config, extra_exclude: list[str] | None = None) -> list[str]:
+    return cfg.scan.exclude + load_ignore_file(root) + (extra_exclude or [])
 
-    if mode == "staged" and is_git_repo(root):
-        for rel in staged_files(root):
-            if not is_excluded(rel, patterns):
-                yield rel, read_staged_file(root, rel)
-        return
 
-    if mode == "tracked" and is_git_repo(root):
-        for rel in tracked_files(root):
-            if not is_excluded(rel, patterns):
+def iter_files(
+    root: Path,
+    mode: str,
+    extra_exclude: list[str] | None = None,
+    on_excluded: Callable[[str], object] | None = None,
+    paths: Iterable[str] | None = None,
+    pathspecs: list[str] | None = None,
+) -> Iterable[tuple[str, bytes | None]]:
+    cfg = load_config(root)
+    patterns = exclude_patterns(root, cfg, extra_exclude)
+
+    if paths is not None:
+        # An explicit list (changed files): the tree is not listed. Paths that no longer
+        # exist (deleted since) are left out.
+        for rel in paths:
+            if is_excluded(rel, patterns):
+                if on_excluded is not None:
+                    on_excluded(rel)
+            elif mode == "staged":
+                content = read_staged_file(root, rel)
+                if content is not None:
+                    yield rel, content
+            elif (root / rel).is_file():
                 yield rel, None
         return
 
-    for p in root.rglob("*"):
+    if mode in ("staged", "tracked") and is_git_repo(root):
+        staged = mode == "staged"
+        listed = staged_files(root, pathspecs) if staged else tracked_files(root, pathspecs)
+        for rel in listed:
+            if is_excluded(rel, patterns):
+                if on_excluded is not None:
+                    on_excluded(rel)
+            else:
+                yield rel, read_staged_file(root, rel) if staged else None
+        return
+
+    if not pathspecs:
+        yield from walk_files(root, patterns, on_excluded)
+        return
+    # Without git the pathspecs are matched here (plain paths and globs, no magic), and only
+    # the directories they name are walked.
+    for base in _pathspec_bases(pathspecs):
+        start = root / base if base else root
+        if start.is_file():
+            if not match_pathspec(base, pathspecs):
+                continue
+            if not is_excluded(base, patterns):
+                yield base, None
+            elif on_excluded is not None:
+                on_excluded(base)
+        elif start.is_dir():
+            yield from walk_files(root, patterns, on_excluded, start, lambda rel: match_pathspec(rel, pathspecs))
+
+
+def match_pathspec(rel_path: str, pathspecs: list[str]) -> bool:
+    """git's default pathspec matching: a path, a directory prefix, or a glob whose * crosses /."""
+    for spec in pathspecs:
+        spec = spec.removeprefix("./").rstrip("/")
+        if not spec or rel_path == spec or rel_path.startswith(spec + "/"):
+            return True
+        if fnmatch.fnmatchcase(rel_path, spec):
+            return True
+    return False
+
+
+def _pathspec_bases(pathspecs: list[str]) -> list[str]:
+    # The literal directories in front of the first glob character; nested ones are dropped.
+    bases: list[str] = []
+    for spec in pathspecs:
+        parts: list[str] = []
+        for part in spec.removeprefix("./").rstrip("/").split("/"):
+            if any(c in part for c in "*?["):
+                break
+            parts.append(part)
+        bases.append("/".join(p for p in parts if p))
+    kept: list[str] = []
+    for base in sorted(set(bases), key=len):
+        if not any(not k or base == k or base.startswith(k + "/") for k in kept):
+            kept.append(base)
+    return kept
+
+
+def walk_files(
+    root: Path,
+    patterns: list[str],
+    on_excluded: Callable[[str], object] | None = None,
+    start: Path | None = None,
+    keep: Callable[[str], bool] | None = None,
+) -> Iterator[tuple[str, None]]:
+    for p in (start or root).rglob("*"):
         if p.is_dir():
             continue
         rel = str(p.relative_to(root)).replace("\\", "/")
+        if keep is not None and not keep(rel):
+            continue
         if not is_excluded(rel, patterns):
             yield rel, None
+        elif on_excluded is not None:
+            on_excluded(rel)
+
+
+def _same_size(path: Path, size: int) -> bool:
+    # Checkout filters (eol conversion) can make copies of one blob differ on disk.
+    try:
+        return path.stat().st_size == size
+    except OSError:
+        return False
+
+
+def max_file_size_for(rel_path: str, cfg: Config) -> int:
+    # Notebooks and other structured files are mostly payload that is masked before matching.
+    return cfg.scan.max_structured_file_size if handler_for(rel_path) is not None else cfg.scan.max_file_size
+
+
+def read_file(path: Path, max_size: int) -> bytes | None:
+    try:
+        if path.stat().st_size > max_size:
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def skip_content(content: bytes, cfg: Config) -> bool:
+    return skip_reason(content, cfg) is not None
+
+
+def skip_reason(content: bytes, cfg: Config) -> str | None:
+    if b"\x00" in content[:4096]:
+        return "binary"
+    head = content[:8192].decode("utf-8", errors="ignore")
+    if _ignore_file_by_marker(head, cfg.scan.first_lines_ignore_file_marker):
+        return "ignore_marker"
+    return None
+
+
+def _unread_reason(path: Path, max_size: int) -> str:
+    try:
+        return "size" if path.stat().st_size > max_size else "unreadable"
+    except OSError:
+        return "unreadable"
 
 
 def _ignore_file_by_marker(text: str, first_lines: int) -> bool:
@@ -58,37 +211,179 @@ def _ignore_file_by_marker(text: str, first_lines: int) -> bool:
     return "secretscout:ignore-file" in head
 
 
+@dataclass(frozen=True)
+class LongLineOptions:
+    threshold: int = 8192
+    window: int = 4096
+    overlap: int = 512
+    policy: str = "window"  # window | sample | skip
+    sample: int = 8
+    # A window ending inside a token-like run is extended to the end of the run, up to this
+    # many characters, so a long token (the JWT rule allows ~11 KB) is not cut at the boundary.
+    max_token: int = 12288
+
+
+# Lines that look machine-generated; only consulted for lines above the long-line threshold.
+_GENERATED_MARKERS = ("sourcemappingurl=", ";base64,", "__webpack_require__", "webpackbootstrap")
+
+
+def _looks_generated(line: str, low: str) -> bool:
+    if any(m in low for m in _GENERATED_MARKERS):
+        return True
+    return line.count(" ") < len(line) // 100
+
+
+_TOKEN_CHARS = re.compile(r"[A-Za-z0-9_\-.+/=]*")
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _lower_same_length(line: str) -> str:
+    # Window positions index both the line and its lowercase form; a few non-ASCII characters
+    # change length when lowered, so those lines are lowered for ASCII only.
+    low = line.lower()
+    return low if len(low) == len(line) else line.translate(_ASCII_LOWER)
+
+
+def _token_end(line: str, endpos: int, limit: int) -> int:
+    if endpos >= len(line) or _TOKEN_CHARS.match(line, endpos - 1, endpos).end() != endpos:
+        return endpos
+    return _TOKEN_CHARS.match(line, endpos, min(len(line), endpos + limit)).end()
+
+
+def _line_windows(line: str, low: str, ll: LongLineOptions) -> list[tuple[int, int, int]]:
+    """Return (pos, core_end, endpos) windows; a match belongs to the window its start falls in."""
+    n = len(line)
+    if n <= ll.threshold:
+        return [(0, n, n)]
+    starts = list(range(0, n, ll.window))
+    if ll.policy != "window" and _looks_generated(line, low):
+        if ll.policy == "skip":
+            return []
+        step = max(1, len(starts) // max(1, ll.sample))
+        starts = starts[::step]
+    return [
+        (pos, pos + ll.window, _token_end(line, min(n, pos + ll.window + ll.overlap), ll.max_token))
+        for pos in starts
+    ]
+
+
+def _window_finditer(
+    pattern: str,
+    line: str,
+    rule_id: str,
+    prof: FileProfile | None,
+    engine: RegexEngine,
+    pos: int,
+    core_end: int,
+    endpos: int,
+) -> Iterator[re.Match[str]]:
+    """Matches starting in a window's core; one cut short by the window end is matched again."""
+    for m in _finditer(pattern, line, rule_id, prof, 0, engine, pos, endpos):
+        if m.start() >= core_end:
+            return  # found again by the next window
+        if m.end() == endpos < len(line):
+            m = compile_pattern(pattern, 0, engine).match(line, m.start()) or m
+        yield m
+
+
+def _has_keyword(low: str, keywords: tuple[str, ...], pos: int, endpos: int) -> bool:
+    if not keywords:
+        return True
+    return any(low.find(k, pos, endpos) != -1 for k in keywords)
+
+
+def _finditer(
+    pattern: str,
+    text: str,
+    rule_id: str,
+    prof: FileProfile | None,
+    flags: int = 0,
+    engine: RegexEngine = "re",
+    pos: int = 0,
+    endpos: int | None = None,
+) -> Iterator[re.Match[str]]:
+    compiled = compile_pattern(pattern, flags, engine)
+    end = len(text) if endpos is None else endpos
+    if prof is None:
+        return compiled.finditer(text, pos, end)
+    w0 = time.perf_counter()
+    c0 = time.thread_time()
+    matches = list(compiled.finditer(text, pos, end))
+    prof.rule(rule_id, time.perf_counter() - w0, time.thread_time() - c0)
+    return iter(matches)
+
+
+def _timed_stage(prof: FileProfile | None, stage: str, fn: Callable[..., T], *args: Any) -> T:
+    if prof is None:
+        return fn(*args)
+    w0 = time.perf_counter()
+    c0 = time.thread_time()
+    try:
+        return fn(*args)
+    finally:
+        prof.stage(stage, time.perf_counter() - w0, time.thread_time() - c0)
+
+
+def _entropy_candidates(line: str, prof: FileProfile | None) -> list[str]:
+    return _timed_stage(prof, "entropy", lambda: list(iter_entropy_candidates(line)))
+
+
+def _path_allowlisted(rel_path: str, path_allowlist: list[re.Pattern[str]]) -> bool:
+    return any(pat.search(rel_path) for pat in path_allowlist)
+
+
 def scan_bytes(
     rel_path: str,
     content: bytes,
     rules: list[Rule],
     allowlist: list[re.Pattern[str]],
     path_allowlist: list[re.Pattern[str]],
-    baseline: set[str],
+    baseline: Container[str],
     redact_head: int,
     redact_tail: int,
+    profile: FileProfile | None = None,
+    regex_engine: RegexEngine = "re",
+    long_lines: LongLineOptions | None = None,
+    line_offset: int = 0,
+    copies: Sequence[str] = (),
 ) -> list[Finding]:
-    for pat in path_allowlist:
-        if pat.search(rel_path):
-            return []
-
-    text = content.decode("utf-8", errors="replace")
+    """Scan the content of `rel_path`.
+
+    `copies` are other paths with identical content: it is matched once and the findings are
+    repeated for each copy, with that path's fingerprint, path allowlist and baseline.
+    """
+    paths = [p for p in (rel_path, *copies) if not _path_allowlisted(p, path_allowlist)]
+    if not paths:
+        return []
+
+    prof = profile
+    text = _timed_stage(prof, "decode", content.decode, "utf-8", "replace")
+    handler = handler_for(rel_path)
+    if handler is not None:
+        text = _timed_stage(prof, "decode", handler, text)
+    # Drop rules whose keywords do not occur anywhere in the file.
+    text_low = text.lower()
+    rules = [r for r in rules if not r.keywords or any(k in text_low for k in r.keywords)]
+    entropy = any(k in text_low for k in ENTROPY_KEYWORDS)
     findings: list[Finding] = []
+    raw: list[str] = []  # unredacted match of each finding, to fingerprint the copies
+    # The rule being matched, read from this frame by the per-file timeout (see watchdog).
+    active_rule: list[str | None] = [None]
 
     # Multiline rules
     for rule in rules:
         if not rule.multiline:
             continue
-        for m in re.finditer(rule.pattern, text, flags=re.MULTILINE):
+        active_rule[0] = rule.id
+        for m in _finditer(rule.pattern, text, rule.id, prof, re.MULTILINE, regex_engine):
             upto = text[: m.start()]
-            line = upto.count("\n") + 1
+            line = line_offset + upto.count("\n") + 1
             col0 = m.start() - (upto.rfind("\n") + 1)
             match = m.group(0)
             if any(a.search(match) for a in allowlist):
                 continue
             fp = fingerprint(rule.id, rel_path, line, match)
-            if fp in baseline:
-                continue
+            raw.append(match)
             sn = redact(match, head=redact_head, tail=redact_tail)
             findings.append(
                 Finding(
@@ -107,53 +402,37 @@ def scan_bytes(
     # Line-by-line
     line_rules = [r for r in rules if not r.multiline and r.id != "generic-credential"]
     generic_rules = [r for r in rules if not r.multiline and r.id == "generic-credential"]
+    ll = long_lines or LongLineOptions()
 
     lines = text.splitlines()
-    for i, line in enumerate(lines, start=1):
+    for i, line in enumerate(lines, start=line_offset + 1):
         if "secretscout:ignore" in line:
             continue
+        if prof is not None:
+            line_t0 = time.perf_counter()
+
+        long_line = len(line) > ll.threshold
+        low = _lower_same_length(line) if long_line else line
+        windows = _line_windows(line, low, ll)
 
         strong = False  # есть ли на строке high/critical (даже если baseline это потом скроет)
 
         # 1) специфичные правила
         for rule in line_rules:
-            for m in re.finditer(rule.pattern, line):
-                match_full = m.group(0)
-                if any(a.search(match_full) for a in allowlist):
+            active_rule[0] = rule.id
+            for pos, core_end, endpos in windows:
+                if long_line and not _has_keyword(low, rule.keywords, pos, endpos):
                     continue
-
-                if rule.severity.ge(Severity.high):
-                    strong = True
-
-                fp = fingerprint(rule.id, rel_path, i, match_full)
-                if fp in baseline:
-                    continue
-
-                findings.append(
-                    Finding(
-                        rule_id=rule.id,
-                        rule_title=rule.title,
-                        severity=rule.severity,
-                        file=rel_path,
-                        line=i,
-                        col=m.start() + 1,
-                        match=redact(match_full, head=redact_head, tail=redact_tail),
-                        snippet=_line_snippet(line, m.start(), m.end(), redact_head, redact_tail),
-                        fingerprint=fp,
-                    )
-                )
-
-        # 2) generic-credential — только если нет strong
-        if not strong:
-            for rule in generic_rules:
-                for m in re.finditer(rule.pattern, line):
+                for m in _window_finditer(rule.pattern, line, rule.id, prof, regex_engine, pos, core_end, endpos):
                     match_full = m.group(0)
                     if any(a.search(match_full) for a in allowlist):
                         continue
 
+                    if rule.severity.ge(Severity.high):
+                        strong = True
+
                     fp = fingerprint(rule.id, rel_path, i, match_full)
-                    if fp in baseline:
-                        continue
+                    raw.append(match_full)
 
                     findings.append(
                         Finding(
@@ -169,16 +448,49 @@ def scan_bytes(
                         )
                     )
 
-        # 3) entropy — тоже только если нет strong
+        # 2) generic-credential — только если нет strong
         if not strong:
-            for cand in iter_entropy_candidates(line):
+            for rule in generic_rules:
+                active_rule[0] = rule.id
+                for pos, core_end, endpos in windows:
+                    if long_line and not _has_keyword(low, rule.keywords, pos, endpos):
+                        continue
+                    for m in _window_finditer(
+                        rule.pattern, line, rule.id, prof, regex_engine, pos, core_end, endpos
+                    ):
+                        match_full = m.group(0)
+                        if any(a.search(match_full) for a in allowlist):
+                            continue
+
+                        fp = fingerprint(rule.id, rel_path, i, match_full)
+                        raw.append(match_full)
+
+                        findings.append(
+                            Finding(
+                                rule_id=rule.id,
+                                rule_title=rule.title,
+                                severity=rule.severity,
+                                file=rel_path,
+                                line=i,
+                                col=m.start() + 1,
+                                match=redact(match_full, head=redact_head, tail=redact_tail),
+                                snippet=_line_snippet(line, m.start(), m.end(), redact_head, redact_tail),
+                                fingerprint=fp,
+                            )
+                        )
+
+        # 3) entropy
+        active_rule[0] = "high-entropy"
+        # Once over the whole line, windowed or not: the candidate search is linear and takes
+        # the first candidate, so a long line gets the same finding as a short one.
+        if entropy and windows and (not long_line or _has_keyword(low, ENTROPY_KEYWORDS, 0, len(low))):
+            for cand in _entropy_candidates(line, prof):
+                start = line.find(cand)
                 if any(a.search(cand) for a in allowlist):
                     continue
                 if looks_like_high_entropy_token(cand):
                     fp = fingerprint("high-entropy", rel_path, i, cand)
-                    if fp in baseline:
-                        continue
-                    start = line.find(cand)
+                    raw.append(cand)
                     findings.append(
                         Finding(
                             rule_id="high-entropy",
@@ -193,29 +505,20 @@ def scan_bytes(
                         )
                     )
 
-        for cand in iter_entropy_candidates(line):
-            if any(a.search(cand) for a in allowlist):
-                continue
-            if looks_like_high_entropy_token(cand):
-                fp = fingerprint("high-entropy", rel_path, i, cand)
-                if fp in baseline:
-                    continue
-                start = line.find(cand)
-                findings.append(
-                    Finding(
-                        rule_id="high-entropy",
-                        rule_title="High entropy token-like string",
-                        severity=Severity.medium,
-                        file=rel_path,
-                        line=i,
-                        col=max(1, start + 1),
-                        match=redact(cand, head=redact_head, tail=redact_tail),
-                        snippet=_line_snippet(line, start, start + len(cand), redact_head, redact_tail),
-                        fingerprint=fp,
-                    )
-                )
+        if prof is not None:
+            prof.line(i, time.perf_counter() - line_t0)
 
-    return findings
+    findings = [replace(f, match_hash=match_hash(m)) for f, m in zip(findings, raw, strict=True)]
+    out: list[Finding] = []
+    for path in paths:
+        if path == rel_path:
+            out.extend(f for f in findings if f.fingerprint not in baseline)
+            continue
+        for f, match in zip(findings, raw, strict=True):
+            fp = fingerprint(f.rule_id, path, f.line, match)
+            if fp not in baseline:
+                out.append(replace(f, file=path, fingerprint=fp))
+    return out
 
 
 def _line_snippet(line: str, start: int, end: int, rh: int, rt: int, max_len: int = 160) -> str:
@@ -226,85 +529,368 @@ def _line_snippet(line: str, start: int, end: int, rh: int, rt: int, max_len: in
     return (snippet[: max_len - 1] + "…") if len(snippet) > max_len else snippet
 
 
+@dataclass
+class ScanSetup:
+    """Everything a scan needs besides the file list; shared by the sync and async front ends."""
+
+    cfg: Config
+    baseline: Container[str]
+    cache: Cache
+    use_cache: bool
+    budget: float
+    # Keyword arguments for scan_bytes; picklable, so they can go to process pools too.
+    scan_kwargs: dict[str, Any]
+    store: ContentStore | None = None
+
+    def close(self) -> None:
+        if isinstance(self.baseline, BinaryBaseline):
+            self.baseline.close()
+
+
+def content_key(blob: str, rel_path: str) -> str:
+    """Key under which copies are deduplicated and clean contents stored.
+
+    Structured formats are masked before matching, so the same bytes can have findings under
+    one name and none under another: their key also covers the handler.
+    """
+    kind = handler_kind(rel_path)
+    if kind is None:
+        return blob
+    return hashlib.sha1(f"{kind}\0{blob}".encode()).hexdigest()
+
+
+def ruleset_hash(scan_kwargs: dict[str, Any]) -> str:
+    """Hash of everything besides the content that decides whether a file has findings."""
+    h = hashlib.sha256(__version__.encode("utf-8"))
+    for r in scan_kwargs["rules"]:
+        h.update(repr((r.id, r.pattern, r.severity.value, r.multiline, r.keywords)).encode("utf-8"))
+    for a in scan_kwargs["allowlist"]:
+        h.update(b"\0" + a.pattern.encode("utf-8"))
+    h.update(repr((scan_kwargs["regex_engine"], scan_kwargs["long_lines"])).encode("utf-8"))
+    h.update(repr(sorted(HANDLERS)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def prepare_scan(
+    root: Path,
+    baseline_path: Path | None = None,
+    use_cache: bool = True,
+    regex_engine: str | None = None,
+    file_timeout: float | None = None,
+) -> ScanSetup:
+    cfg = load_config(root)
+    engine = regex_engine or cfg.scan.regex_engine
+    check_engine(engine)
+    packs = load_rule_packs(root, cfg.rules.packs, use_cache=use_cache)
+    rules, allow = build_rules(cfg.rules.disable, cfg.rules.allowlist, packs)
+    scan_kwargs = {
+        "rules": rules,
+        "allowlist": allow,
+        "path_allowlist": [re.compile(p) for p in cfg.rules.path_allowlist],
+        # Baseline filtering happens in the front ends so cache entries and worker processes
+        # do not depend on it.
+        "baseline": set(),
+        "redact_head": cfg.report.redact_head,
+        "redact_tail": cfg.report.redact_tail,
+        "regex_engine": engine,
+        "long_lines": LongLineOptions(
+            threshold=cfg.scan.long_line_threshold,
+            window=cfg.scan.long_line_window,
+            overlap=cfg.scan.long_line_overlap,
+            policy=cfg.scan.long_line_policy,
+            sample=cfg.scan.long_line_sample,
+        ),
+    }
+    return ScanSetup(
+        cfg=cfg,
+        baseline=load_baseline(baseline_path),
+        cache=Cache(
+            root,
+            salt=config_hash(root),
+            max_entries=cfg.cache.max_entries,
+            max_size=cfg.cache.max_size,
+        ),
+        use_cache=use_cache,
+        budget=cfg.scan.file_timeout if file_timeout is None else file_timeout,
+        scan_kwargs=scan_kwargs,
+        store=ContentStore(shared_cache_dir(root, cfg.cache.dir), ruleset_hash(scan_kwargs), cfg.cache.max_entries)
+        if use_cache and cfg.cache.mode == "content"
+        else None,
+    )
+
+
 def scan_path(
     root: Path,
     mode: str = "tracked",
     baseline_path: Path | None = None,
     extra_exclude: list[str] | None = None,
     use_cache: bool = True,
+    profiler: Profiler | None = None,
+    regex_engine: str | None = None,
+    file_timeout: float | None = None,
+    shard: Shard | None = None,
+    metrics: ScanMetrics | None = None,
+    progress: ScanProgress | None = None,
+    only: Collection[str] | None = None,
+    time_budget: float | None = None,
+    pathspecs: list[str] | None = None,
+    clock: Callable[[], float] = time.perf_counter,
 ) -> list[Finding]:
-    cfg = load_config(root)
-    baseline = load_baseline(baseline_path)
-    rules, allow = build_rules(cfg.rules.disable, cfg.rules.allowlist)
-    path_allow = [re.compile(p) for p in cfg.rules.path_allowlist]
-
-    cache = Cache(root)
-    if use_cache:
-        cache.load()
-
-    tasks: list[tuple[str, bytes]] = []
-    for rel, staged_content in iter_files(root, mode=mode, extra_exclude=extra_exclude):
-        if staged_content is not None:
-            content = staged_content
-        else:
-            p = root / rel
-            try:
-                if p.stat().st_size > cfg.scan.max_file_size:
-                    continue
-                content = p.read_bytes()
-            except OSError:
-                continue
-
-        if b"\x00" in content[:4096]:
-            continue
-
-        head = content[:8192].decode("utf-8", errors="ignore")
-        if _ignore_file_by_marker(head, cfg.scan.first_lines_ignore_file_marker):
-            continue
-
-        tasks.append((rel, content))
-
-    def work(rel: str, content: bytes) -> list[Finding]:
+    scan_t0 = time.perf_counter()
+    # With a time budget, files are read and scanned riskiest first and whatever is left at
+    # the deadline (by `clock`) is not scanned; metrics.coverage says how far the scan got.
+    deadline = clock() + time_budget if time_budget else None
+    m = metrics if metrics is not None else ScanMetrics()
+    m.mode = mode
+    setup = prepare_scan(root, baseline_path, use_cache, regex_engine, file_timeout)
+    try:
+        cfg = setup.cfg
+        baseline = setup.baseline
+        cache = setup.cache
+        budget = setup.budget
+        scan_kwargs = setup.scan_kwargs
+        store = setup.store
         if use_cache:
-            cached = cache.get(rel, content)
-            if cached is not None:
-                out: list[Finding] = []
-                for d in cached:
-                    f = Finding(
-                        rule_id=str(d["rule_id"]),
-                        rule_title=str(d.get("rule_title", d["rule_id"])),
-                        severity=Severity(str(d["severity"])),
-                        file=str(d["file"]),
-                        line=int(d["line"]),
-                        col=int(d["col"]),
-                        match=str(d["match"]),
-                        snippet=str(d["snippet"]),
-                        fingerprint=str(d["fingerprint"]),
-                    )
-                    if f.fingerprint not in baseline:
-                        out.append(f)
-                return out
-
-        out = scan_bytes(
-            rel,
-            content,
-            rules,
-            allow,
-            path_allowlist=path_allow,
-            baseline=baseline,
-            redact_head=cfg.report.redact_head,
-            redact_tail=cfg.report.redact_tail,
+            with profiler.stage("cache") if profiler is not None else nullcontext():
+                cache.load()
+                if store is not None:
+                    store.load()
+        m.stages["cache_load"] = time.perf_counter() - scan_t0
+
+        walk_t0 = time.perf_counter()
+        read_wall = 0.0
+        # Identical files (vendored or copied code) are read and matched once: tasks hold one
+        # entry per distinct content, keyed by git blob id, with every path that has it.
+        # Keys are content_key()s: the blob id, with the handler for structured formats.
+        tasks: dict[str, tuple[list[str], bytes]] = {}
+        skipped: dict[str, str] = {}  # content key -> skip reason
+        # In tracked mode the index already knows the blob of every unmodified file, so
+        # copies of a file that was read, and blobs the content store knows to be clean, are
+        # recognised without reading them.
+        known = (
+            index_blob_ids(root, pathspecs) if mode == "tracked" and only is None and is_git_repo(root) else {}
         )
-        if use_cache:
-            cache.put(rel, content, [f.to_dict() for f in out])
-        return out
 
-    findings: list[Finding] = []
-    with ThreadPoolExecutor(max_workers=cfg.scan.threads) as ex:
-        futures = [ex.submit(work, rel, content) for rel, content in tasks]
-        for fut in as_completed(futures):
-            findings.extend(fut.result())
-
-    if use_cache:
-        cache.save()
-    return findings
+        def excluded(_: str) -> None:
+            m.skipped["excluded"] += 1
+
+        # With `only`, just those paths are scanned and the tree is not listed at all.
+        entries: Iterable[tuple[str, bytes | None]] = iter_files(
+            root,
+            mode=mode,
+            extra_exclude=extra_exclude,
+            on_excluded=excluded,
+            paths=sorted(only) if only is not None else None,
+            pathspecs=pathspecs,
+        )
+        if shard is not None:
+            # Partition before reading, so a shard only reads its own files.
+            entries = select_shard(root, list(entries), shard)
+        file_sizes: dict[str, int] = {}
+        ineligible: list[str] = []  # skipped as binary, too big, ...: not part of the coverage
+        uncovered: list[str] = []  # left unscanned by the time budget
+        if deadline is not None:
+            recent = recently_changed(root, int(RECENT_SECONDS // 86400)) if is_git_repo(root) else set()
+            entries, file_sizes = prioritise(
+                root,
+                list(entries),
+                recent,
+                known,
+                cache.has_findings if use_cache else lambda _: False,
+            )
+        for rel, staged_content in entries:
+            m.files_listed += 1
+            if deadline is not None and clock() > deadline:
+                uncovered.append(rel)
+                continue
+            blob = known.get(rel)
+            key = content_key(blob, rel) if blob is not None else None
+            if key in skipped:
+                m.skipped[skipped[key]] += 1
+                ineligible.append(rel)
+                continue
+            if key is not None and store is not None and store.is_clean(key):
+                m.files_scanned += 1
+                m.content_store_hits += 1
+                if progress is not None:
+                    progress.discovered(1, 0)
+                    progress.done(1, 0)
+                continue
+            if key in tasks and _same_size(root / rel, len(tasks[key][1])):
+                tasks[key][0].append(rel)
+                m.files_scanned += 1
+                m.files_deduplicated += 1
+                if progress is not None:
+                    progress.discovered(1, 0)
+                continue
+            if staged_content is not None:
+                content: bytes | None = staged_content
+            else:
+                read_t0 = time.perf_counter()
+                content = read_file(root / rel, max_file_size_for(rel, cfg))
+                read_wall += time.perf_counter() - read_t0
+            reason = _unread_reason(root / rel, max_file_size_for(rel, cfg)) if content is None else skip_reason(content, cfg)
+            if content is None or reason is not None:
+                m.skipped[reason] += 1
+                ineligible.append(rel)
+                if key is not None:
+                    skipped[key] = str(reason)
+                continue
+            m.files_scanned += 1
+            key = content_key(blob_id(content), rel)
+            if store is not None and store.is_clean(key):
+                m.content_store_hits += 1
+                if progress is not None:
+                    progress.discovered(1, len(content))
+                    progress.done(1, len(content))
+                continue
+            if key in tasks:
+                tasks[key][0].append(rel)
+                m.files_deduplicated += 1
+            else:
+                tasks[key] = ([rel], content)
+                m.bytes_scanned += len(content)
+                m.file_sizes.append(len(content))
+            if progress is not None:
+                progress.discovered(1, len(content) if len(tasks[key][0]) == 1 else 0)
+        if progress is not None:
+            progress.listed()
+        list_wall = time.perf_counter() - walk_t0
+        m.stages["walk"] = list_wall - read_wall
+        m.stages["read"] = read_wall
+        if profiler is not None:
+            # CPU time is not split between walking and reading; both are mostly I/O bound.
+            profiler.add_stage("walk", list_wall - read_wall, 0.0)
+            profiler.add_stage("read", read_wall, 0.0, calls=len(tasks))
+
+        def work(key: str, rels: list[str], content: bytes) -> list[Finding]:
+            t0 = time.perf_counter()
+            if profiler is None:
+                out = scan_one(key, rels, content, None)
+            else:
+                prof = profiler.file_profile(rels[0])
+                out = scan_one(key, rels, content, prof)
+                profiler.merge(prof, time.perf_counter() - t0)
+            m.file_seconds.append(time.perf_counter() - t0)
+            return out
+
+        def scan_one(key: str, rels: list[str], content: bytes, prof: FileProfile | None) -> list[Finding]:
+            out: list[Finding] = []
+            missing = rels
+            digest = _timed_stage(prof, "cache", cache.digest, content) if use_cache else None
+            if use_cache:
+                missing = []
+                for rel in rels:
+                    cached = cache.get(rel, content, digest)
+                    if cached is None:
+                        missing.append(rel)
+                    else:
+                        out.extend(Finding.from_dict(d) for d in cached)
+                if not missing:
+                    return [f for f in out if f.fingerprint not in baseline]
+
+            rel, copies = missing[0], missing[1:]
+            if timed_pool is not None:
+                found = timed_pool.scan(rel, content, copies)
+                if any(f.rule_id == timeout_rule_id for f in found):
+                    # Partial results must not be cached.
+                    return [f for f in out + found if f.fingerprint not in baseline]
+            else:
+                found = scan_bytes(rel, content, profile=prof, copies=copies, **scan_kwargs)
+            if store is not None and not found and not all(_path_allowlisted(p, path_allowlist) for p in missing):
+                # Clean for a path the allowlist does not cover: clean for any path.
+                store.add(key)
+            elif use_cache:
+                by_path: dict[str, list[dict[str, Any]]] = {p: [] for p in missing}
+                for f in found:
+                    by_path[f.file].append(f.to_dict())
+                for p, dicts in by_path.items():
+                    _timed_stage(prof, "cache", cache.put, p, content, dicts, digest)
+            return [f for f in out + found if f.fingerprint not in baseline]
+
+        path_allowlist = scan_kwargs["path_allowlist"]
+        groups = [(key, rels, content) for key, (rels, content) in tasks.items()]
+        sizes = [len(content) for _, _, content in groups]
+        workers = cfg.scan.threads or auto_workers(sum(sizes), len(groups), processes=budget > 0)
+        # Tasks were listed riskiest first under a time budget; keep that order.
+        chunks = plan_chunks(sizes, workers, list(range(len(groups))) if deadline is not None else None)
+
+        timed_pool: TimedScanPool | None = None
+        timeout_rule_id = ""
+        if budget > 0:
+            # multiprocessing is only imported when a per-file budget is actually in use.
+            from .watchdog import TIMEOUT_RULE_ID, TimedScanPool
+
+            timed_pool = TimedScanPool(workers, budget, scan_bytes, scan_kwargs)
+            timeout_rule_id = TIMEOUT_RULE_ID
+
+        busy: list[float] = []
+        cut: list[int] = []  # groups left unscanned at the deadline
+
+        def run_chunk(chunk: list[int]) -> list[Finding]:
+            t0 = time.perf_counter()
+            out: list[Finding] = []
+            for i in chunk:
+                if deadline is not None and clock() > deadline:
+                    cut.append(i)  # list.append is atomic, like the sets in Cache
+                    continue
+                out.extend(work(*groups[i]))
+            busy.append(time.perf_counter() - t0)
+            return out
+
+        findings: list[Finding] = []
+        pool_t0 = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                # Submission order is the order workers pick chunks up in: largest first.
+                futures = {ex.submit(run_chunk, chunk): chunk for chunk in chunks}
+                for fut in as_completed(futures):
+                    found = fut.result()
+                    findings.extend(found)
+                    if progress is not None:
+                        # Updated here, in the scan thread, so workers never touch the counters.
+                        chunk = futures[fut]
+                        progress.done(sum(len(groups[i][1]) for i in chunk), sum(sizes[i] for i in chunk), len(found))
+                        progress.cache(cache.hits, cache.misses)
+        finally:
+            if timed_pool is not None:
+                timed_pool.close()
+        pool_wall = time.perf_counter() - pool_t0
+        for i in cut:
+            uncovered.extend(groups[i][1])
+            m.files_scanned -= len(groups[i][1])
+            m.files_deduplicated -= len(groups[i][1]) - 1
+            m.bytes_scanned -= sizes[i]
+        m.stages["scan"] = pool_wall
+        if profiler is not None:
+            profiler.pool = PoolStats(workers, len(chunks), sum(busy), pool_wall)
+
+        save_t0 = time.perf_counter()
+        if use_cache:
+            with profiler.stage("cache") if profiler is not None else nullcontext():
+                if mode != "staged" and shard is None and only is None and not pathspecs and not uncovered:
+                    # Every file of the tree was looked up, so the rest are deleted, renamed or
+                    # now excluded.
+                    cache.prune_unseen()
+                cache.save()
+                if store is not None:
+                    store.save()
+        m.stages["cache_save"] = time.perf_counter() - save_t0
+        m.cache_hits = cache.hits
+        m.cache_misses = cache.misses
+        m.add_findings(findings)
+        if deadline is not None:
+            m.skipped["time_budget"] = len(uncovered)
+            files_total = m.files_listed - len(ineligible)
+            bytes_total = sum(file_sizes.values()) - sum(file_sizes.get(r, 0) for r in ineligible)
+            m.coverage = Coverage(
+                files_scanned=files_total - len(uncovered),
+                files_total=files_total,
+                bytes_scanned=bytes_total - sum(file_sizes.get(r, 0) for r in uncovered),
+                bytes_total=bytes_total,
+            )
+        m.finish(scan_t0)
+        return findings
+    finally:
+        # A binary baseline is memory-mapped; release it like _update_baseline does.
+        setup.close()
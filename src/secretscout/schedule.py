@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Any
+
+# Files are grouped into chunks so tiny files do not each pay for a future, while big files
+# run alone. Chunks are handed out largest first (LPT), so the last thing a worker picks up
+# is small and the scan does not end with one worker busy on a big file.
+CHUNK_BYTES = 256 * 1024
+CHUNK_FILES = 64
+# With threads="auto", a thread is only added for about this much content: matching holds the
+# GIL, so below it the extra thread costs more than it can save.
+WORKER_BYTES = 1024 * 1024
+MAX_WORKERS = 32
+
+
+def auto_workers(total_bytes: int, files: int, cpus: int | None = None, processes: bool = False) -> int:
+    """Workers for a scan; `processes` when they run in a process pool (a per-file timeout),
+    where every CPU matches in parallel however little content there is."""
+    cpus = cpus or os.cpu_count() or 1
+    if processes:
+        return max(1, min(cpus, MAX_WORKERS, files))
+    by_size = math.ceil(total_bytes / WORKER_BYTES)
+    return max(1, min(cpus, MAX_WORKERS, files, by_size))
+
+
+def plan_chunks(sizes: list[int], workers: int, order: list[int] | None = None) -> list[list[int]]:
+    """Split task indices into chunks, largest first unless an `order` is given.
+
+    The chunk size also shrinks for small scans so every worker still gets several chunks.
+    """
+    if order is None:
+        order = sorted(range(len(sizes)), key=lambda i: -sizes[i])
+    limit = max(1, min(CHUNK_BYTES, sum(sizes) // (workers * 4)))
+    chunks: list[list[int]] = []
+    chunk: list[int] = []
+    size = 0
+    for i in order:
+        if chunk and (size + sizes[i] > limit or len(chunk) >= CHUNK_FILES):
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append(i)
+        size += sizes[i]
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+@dataclass
+class PoolStats:
+    workers: int
+    chunks: int
+    busy: float = 0.0  # summed over workers
+    wall: float = 0.0
+
+    @property
+    def utilisation(self) -> float:
+        return self.busy / (self.workers * self.wall) if self.wall > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "chunks": self.chunks,
+            "busy_s": self.busy,
+            "wall_s": self.wall,
+            "utilisation": self.utilisation,
+        }
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal, TypeVar
+
+ShardBy = Literal["hash", "size"]
+
+T = TypeVar("T", bound=tuple)
+
+
+@dataclass(frozen=True)
+class Shard:
+    index: int  # 1-based, as in "--shard 2/4"
+    count: int
+    by: ShardBy = "hash"
+
+
+def parse_shard(value: str, by: str = "hash") -> Shard:
+    try:
+        index_s, count_s = value.split("/")
+        index, count = int(index_s), int(count_s)
+    except ValueError:
+        raise ValueError(f"Shard must look like INDEX/COUNT, e.g. 1/4 (got {value!r})") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Shard index must be between 1 and {count} (got {value!r})")
+    if by not in ("hash", "size"):
+        raise ValueError(f"Shard balancing must be hash or size (got {by!r})")
+    return Shard(index, count, by)  # type: ignore[arg-type]
+
+
+def shard_of(rel_path: str, count: int) -> int:
+    # Stable across machines and Python runs (unlike hash()); 1-based.
+    digest = hashlib.blake2b(rel_path.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def select_shard(root: Path, entries: list[T], shard: Shard) -> list[T]:
+    """Keep the entries (rel_path, staged_content) that belong to `shard`.
+
+    "hash" assigns each path independently, so a file stays in its shard when others change.
+    "size" balances bytes: largest files first, each to the currently lightest shard. It needs
+    the full file list and sizes, which every shard computes identically.
+    """
+    if shard.count == 1:
+        return entries
+    if shard.by == "hash":
+        return [e for e in entries if shard_of(e[0], shard.count) == shard.index]
+
+    sized: list[tuple[int, str, T]] = []
+    for e in entries:
+        rel, content = e[0], e[1]
+        if content is not None:
+            size = len(content)
+        else:
+            try:
+                size = (root / rel).stat().st_size
+            except OSError:
+                size = 0
+        sized.append((size, rel, e))
+    sized.sort(key=lambda t: (-t[0], t[1]))
+
+    loads = [(0, i) for i in range(1, shard.count + 1)]
+    out: list[T] = []
+    for size, _, e in sized:
+        load, i = heapq.heappop(loads)
+        if i == shard.index:
+            out.append(e)
+        heapq.heappush(loads, (load + size, i))
+    return out
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from .models import Finding, Severity
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    root TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    git_commit TEXT,
+    started_at TEXT NOT NULL,
+    duration REAL NOT NULL,
+    config_hash TEXT NOT NULL,
+    finding_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    scan_id INTEGER NOT NULL REFERENCES scans(id) ON DELETE CASCADE,
+    rule_id TEXT NOT NULL,
+    rule_title TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    file TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    match TEXT NOT NULL,
+    snippet TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    offset INTEGER,
+    layer TEXT,
+    match_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS findings_scan ON findings(scan_id, rule_id);
+"""
+
+# Scans kept per store; older ones are deleted (with their findings) as new ones are recorded.
+MAX_SCANS = 100
+
+_FINDING_COLUMNS = (
+    "rule_id, rule_title, severity, file, line, col, match, snippet, fingerprint, offset, layer, match_hash"
+)
+
+# Columns added to `findings` after the first release; older stores get them on open.
+_ADDED_COLUMNS = {"offset": "INTEGER", "layer": "TEXT", "match_hash": "TEXT"}
+
+
+@dataclass
+class ScanRecord:
+    id: int
+    root: str
+    mode: str
+    commit: str | None
+    started_at: str
+    duration: float
+    config_hash: str
+    finding_count: int
+
+
+class ResultsStore:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.dir = root / ".secretscout-cache"
+        self.path = self.dir / "results.sqlite"
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.executescript(SCHEMA)
+            have = {row[1] for row in conn.execute("PRAGMA table_info(findings)")}
+            with conn:
+                for name, kind in _ADDED_COLUMNS.items():
+                    if name not in have:
+                        conn.execute(f"ALTER TABLE findings ADD COLUMN {name} {kind}")
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def record(
+        self,
+        mode: str,
+        findings: list[Finding],
+        started_at: str,
+        duration: float,
+        config_hash: str,
+        commit: str | None = None,
+        keep: int = MAX_SCANS,
+    ) -> int:
+        """Store the findings of a scan, before baseline filtering; `config_hash` is the scan key."""
+        db = self._db()
+        with db:
+            cur = db.execute(
+                "INSERT INTO scans (root, mode, git_commit, started_at, duration, config_hash, finding_count) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(self.root), mode, commit, started_at, duration, config_hash, len(findings)),
+            )
+            scan_id = int(cur.lastrowid or 0)
+            db.executemany(
+                f"INSERT INTO findings (scan_id, {_FINDING_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        scan_id,
+                        f.rule_id,
+                        f.rule_title,
+                        f.severity.value,
+                        f.file,
+                        f.line,
+                        f.col,
+                        f.match,
+                        f.snippet,
+                        f.fingerprint,
+                        f.offset,
+                        f.layer,
+                        f.match_hash,
+                    )
+                    for f in findings
+                ],
+            )
+            if keep > 0:
+                db.execute(
+                    "DELETE FROM scans WHERE id <= (SELECT id FROM scans ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (keep,),
+                )
+        return scan_id
+
+    def history(self, limit: int = 20, mode: str | None = None) -> list[ScanRecord]:
+        if not self.path.exists():
+            return []
+        sql = "SELECT id, root, mode, git_commit, started_at, duration, config_hash, finding_count FROM scans"
+        args: tuple = ()
+        if mode:
+            sql += " WHERE mode = ?"
+            args = (mode,)
+        sql += " ORDER BY id DESC LIMIT ?"
+        rows = self._db().execute(sql, (*args, limit)).fetchall()
+        return [ScanRecord(*row) for row in rows]
+
+    def last_scan(self, mode: str | None = None) -> ScanRecord | None:
+        scans = self.history(limit=1, mode=mode)
+        return scans[0] if scans else None
+
+    def findings(self, scan_id: int) -> list[Finding]:
+        rows = self._db().execute(
+            f"SELECT {_FINDING_COLUMNS} FROM findings WHERE scan_id = ?", (scan_id,)
+        ).fetchall()
+        return [
+            Finding(
+                rule_id=r[0],
+                rule_title=r[1],
+                severity=Severity(r[2]),
+                file=r[3],
+                line=int(r[4]),
+                col=int(r[5]),
+                match=r[6],
+                snippet=r[7],
+                fingerprint=r[8],
+                offset=None if r[9] is None else int(r[9]),
+                layer=r[10],
+                match_hash=r[11],
+            )
+            for r in rows
+        ]
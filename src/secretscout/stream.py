@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Container, Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from .models import Finding, Rule
+from .regex import compile_pattern
+from .scanner import prepare_scan, scan_bytes
+from .util import fingerprint, redact
+
+STREAM_NAME = "<stdin>"
+CHUNK_SIZE = 64 * 1024
+# Text without a newline is scanned in pieces of this size, so one endless line cannot grow memory.
+MAX_LINE = 1024 * 1024
+# Characters of earlier text kept so multiline rules can match across block boundaries.
+LOOKBEHIND = 64 * 1024
+
+
+def iter_blocks(stream: BinaryIO, chunk_size: int = CHUNK_SIZE, max_line: int = MAX_LINE) -> Iterator[bytes]:
+    # read1 returns whatever is available, so lines from `tail -F` are scanned as they arrive
+    # instead of waiting for a full chunk.
+    read = getattr(stream, "read1", None) or stream.read
+    pending = b""
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        pending += chunk
+        cut = pending.rfind(b"\n") + 1
+        if not cut:
+            if len(pending) < max_line:
+                continue
+            cut = len(pending)
+        yield pending[:cut]
+        pending = pending[cut:]
+    if pending:
+        yield pending
+
+
+def _line_offsets(text: str, first_line: int, offset: int) -> dict[int, int]:
+    out: dict[int, int] = {}
+    for i, line in enumerate(text.splitlines(keepends=True), start=first_line):
+        out[i] = offset
+        offset += len(line.encode("utf-8"))
+    return out
+
+
+def _multiline_findings(
+    rules: list[Rule],
+    window: str,
+    start: int,
+    first_line: int,
+    window_offset: int,
+    name: str,
+    scan_kwargs: dict[str, Any],
+) -> list[Finding]:
+    allowlist = scan_kwargs["allowlist"]
+    low = window.lower()
+    out: list[Finding] = []
+    for rule in rules:
+        if rule.keywords and not any(k in low for k in rule.keywords):
+            continue
+        compiled = compile_pattern(rule.pattern, re.MULTILINE, scan_kwargs.get("regex_engine", "re"))
+        for m in compiled.finditer(window):
+            if m.end() <= start:
+                continue  # already reported with the previous block
+            match = m.group(0)
+            if any(a.search(match) for a in allowlist):
+                continue
+            upto = window[: m.start()]
+            line = first_line + upto.count("\n")
+            line_start = upto.rfind("\n") + 1
+            sn = redact(match, head=scan_kwargs["redact_head"], tail=scan_kwargs["redact_tail"])
+            out.append(
+                Finding(
+                    rule_id=rule.id,
+                    rule_title=rule.title,
+                    severity=rule.severity,
+                    file=name,
+                    line=line,
+                    col=m.start() - line_start + 1,
+                    match=sn,
+                    snippet=sn,
+                    fingerprint=fingerprint(rule.id, name, line, match),
+                    offset=window_offset + len(window[:line_start].encode("utf-8")),
+                )
+            )
+    return out
+
+
+def scan_stream(
+    stream: BinaryIO,
+    scan_kwargs: dict[str, Any],
+    name: str = STREAM_NAME,
+    baseline: Container[str] = frozenset(),
+    chunk_size: int = CHUNK_SIZE,
+    max_line: int = MAX_LINE,
+    lookbehind: int = LOOKBEHIND,
+) -> Iterator[Finding]:
+    """Scan a binary stream incrementally, yielding findings block by block.
+
+    Memory is bounded by chunk_size + max_line + lookbehind regardless of the stream length.
+    Findings carry the stream byte offset of their line in `offset`.
+    """
+    rules: list[Rule] = scan_kwargs["rules"]
+    line_kwargs = {**scan_kwargs, "rules": [r for r in rules if not r.multiline]}
+    multiline = [r for r in rules if r.multiline]
+
+    line = 1  # number of the block's first line
+    offset = 0  # stream offset of the block
+    behind = ""
+    behind_line = 1
+    behind_offset = 0
+
+    for block in iter_blocks(stream, chunk_size, max_line):
+        text = block.decode("utf-8", "replace")
+        found = scan_bytes(name, block, line_offset=line - 1, **line_kwargs)
+        if found:
+            starts = _line_offsets(text, line, offset)
+            for f in found:
+                f.offset = starts.get(f.line, offset)
+        if multiline:
+            window = behind + text
+            found += _multiline_findings(
+                multiline, window, len(behind), behind_line, behind_offset, name, scan_kwargs
+            )
+            if len(window) > lookbehind:
+                cut = len(window) - lookbehind
+                nl = window.find("\n", cut)
+                cut = nl + 1 if nl != -1 else cut
+                removed = window[:cut]
+                behind_line += removed.count("\n")
+                behind_offset += len(removed.encode("utf-8"))
+                window = window[cut:]
+            behind = window
+
+        found.sort(key=lambda f: (f.line, f.col))
+        for f in found:
+            if f.fingerprint not in baseline:
+                yield f
+
+        lines = text.splitlines(keepends=True)
+        last = lines[-1] if lines else ""
+        # A block cut inside a long line continues that line in the next block.
+        line += len(lines) - (0 if last.splitlines() != [last] else 1)
+        offset += len(block)
+
+
+def stream_findings(
+    stream: BinaryIO,
+    root: Path = Path("."),
+    baseline_path: Path | None = None,
+    regex_engine: str | None = None,
+    name: str = STREAM_NAME,
+) -> Iterator[Finding]:
+    setup = prepare_scan(root, baseline_path, use_cache=False, regex_engine=regex_engine, file_timeout=0.0)
+    try:
+        yield from scan_stream(stream, setup.scan_kwargs, name=name, baseline=setup.baseline)
+    finally:
+        setup.close()
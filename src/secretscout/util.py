@@ -20,6 +20,9 @@ def shannon_entropy(s: str) -> float:
     return ent
 
 
+# Lowercase literals of which one must occur for _TOKEN_CANDIDATE to match.
+ENTROPY_KEYWORDS = ("token", "secret", "api", "passw")
+
 _TOKEN_CANDIDATE = re.compile(
     r"(?i)(?:token|secret|api[_-]?key|password|passwd|client[_-]?secret)\b[^\S\r\n]*[:=][^\S\r\n]*([A-Za-z0-9_\-\+=/]{12,})"
 )
@@ -39,6 +42,11 @@ def sha256_bytes(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
 
 
+def blob_id(content: bytes) -> str:
+    # Same as `git hash-object`, so it can be compared with ids from the index.
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
 def fingerprint(rule_id: str, file: str, line: int, match: str) -> str:
     h = hashlib.sha256()
     h.update(rule_id.encode("utf-8"))
@@ -51,6 +59,11 @@ def fingerprint(rule_id: str, file: str, line: int, match: str) -> str:
     return h.hexdigest()
 
 
+def match_hash(match: str) -> str:
+    """64-bit hash of an unredacted match; unlike the fingerprint it does not change with the line."""
+    return hashlib.blake2b(match.encode("utf-8"), digest_size=8).hexdigest()
+
+
 def redact(s: str, head: int = 4, tail: int = 4) -> str:
     if len(s) <= head + tail + 3:
         return "***"
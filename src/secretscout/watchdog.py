@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import contextlib
+import multiprocessing as mp
+import queue
+import signal
+from collections.abc import Callable, Sequence
+from multiprocessing.connection import Connection
+from types import FrameType
+from typing import Any
+
+from .models import Finding, Severity
+from .util import fingerprint
+
+TIMEOUT_RULE_ID = "scan-timeout"
+
+# Extra time the parent waits for a child to report its own timeout before killing it.
+KILL_GRACE = 1.0
+
+
+class ScanTimeout(Exception):
+    def __init__(self, rule_id: str | None) -> None:
+        super().__init__(rule_id or "")
+        self.rule_id = rule_id
+
+
+def timeout_finding(rel_path: str, rule_id: str | None, budget: float) -> Finding:
+    what = f"rule {rule_id}" if rule_id else "scan"
+    return Finding(
+        rule_id=TIMEOUT_RULE_ID,
+        rule_title="Scan timed out",
+        severity=Severity.low,
+        file=rel_path,
+        line=1,
+        col=1,
+        match=rule_id or "",
+        snippet=f"{what} exceeded the {budget:g}s budget; file was not fully scanned",
+        fingerprint=fingerprint(TIMEOUT_RULE_ID, rel_path, 1, rule_id or ""),
+    )
+
+
+def _running_rule(frame: FrameType | None) -> str | None:
+    # scan_bytes keeps the rule it is matching in a local, set before each match loop; the
+    # matching itself runs in generator frames that may be below it or already finished.
+    while frame is not None:
+        if frame.f_code.co_name == "scan_bytes":
+            active = frame.f_locals.get("active_rule")
+            return active[0] if active else None
+        frame = frame.f_back
+    return None
+
+
+def _on_alarm(signum: int, frame: FrameType | None) -> None:
+    raise ScanTimeout(_running_rule(frame))
+
+
+def _child_main(
+    conn: Connection,
+    scan_fn: Callable[..., list[Finding]],
+    scan_kwargs: dict[str, Any],
+    budget: float,
+) -> None:
+    # SIGALRM interrupts the regex engine from inside, which keeps the child reusable.
+    # Where it is unavailable the parent kills the child instead.
+    use_alarm = hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+    conn.send(("ready", None))
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if msg is None:
+            return
+        rel, content, copies = msg
+        try:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, budget)
+            try:
+                out = scan_fn(rel, content, copies=copies, **scan_kwargs)
+            finally:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+        except ScanTimeout as e:
+            conn.send(("timeout", e.rule_id))
+            continue
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+            continue
+        conn.send(("ok", [f.to_dict() for f in out]))
+
+
+class _Worker:
+    def __init__(self, ctx: Any, scan_fn: Callable[..., list[Finding]], scan_kwargs: dict[str, Any], budget: float):
+        self.conn, child_conn = ctx.Pipe()
+        self.proc = ctx.Process(
+            target=_child_main,
+            args=(child_conn, scan_fn, scan_kwargs, budget),
+            daemon=True,
+        )
+        self.proc.start()
+        child_conn.close()
+        # Interpreter start-up must not count against the first file's budget.
+        self.conn.recv()
+
+    def kill(self) -> None:
+        self.proc.kill()
+        self.proc.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        with contextlib.suppress(OSError):
+            self.conn.send(None)
+        self.proc.join(timeout=1)
+        if self.proc.is_alive():
+            self.proc.kill()
+            self.proc.join(timeout=5)
+        self.conn.close()
+
+
+class TimedScanPool:
+    """Runs a scan function in child processes that are killed when a file exceeds its budget."""
+
+    def __init__(
+        self,
+        workers: int,
+        budget: float,
+        scan_fn: Callable[..., list[Finding]],
+        scan_kwargs: dict[str, Any],
+    ) -> None:
+        self.budget = budget
+        self._scan_fn = scan_fn
+        self._scan_kwargs = scan_kwargs
+        self._ctx = mp.get_context("spawn")
+        self._idle: queue.SimpleQueue[_Worker | None] = queue.SimpleQueue()
+        self._workers = max(1, workers)
+        for _ in range(self._workers):
+            self._idle.put(None)  # started lazily
+
+    def __enter__(self) -> TimedScanPool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def scan(self, rel_path: str, content: bytes, copies: Sequence[str] = ()) -> list[Finding]:
+        worker = self._idle.get()
+        try:
+            if worker is None or not worker.proc.is_alive():
+                worker = _Worker(self._ctx, self._scan_fn, self._scan_kwargs, self.budget)
+            try:
+                worker.conn.send((rel_path, content, tuple(copies)))
+                ready = worker.conn.poll(self.budget + KILL_GRACE)
+                status, payload = worker.conn.recv() if ready else ("killed", None)
+            except (EOFError, OSError) as err:
+                worker.kill()
+                worker = None
+                raise RuntimeError(f"Scan worker died while scanning {rel_path}") from err
+            if status == "killed":
+                worker.kill()
+                worker = None
+        finally:
+            self._idle.put(worker)
+
+        if status in ("timeout", "killed"):
+            return [timeout_finding(p, payload, self.budget) for p in (rel_path, *copies)]
+        if status == "error":
+            raise RuntimeError(f"Failed to scan {rel_path}: {payload}")
+        return [Finding.from_dict(d) for d in payload]
+
+    def close(self) -> None:
+        for _ in range(self._workers):
+            worker = self._idle.get()
+            if worker is not None:
+                worker.stop()
@@ -0,0 +1,68 @@
+import asyncio
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from secretscout.aio import aiter_findings, ascan_bytes, ascan_path
+from secretscout.scanner import prepare_scan, scan_path
+
+TOKEN = "ghp_" + "a" * 36
+
+
+def _project(tmp_path, n=6):
+    for i in range(n):
+        (tmp_path / f"mod_{i}.py").write_text(f'token_{i} = "{TOKEN}"\nx = {i}\n', encoding="utf-8")
+    (tmp_path / "clean.py").write_text("print('hello')\n", encoding="utf-8")
+    return tmp_path
+
+
+def _keys(findings):
+    return sorted((f.file, f.line, f.rule_id) for f in findings)
+
+
+def test_concurrent_async_scans_share_executor(tmp_path):
+    roots = []
+    for name in ("a", "b"):
+        root = tmp_path / name
+        root.mkdir()
+        roots.append(_project(root))
+    expected = _keys(scan_path(roots[0], mode="all", use_cache=False))
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            return await asyncio.gather(
+                *(ascan_path(r, mode="all", executor=ex, concurrency=2) for r in roots)
+            )
+
+    first, second = asyncio.run(main())
+    assert _keys(first) == _keys(second) == expected
+    assert len(expected) == 6
+    # The second run is served from the cache written by the first.
+    assert _keys(asyncio.run(ascan_path(roots[0], mode="all"))) == expected
+
+
+def test_async_staged_scan_uses_git_index(tmp_path):
+    root = _project(tmp_path, n=2)
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "mod_0.py"], cwd=root, check=True)
+    (root / "mod_0.py").write_text("clean = True\n", encoding="utf-8")
+
+    findings = asyncio.run(ascan_path(root, mode="staged", use_cache=False))
+    assert _keys(findings) == [("mod_0.py", 1, "github-token")]
+
+
+def test_aiter_findings_stops_early_and_ascan_bytes_in_process_pool(tmp_path):
+    root = _project(tmp_path, n=20)
+
+    async def first_only():
+        async for f in aiter_findings(root, mode="all", use_cache=False, concurrency=2):
+            return f
+
+    assert asyncio.run(first_only()).rule_id == "github-token"
+
+    kwargs = prepare_scan(root, use_cache=False).scan_kwargs
+
+    async def in_pool():
+        with ProcessPoolExecutor(max_workers=1) as ex:
+            return await ascan_bytes("x.py", f'k = "{TOKEN}"\n'.encode(), ex, **kwargs)
+
+    assert [f.rule_id for f in asyncio.run(in_pool())] == ["github-token"]
@@ -0,0 +1,137 @@
+import hashlib
+import subprocess
+
+from secretscout.baseline import (
+    BinaryBaseline,
+    convert_baseline,
+    is_binary_baseline,
+    load_baseline,
+    load_baseline_meta,
+    write_baseline,
+)
+from secretscout.commands import cmd_baseline
+from secretscout.scanner import scan_bytes, scan_path
+
+
+def _fps(n):
+    return [hashlib.sha256(str(i).encode()).hexdigest() for i in range(n)]
+
+
+def test_binary_baseline_roundtrip(tmp_path):
+    fps = _fps(500)
+    path = tmp_path / "baseline.bin"
+    assert write_baseline(path, fps) == 500
+
+    baseline = load_baseline(path)
+    assert isinstance(baseline, BinaryBaseline)
+    assert len(baseline) == 500
+    assert all(fp in baseline for fp in fps)
+    assert hashlib.sha256(b"missing").hexdigest() not in baseline
+    assert "not-a-fingerprint" not in baseline
+    assert sorted(baseline) == sorted(fps)
+
+
+def test_convert_json_to_binary_and_back(tmp_path):
+    fps = _fps(20)
+    src = tmp_path / "baseline.json"
+    write_baseline(src, fps)
+    assert load_baseline(src) == set(fps)
+
+    dst = tmp_path / "baseline.bin"
+    assert convert_baseline(src, dst) == 20
+    assert set(load_baseline(dst)) == set(fps)
+
+    back = tmp_path / "again.json"
+    convert_baseline(dst, back)
+    assert load_baseline(back) == set(fps)
+
+
+def test_only_bin_suffix_picks_binary_format(tmp_path):
+    fps = _fps(3)
+    for name in ("baseline.txt", "baseline"):
+        write_baseline(tmp_path / name, fps)
+        assert not is_binary_baseline(tmp_path / name)
+        assert load_baseline(tmp_path / name) == set(fps)
+    write_baseline(tmp_path / "baseline.txt", fps, fmt="binary")
+    assert is_binary_baseline(tmp_path / "baseline.txt")
+
+
+def test_scan_path_releases_binary_baseline(tmp_path, monkeypatch):
+    path = tmp_path / "baseline.bin"
+    write_baseline(path, _fps(3))
+    (tmp_path / "a.py").write_text("x = 1\n", encoding="utf-8")
+    opened = []
+    real_init = BinaryBaseline.__init__
+
+    def init(self, p):
+        real_init(self, p)
+        opened.append(self)
+
+    monkeypatch.setattr(BinaryBaseline, "__init__", init)
+    scan_path(tmp_path, mode="all", baseline_path=path, use_cache=False)
+    assert len(opened) == 1
+    assert opened[0]._fh.closed
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+def test_update_rescans_changed_files_and_needs_accept_new(tmp_path, monkeypatch):
+    tok = "ghp_" + "a" * 36
+    (tmp_path / "a.py").write_text(f'token = "{tok}"\n', encoding="utf-8")
+    (tmp_path / "b.py").write_text(f'token = "{tok}"\n', encoding="utf-8")
+    (tmp_path / "c.py").write_text("x = 1\n", encoding="utf-8")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    out = tmp_path / "baseline.json"
+    assert cmd_baseline(tmp_path, out, tracked=True) == 0
+    meta = load_baseline_meta(out)
+    assert meta is not None and sorted(meta.files) == ["a.py", "b.py"]
+
+    (tmp_path / "b.py").unlink()
+    (tmp_path / "c.py").write_text(f'token = "{tok}"\n', encoding="utf-8")
+    scanned = []
+    real = scan_bytes
+
+    def counting(rel, content, **kw):
+        scanned.append(rel)
+        return real(rel, content, **kw)
+
+    monkeypatch.setattr("secretscout.scanner.scan_bytes", counting)
+    # The new secret in c.py is reported but not accepted; b.py's entry is pruned.
+    assert cmd_baseline(tmp_path, out, tracked=True, update=True) == 1
+    assert scanned == ["c.py"]
+    assert sorted(load_baseline_meta(out).files) == ["a.py"]
+    assert len(load_baseline(out)) == 1
+
+    assert cmd_baseline(tmp_path, out, tracked=True, update=True, accept_new=True) == 0
+    assert sorted(load_baseline_meta(out).files) == ["a.py", "c.py"]
+    assert len(load_baseline(out)) == 2
+
+    # A committed secret that was refused stays pending until it is accepted.
+    _git(tmp_path, "add", "-A", "b.py", "c.py")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "more")
+    (tmp_path / "d.py").write_text(f'key = "{"ghp_" + "d" * 36}"\n', encoding="utf-8")
+    _git(tmp_path, "add", "d.py")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "d")
+    assert cmd_baseline(tmp_path, out, tracked=True, update=True) == 1
+    assert cmd_baseline(tmp_path, out, tracked=True, update=True, accept_new=True) == 0
+    assert sorted(load_baseline_meta(out).files) == ["a.py", "c.py", "d.py"]
+    assert cmd_baseline(tmp_path, out, tracked=True, update=True) == 0
+
+
+def test_update_in_a_subdirectory_of_the_repository(tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / "a.py").write_text("x = 1\n", encoding="utf-8")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    out = tmp_path / "baseline.json"
+    assert cmd_baseline(sub, out, tracked=True) == 0
+
+    (sub / "a.py").write_text(f'token = "{"ghp_" + "a" * 36}"\n', encoding="utf-8")
+    assert cmd_baseline(sub, out, tracked=True, update=True, accept_new=True) == 0
+    assert sorted(load_baseline_meta(out).files) == ["a.py"]
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+import typer
+
+from secretscout.batch import read_roots, render_many, scan_many
+from secretscout.commands import cmd_scan_many
+from secretscout.scanner import scan_path
+
+TOKEN = "ghp_" + "c" * 36
+
+
+def _repos(tmp_path, n=4):
+    roots = []
+    for i in range(n):
+        root = tmp_path / f"repo{i}"
+        root.mkdir()
+        for j in range(i + 1):
+            (root / f"f{j}.py").write_text(f'k = "{TOKEN}"\n' if j % 2 == 0 else "x = 1\n", encoding="utf-8")
+        roots.append(root)
+    # Per-repo config: repo0 disables the rule that fires everywhere else.
+    (roots[0] / ".secretscout.toml").write_text('[rules]\ndisable = ["github-token"]\n', encoding="utf-8")
+    return roots
+
+
+def _keys(findings):
+    return sorted((f.file, f.line, f.rule_id) for f in findings)
+
+
+def test_scan_many_matches_per_repo_scans(tmp_path):
+    roots = _repos(tmp_path)
+    expected = [_keys(scan_path(r, mode="all", use_cache=False)) for r in roots]
+
+    for jobs in (1, 2):
+        results = scan_many([*roots, tmp_path / "missing"], mode="all", use_cache=False, jobs=jobs)
+        assert [_keys(r.findings) for r in results[:-1]] == expected
+        assert [r.files for r in results[:-1]] == [2, 2, 3, 4]  # repo0 also has its .secretscout.toml
+        assert results[-1].error and "missing" in results[-1].error
+    assert expected[0] == []
+
+
+def test_scan_many_reports_and_roots_file(tmp_path):
+    roots = _repos(tmp_path, n=2)
+    listing = tmp_path / "roots.txt"
+    listing.write_text(f"# nightly\n{roots[0]}\n\n{roots[1]}\n", encoding="utf-8")
+    assert read_roots(listing) == roots
+
+    results = scan_many(read_roots(listing), mode="all", jobs=1)
+    data = json.loads(render_many(results, "json", max_findings=10))
+    assert [len(r["findings"]) for r in data["repos"]] == [0, 1]
+    assert data["count"] == 1
+
+    sarif = json.loads(render_many(results, "sarif", max_findings=10))
+    assert len(sarif["runs"]) == 2
+    assert sarif["runs"][1]["originalUriBaseIds"]["SRCROOT"]["uri"] == roots[1].resolve().as_uri() + "/"
+
+
+def test_minimal_goes_to_the_output_file_and_table_refuses_one(tmp_path, capsys):
+    repo = tmp_path / "r"
+    repo.mkdir()
+    (repo / "a.py").write_text(f'token = "{TOKEN}"\n', encoding="utf-8")
+    out = tmp_path / "report.txt"
+    args = dict(
+        roots=[repo], roots_file=None, fail_on="high", baseline=None, staged=False, tracked=False,
+        all_files=True, exclude=[], no_cache=True, max_findings=None,
+    )
+    assert cmd_scan_many(fmt="minimal", output=out, **args) == 1
+    assert out.read_text(encoding="utf-8").startswith(f"{repo}\thigh\tgithub-token")
+    assert capsys.readouterr().out == ""
+    with pytest.raises(typer.BadParameter):
+        cmd_scan_many(fmt="table", output=out, **args)
+
+    # --max-findings 0 lists nothing; only None falls back to the config.
+    assert cmd_scan_many(fmt="minimal", output=out, **{**args, "max_findings": 0}) == 1
+    assert out.read_text(encoding="utf-8") == ""
@@ -0,0 +1,23 @@
+from secretscout.bench import compare_results, generate_corpus, run_bench
+
+
+def test_corpus_is_reproducible(tmp_path):
+    a = generate_corpus(tmp_path / "a", size_mb=0.05, density=0.05, seed=7)
+    b = generate_corpus(tmp_path / "b", size_mb=0.05, density=0.05, seed=7)
+    assert (a.files, a.bytes, a.secrets) == (b.files, b.bytes, b.secrets)
+    assert set(a.by_kind) == {"source", "minified", "logs", "pem", "binary"}
+    assert (tmp_path / "a" / "src/pkg_000/module_00000.py").read_bytes() == (
+        tmp_path / "b" / "src/pkg_000/module_00000.py"
+    ).read_bytes()
+
+
+def test_bench_smoke_and_compare(tmp_path):
+    corpus = generate_corpus(tmp_path, kinds=("source", "logs"), size_mb=0.05, density=0.05)
+    results = run_bench(corpus)
+    assert results["findings"] > 0
+    assert results["metrics"]["files_per_s"] > 0
+    assert set(results["report_s"]) == {"json", "sarif", "html"}
+
+    assert compare_results(results, results) == []
+    slower = {"metrics": {**results["metrics"], "mb_per_s": results["metrics"]["mb_per_s"] * 2}}
+    assert compare_results(results, slower)
@@ -0,0 +1,132 @@
+import json
+import subprocess
+
+from secretscout import scanner
+from secretscout.cache import Cache, ContentStore
+from secretscout.commands import (
+    cmd_cache_clear,
+    cmd_cache_export,
+    cmd_cache_import,
+    cmd_cache_prune,
+)
+from secretscout.scanner import scan_path
+
+TOKEN = "ghp_" + "a" * 36
+
+
+def _files(root, n):
+    for i in range(n):
+        (root / f"m{i}.py").write_text(f'token_{i} = "{TOKEN}"\n', encoding="utf-8")
+
+
+def test_full_scan_drops_entries_of_deleted_and_excluded_files(tmp_path):
+    _files(tmp_path, 4)
+    scan_path(tmp_path, mode="all")
+    (tmp_path / "m0.py").unlink()
+    scan_path(tmp_path, mode="all", extra_exclude=["m1.py"])
+
+    cache = Cache(tmp_path)
+    cache.load()
+    assert sorted(cache._data) == ["m2.py", "m3.py"]
+    st = cache.stats()
+    assert (st.hits, st.misses) == (2, 0)
+    assert st.hit_rate == 1.0
+    assert st.ages["<1d"] == st.entries
+
+
+def test_save_evicts_least_recently_hit_entries(tmp_path):
+    cache = Cache(tmp_path, max_entries=2)
+    for i, rel in enumerate(["old.py", "mid.py", "new.py"]):
+        cache.put(rel, b"x", [])
+        cache._data[rel].last_hit = 1000.0 + i
+    cache.save()
+    cache.load()
+    assert sorted(cache._data) == ["mid.py", "new.py"]
+
+    cache.max_entries = 0
+    cache.max_size = len(cache.path.read_bytes()) // 2
+    cache.save()
+    cache.load()
+    assert list(cache._data) == ["new.py"]
+
+
+def test_version_1_cache_is_read_and_prune_clear_commands(tmp_path):
+    _files(tmp_path, 2)
+    cache_dir = tmp_path / ".secretscout-cache"
+    cache_dir.mkdir()
+    (cache_dir / "cache.json").write_text(
+        json.dumps({"m0.py": {"sha256": "x", "findings": []}, "gone.py": {"sha256": "y", "findings": []}}),
+        encoding="utf-8",
+    )
+    cache = Cache(tmp_path)
+    cache.load()
+    assert sorted(cache._data) == ["gone.py", "m0.py"]
+    assert cache.stats().ages["older"] == 2
+
+    assert cmd_cache_prune(tmp_path, max_age_days=None) == 0
+    cache.load()
+    assert list(cache._data) == ["m0.py"]
+
+    assert cmd_cache_clear(tmp_path) == 0
+    assert not (cache_dir / "cache.json").exists()
+
+
+def _repo(root, shared):
+    root.mkdir()
+    _files(root, 1)
+    for i in range(5):
+        (root / f"clean{i}.py").write_text(f"x = {i}\n", encoding="utf-8")
+    (root / ".secretscout.toml").write_text(f'[cache]\nmode = "content"\ndir = "{shared.as_posix()}"\n', encoding="utf-8")
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "."], cwd=root, check=True)
+    return root
+
+
+def test_content_store_is_shared_across_checkouts_and_archives(tmp_path, monkeypatch):
+    shared = tmp_path / "shared"
+    first = scan_path(_repo(tmp_path / "a", shared), mode="tracked")
+    assert [f.file for f in first] == ["m0.py"]
+
+    reads = []
+    real = scanner.read_file
+    monkeypatch.setattr(scanner, "read_file", lambda p, n: reads.append(p.name) or real(p, n))
+    fork = _repo(tmp_path / "fork", shared)
+    again = scan_path(fork, mode="tracked")
+    assert [f.file for f in again] == ["m0.py"]
+    assert reads == ["m0.py"]  # clean blobs are not even read
+
+    archive = tmp_path / "cache.tar.gz"
+    assert cmd_cache_export(fork, archive) == 0
+    other = tmp_path / "other"
+    monkeypatch.setenv("SECRETSCOUT_CACHE_DIR", str(other))
+    assert cmd_cache_import(fork, archive) == 0
+    assert [p.name for p in (other / "content").iterdir()] == [p.name for p in (shared / "content").iterdir()]
+
+
+def test_content_store_with_file_timeout_eviction_and_clear(tmp_path, monkeypatch):
+    shared = tmp_path / "shared"
+    repo = _repo(tmp_path / "a", shared)
+    # Files scanned in the per-file timeout process pool are recorded as clean too.
+    assert [f.file for f in scan_path(repo, mode="tracked", file_timeout=30.0)] == ["m0.py"]
+    reads = []
+    real = scanner.read_file
+    monkeypatch.setattr(scanner, "read_file", lambda p, n: reads.append(p.name) or real(p, n))
+    assert [f.file for f in scan_path(repo, mode="tracked", file_timeout=30.0)] == ["m0.py"]
+    assert reads == ["m0.py"]
+
+    # Eviction keeps the keys used most recently.
+    store_file = next((shared / "content").iterdir())
+    store = ContentStore(shared, store_file.stem, max_entries=3)
+    store.load()
+    old = list(store._keys)
+    fresh = "ab" * 20
+    store.add(fresh)
+    assert store.is_clean(old[-1].hex())
+    store.save()
+    store.load()
+    kept = list(store._keys)
+    assert set(kept[:2]) == {bytes.fromhex(fresh), old[-1]}
+    assert kept[2:] == [old[0]]
+
+    assert cmd_cache_clear(repo) == 0
+    assert not (shared / "content").exists()
@@ -0,0 +1,73 @@
+import subprocess
+
+from secretscout.baseline import write_baseline
+from secretscout.git import index_blob_ids
+from secretscout.rules import DEFAULT_RULES
+from secretscout.scanner import scan_bytes, scan_path
+from secretscout.util import blob_id, fingerprint
+
+TOKEN = "ghp_" + "a" * 36
+SOURCE = f'token = "{TOKEN}"\n'.encode()
+
+
+def _copies(root):
+    for rel in ("app.py", "vendor/a/app.py", "vendor/b/app.py", "third_party/app.py"):
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_bytes(SOURCE)
+    (root / ".secretscout.toml").write_text('[rules]\npath_allowlist = ["^third_party/"]\n', encoding="utf-8")
+    return root
+
+
+def test_scan_bytes_copies_get_their_own_fingerprints():
+    kwargs = dict(rules=DEFAULT_RULES, allowlist=[], redact_head=4, redact_tail=4)
+    single = scan_bytes("a.py", SOURCE, path_allowlist=[], baseline=set(), **kwargs)
+    skip_b = {fingerprint("github-token", "b.py", 1, TOKEN)}
+    out = scan_bytes("a.py", SOURCE, path_allowlist=[], baseline=skip_b, copies=["b.py", "c.py"], **kwargs)
+
+    assert [f.file for f in out] == ["a.py", "c.py"]
+    assert out[0] == single[0]
+    assert out[1].fingerprint == fingerprint("github-token", "c.py", 1, TOKEN)
+
+
+def test_duplicate_files_scanned_once_with_per_path_results(tmp_path, monkeypatch):
+    root = _copies(tmp_path)
+    calls = []
+    real = scan_bytes
+
+    def counting(rel, content, **kw):
+        calls.append((rel, tuple(kw.get("copies", ()))))
+        return real(rel, content, **kw)
+
+    monkeypatch.setattr("secretscout.scanner.scan_bytes", counting)
+    findings = scan_path(root, mode="all", use_cache=True)
+
+    assert sorted(f.file for f in findings) == ["app.py", "vendor/a/app.py", "vendor/b/app.py"]
+    assert len({f.fingerprint for f in findings}) == 3
+    assert len([c for c in calls if c[0].endswith("app.py")]) == 1
+
+    # Cache entries are per path, so a warm scan returns the same findings without scanning.
+    calls.clear()
+    again = scan_path(root, mode="all", use_cache=True)
+    assert calls == []
+    assert sorted(f.fingerprint for f in again) == sorted(f.fingerprint for f in findings)
+
+
+def test_tracked_mode_uses_index_blob_ids_and_baseline_per_path(tmp_path):
+    root = _copies(tmp_path)
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "."], cwd=root, check=True)
+    (root / "vendor/b/app.py").write_text("clean = True\n", encoding="utf-8")
+
+    ids = index_blob_ids(root)
+    assert ids["app.py"] == blob_id(SOURCE)
+    assert "vendor/b/app.py" not in ids  # modified in the working tree
+
+    baseline = tmp_path / "baseline.json"
+    write_baseline(baseline, [fingerprint("github-token", "app.py", 1, TOKEN)])
+    findings = scan_path(root, mode="tracked", baseline_path=baseline, use_cache=False)
+    assert [f.file for f in findings] == ["vendor/a/app.py"]
+
+    # Scanned from a subdirectory, the modified copy is still left out.
+    sub_ids = index_blob_ids(root / "vendor")
+    assert sub_ids["a/app.py"] == blob_id(SOURCE)
+    assert "b/app.py" not in sub_ids
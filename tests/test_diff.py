@@ -0,0 +1,65 @@
+from secretscout.commands import cmd_diff
+from secretscout.diff import diff_reports
+from secretscout.reporting import to_json, to_ndjson
+from secretscout.scanner import scan_path
+
+A = "ghp_" + "a" * 36
+B = "ghp_" + "b" * 36
+C = "ghp_" + "c" * 36
+
+
+def test_diff_ignores_moved_code(tmp_path, capsys):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    src = repo / "app.py"
+    src.write_text(f'a = "{A}"\nb = "{B}"\n', encoding="utf-8")
+    (tmp_path / "old.json").write_text(to_json(scan_path(repo, mode="all", use_cache=False)), encoding="utf-8")
+
+    # A moves down two lines, B is removed, C is new.
+    src.write_text(f'import os\n\na = "{A}"\nc = "{C}"\n', encoding="utf-8")
+    (tmp_path / "new.ndjson").write_text(to_ndjson(scan_path(repo, mode="all", use_cache=False)), encoding="utf-8")
+
+    d = diff_reports(tmp_path / "old.json", tmp_path / "new.ndjson")
+    assert [f.snippet for f in d.iter_added()] == ['c = "ghp_…cccc"']
+    assert [f.snippet for f in d.iter_fixed()] == ['b = "ghp_…bbbb"']
+    assert (d.unchanged, d.moved) == (1, 1)
+
+    args = {"fmt": "minimal", "output": None, "max_findings": None}
+    assert cmd_diff(tmp_path / "old.json", tmp_path / "new.ndjson", fail_on="high", **args) == 1
+    assert cmd_diff(tmp_path / "old.json", tmp_path / "new.ndjson", fail_on="critical", **args) == 0
+    assert cmd_diff(tmp_path / "new.ndjson", tmp_path / "new.ndjson", fail_on="low", **args) == 0
+    assert "1 new, 1 fixed, 1 unchanged (1 moved)" in capsys.readouterr().err
+
+
+def test_from_last_report_diffs_like_a_fresh_one(tmp_path, capsys):
+    from secretscout.commands import load_last, run_and_record
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    src = repo / "app.py"
+    src.write_text(f'a = "{A}"\n', encoding="utf-8")
+    run_and_record(repo, "all", None, [], use_cache=True)
+    (tmp_path / "old.json").write_text(to_json(load_last(repo, "all", None)), encoding="utf-8")
+
+    src.write_text(f'import os\n\na = "{A}"\n', encoding="utf-8")
+    (tmp_path / "new.json").write_text(to_json(scan_path(repo, mode="all", use_cache=False)), encoding="utf-8")
+
+    args = {"fmt": "minimal", "output": None, "max_findings": None}
+    assert cmd_diff(tmp_path / "old.json", tmp_path / "new.json", fail_on="low", **args) == 0
+    assert "0 new, 0 fixed, 1 unchanged (1 moved)" in capsys.readouterr().err
+
+
+def test_rotated_secret_with_the_same_redaction_is_not_moved(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    src = repo / "app.py"
+    src.write_text(f'a = "{A}"\n', encoding="utf-8")
+    (tmp_path / "old.ndjson").write_text(to_ndjson(scan_path(repo, mode="all", use_cache=False)), encoding="utf-8")
+
+    # Same first and last characters, so the same redacted snippet, on another line.
+    rotated = "ghp_" + "b" * 32 + "aaaa"
+    src.write_text(f'\na = "{rotated}"\n', encoding="utf-8")
+    (tmp_path / "new.ndjson").write_text(to_ndjson(scan_path(repo, mode="all", use_cache=False)), encoding="utf-8")
+
+    d = diff_reports(tmp_path / "old.ndjson", tmp_path / "new.ndjson")
+    assert (len(d.added), len(d.fixed), d.moved) == (1, 1, 0)
@@ -0,0 +1,116 @@
+import base64
+import json
+import os
+
+from secretscout.formats import handler_for
+from secretscout.scanner import scan_path
+
+TOKEN = "ghp_" + "a" * 36
+
+
+def _notebook() -> str:
+    png = base64.b64encode(os.urandom(60_000)).decode() + "\n"
+    inline = base64.b64encode(os.urandom(300)).decode()
+    doc = {
+        "cells": [
+            {"cell_type": "markdown", "metadata": {}, "source": [f"![plot](data:image/png;base64,{inline})\n"]},
+            {
+                "cell_type": "code",
+                "execution_count": 1,
+                "metadata": {},
+                "source": ["import os\n", f'token = "{TOKEN}"\n', "plot()\n"],
+                "outputs": [
+                    {"output_type": "stream", "name": "stdout", "text": [f"api_key={TOKEN}\n"]},
+                    {"output_type": "display_data", "metadata": {}, "data": {"image/png": png, "text/plain": ["<Figure>"]}},
+                ],
+            },
+        ],
+        "metadata": {},
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+    return json.dumps(doc, indent=1, ensure_ascii=False) + "\n"
+
+
+def test_notebook_payloads_are_masked_and_lines_kept(tmp_path):
+    text = _notebook()
+    masked = handler_for("analysis/Plots.ipynb")(text)
+    assert masked.count("\n") == text.count("\n")
+    assert len(masked) < len(text) // 10
+    assert masked.splitlines()[10] == text.splitlines()[10]
+
+
+def test_notebook_scan_reports_original_lines_without_payload_noise(tmp_path):
+    text = _notebook()
+    (tmp_path / ".secretscout.toml").write_text("[scan]\nmax_file_size = 4096\n", encoding="utf-8")
+    (tmp_path / "nb.ipynb").write_text(text, encoding="utf-8")
+
+    findings = scan_path(tmp_path, mode="all", use_cache=False)
+
+    lines = text.splitlines()
+    expected = sorted(i for i, line in enumerate(lines, 1) if TOKEN in line)
+    # Scanned although bigger than max_file_size, and only the secrets are reported.
+    assert sorted(f.line for f in findings if f.rule_id == "github-token") == expected
+    assert not [f for f in findings if f.rule_id == "high-entropy"]
+
+
+def test_lockfile_integrity_hashes_are_masked():
+    lock = json.dumps(
+        {"packages": {"node_modules/a": {"version": "1.0.0", "integrity": "sha512-" + "Zm9v" * 20}}}, indent=2
+    )
+    masked = handler_for("web/package-lock.json")(lock)
+    assert '"integrity": ""' in masked
+    assert masked.count("\n") == lock.count("\n")
+    assert handler_for("src/app.json") is None
+
+
+def test_har_text_bodies_are_decoded_and_binary_ones_masked(tmp_path):
+    def entry(mime, text, encoding=None):
+        content = {"mimeType": mime, "text": text}
+        if encoding:
+            content["encoding"] = encoding
+        return {"request": {"url": "https://api.example.com"}, "response": {"content": content}}
+
+    body = base64.b64encode(json.dumps({"user": "x", "token": TOKEN}).encode()).decode()
+    entries = [
+        entry("application/json; charset=utf-8", body, "base64"),
+        entry("image/svg+xml", f"<svg><!-- {TOKEN} --></svg>"),
+        entry("image/png", base64.b64encode(TOKEN.encode()).decode(), "base64"),
+        entry("application/octet-stream", TOKEN),
+    ]
+    text = json.dumps({"log": {"entries": entries}}, indent=1) + "\n"
+    masked = handler_for("capture.har")(text)
+    assert masked.count("\n") == text.count("\n")
+
+    (tmp_path / "capture.har").write_text(text, encoding="utf-8")
+    findings = [f for f in scan_path(tmp_path, mode="all", use_cache=False) if f.rule_id == "github-token"]
+    lines = text.splitlines()
+    assert sorted(f.line for f in findings) == [
+        next(i for i, line in enumerate(lines, 1) if body in line),
+        next(i for i, line in enumerate(lines, 1) if "<svg>" in line),
+    ]
+
+
+def test_masking_is_part_of_the_dedupe_and_store_key(tmp_path):
+    doc = {
+        "cells": [
+            {
+                "cell_type": "code",
+                "metadata": {},
+                "source": ["plot()\n"],
+                "outputs": [{"output_type": "display_data", "metadata": {}, "data": {"image/png": f"{TOKEN}\n"}}],
+            }
+        ],
+        "metadata": {},
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+    text = json.dumps(doc, indent=1) + "\n"
+    (tmp_path / ".secretscout.toml").write_text('[cache]\nmode = "content"\n', encoding="utf-8")
+    (tmp_path / "a.ipynb").write_text(text, encoding="utf-8")
+    (tmp_path / "z.json").write_text(text, encoding="utf-8")
+
+    # The payload is masked in the notebook only; its copy under another name is matched as is.
+    for _ in range(2):  # the second run is answered by the content store and the cache
+        findings = scan_path(tmp_path, mode="all")
+        assert {(f.file, f.rule_id) for f in findings} == {("z.json", "github-token")}
@@ -0,0 +1,148 @@
+import gzip
+import hashlib
+import io
+import json
+import tarfile
+
+import pytest
+import typer
+
+import secretscout.image as image
+from secretscout.commands import cmd_scan_image
+from secretscout.image import render_images, scan_images
+
+TOKEN = "ghp_" + "a" * 36
+
+
+def _layer(files: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _add(tar, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def _docker_save(path, images):
+    """images: {tag: [layer bytes, ...]}; layers with equal bytes are shared."""
+    manifest = []
+    with tarfile.open(path, "w") as tar:
+        added = set()
+        for tag, layers in images.items():
+            digests = ["sha256:" + hashlib.sha256(layer).hexdigest() for layer in layers]
+            for d, layer in zip(digests, layers, strict=True):
+                if d not in added:
+                    _add(tar, f"{d[7:]}/layer.tar", layer)
+                    added.add(d)
+            config = json.dumps({"rootfs": {"type": "layers", "diff_ids": digests}}).encode()
+            config_name = hashlib.sha256(config).hexdigest() + ".json"
+            _add(tar, config_name, config)
+            manifest.append({"Config": config_name, "RepoTags": [tag], "Layers": [f"{d[7:]}/layer.tar" for d in digests]})
+        _add(tar, "manifest.json", json.dumps(manifest).encode())
+
+
+def test_docker_save_whiteouts_and_layer_dedupe(tmp_path, monkeypatch):
+    secret = f'token = "{TOKEN}"\n'.encode()
+    base = _layer({"app/.env": secret, "etc/old.conf": secret, "srv/cache/key": secret, "node_modules/x.js": secret})
+    top_a = _layer({"etc/.wh.old.conf": b"", "srv/.wh..wh..opq": b"", "app/main.py": b"print(1)\n"})
+    top_b = _layer({"app/.env": b"TOKEN=\n"})
+    archive = tmp_path / "images.tar"
+    _docker_save(archive, {"app:a": [base, top_a], "app:b": [base, top_b]})
+
+    calls = []
+    real = image.scan_layer
+
+    def counting(fh, digest, setup, patterns):
+        calls.append(digest)
+        return real(fh, digest, setup, patterns)
+
+    monkeypatch.setattr(image, "scan_layer", counting)
+    a, b = scan_images([archive], tmp_path)
+
+    assert len(calls) == 3  # the shared base layer once
+    assert [f.file for f in a.findings] == ["app/.env"]
+    # node_modules/ is excluded by default, inside images too.
+    assert sorted(f.file for f in a.deleted) == ["etc/old.conf", "srv/cache/key"]
+    assert sorted(f.file for f in b.findings) == ["etc/old.conf", "srv/cache/key"]
+    assert [f.file for f in b.deleted] == ["app/.env"]  # overwritten by a clean file
+    assert all(f.layer == "sha256:" + hashlib.sha256(base).hexdigest() for f in a.findings)
+    assert (a.layers, a.layers_cached, b.layers_cached) == (2, 0, 1)
+
+    # A second run answers every layer from the cache records.
+    calls.clear()
+    again = scan_images([archive], tmp_path)
+    assert calls == []
+    assert [r.layers_cached for r in again] == [2, 2]
+    assert [f.fingerprint for f in again[0].findings] == [f.fingerprint for f in a.findings]
+
+    payload = json.loads(render_images(again, "json", 10))
+    assert payload["count"] == 3 and payload["deleted_count"] == 3
+
+    out = tmp_path / "report.txt"
+    monkeypatch.chdir(tmp_path)
+    assert cmd_scan_image([archive], "minimal", out, "high", None, [], False, 10) == 1
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 6 and sum("\tdeleted\t" in line for line in lines) == 3
+    with pytest.raises(typer.BadParameter):
+        cmd_scan_image([archive], "table", out, "high", None, [], False, 10)
+
+
+def test_sarif_marks_only_the_hidden_copy_deleted(tmp_path, monkeypatch):
+    secret = f'token = "{TOKEN}"\n'.encode()
+    base = _layer({"app/.env": secret})
+    top = _layer({"app/.env": secret, "app/main.py": b"print(1)\n"})  # rewritten unchanged
+    archive = tmp_path / "images.tar"
+    _docker_save(archive, {"app:1": [base, top]})
+
+    [result] = scan_images([archive], tmp_path, use_cache=False)
+    assert [f.fingerprint for f in result.findings] == [f.fingerprint for f in result.deleted]
+    [run] = json.loads(render_images([result], "sarif", 10))["runs"]
+    marks = {(r["properties"]["layer"], r["properties"]["deleted"]) for r in run["results"]}
+    layer = {data: "sha256:" + hashlib.sha256(data).hexdigest() for data in (base, top)}
+    assert marks == {(layer[base], True), (layer[top], False)}
+
+    out = tmp_path / "report.txt"
+    monkeypatch.chdir(tmp_path)
+    # --max-findings 0 lists nothing rather than falling back to the config.
+    assert cmd_scan_image([archive], "minimal", out, "high", None, [], True, 0) == 1
+    assert out.read_text(encoding="utf-8") == ""
+
+
+def test_oci_layout_with_gzip_layers(tmp_path):
+    layout = tmp_path / "oci"
+    blobs = layout / "blobs" / "sha256"
+    blobs.mkdir(parents=True)
+
+    def blob(data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        (blobs / digest).write_bytes(data)
+        return "sha256:" + digest
+
+    layer = gzip.compress(_layer({"./srv/settings.py": f'key = "{TOKEN}"\n'.encode()}))
+    manifest = {
+        "schemaVersion": 2,
+        "layers": [{"mediaType": "application/vnd.oci.image.layer.v1.tar+gzip", "digest": blob(layer), "size": len(layer)}],
+    }
+    index = {
+        "schemaVersion": 2,
+        "manifests": [
+            {
+                "mediaType": "application/vnd.oci.image.manifest.v1+json",
+                "digest": blob(json.dumps(manifest).encode()),
+                "annotations": {"org.opencontainers.image.ref.name": "svc:1.0"},
+            }
+        ],
+    }
+    (layout / "index.json").write_text(json.dumps(index), encoding="utf-8")
+
+    [result] = scan_images([layout], tmp_path, use_cache=False)
+    assert result.error is None
+    assert result.name == "svc:1.0"
+    assert [(f.file, f.line) for f in result.findings] == [("srv/settings.py", 1)]
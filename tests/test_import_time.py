@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+# About 3x the measured cost (~100 ms), so an eager rich/typer import shows up.
+HOOK_IMPORT_BUDGET_US = 300_000
+HEAVY = ("typer", "click", "rich", "sqlite3", "multiprocessing")
+
+
+def _importtime(module):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def _loaded(module):
+    proc = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print('\\n'.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(proc.stdout.split())
+
+
+def test_hook_import_is_lightweight():
+    modules = _importtime("secretscout.hook")
+    assert not {m for m in modules if m.split(".")[0] in HEAVY}
+    assert not {m for m in _loaded("secretscout.hook") if m.split(".")[0] in HEAVY}
+    assert modules["secretscout.hook"] < HOOK_IMPORT_BUDGET_US
+
+
+def test_cli_import_defers_rich_and_storage():
+    modules = _importtime("secretscout.cli")
+    deferred = ("rich", "sqlite3", "multiprocessing")
+    assert not {m for m in modules if m.split(".")[0] in deferred}
+    assert not {m for m in _loaded("secretscout.cli") if m.split(".")[0] in deferred}
@@ -0,0 +1,91 @@
+import subprocess
+
+from secretscout.incremental import incremental_scan, load_state
+from secretscout.scanner import scan_bytes
+
+TOKEN = "ghp_" + "a" * 36
+
+
+def _git(root, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _counting(monkeypatch):
+    scanned = []
+
+    def counting(rel, content, **kw):
+        scanned.append(rel)
+        return scan_bytes(rel, content, **kw)
+
+    monkeypatch.setattr("secretscout.scanner.scan_bytes", counting)
+    return scanned
+
+
+def test_incremental_rescans_only_changed_files(tmp_path, monkeypatch):
+    (tmp_path / "a.py").write_text(f'token = "{TOKEN}"\n', encoding="utf-8")
+    (tmp_path / "b.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "c.py").write_text("y = 2\n", encoding="utf-8")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", "a.py", "b.py", "c.py")
+    _git(tmp_path, "commit", "-qm", "init")
+    scanned = _counting(monkeypatch)
+
+    findings, full = incremental_scan(tmp_path, use_cache=False)
+    assert full and sorted(scanned) == ["a.py", "b.py", "c.py"]
+    assert [f.file for f in findings] == ["a.py"]
+
+    # A committed change and a working-tree edit: only those two are read again, and the
+    # finding of a.py comes from the stored state.
+    scanned.clear()
+    (tmp_path / "b.py").write_text(f'key = "{TOKEN}"\n', encoding="utf-8")
+    _git(tmp_path, "commit", "-qam", "b")
+    (tmp_path / "c.py").write_text("y = 3\n", encoding="utf-8")
+    findings, full = incremental_scan(tmp_path, use_cache=False)
+    assert not full and sorted(scanned) == ["b.py", "c.py"]
+    assert sorted(f.file for f in findings) == ["a.py", "b.py"]
+    state = load_state(tmp_path)
+    assert state is not None and state.dirty == ["c.py"]
+
+    # c.py was dirty last time, so reverting it is noticed too.
+    scanned.clear()
+    (tmp_path / "c.py").write_text("y = 2\n", encoding="utf-8")
+    findings, full = incremental_scan(tmp_path, use_cache=False)
+    assert not full and scanned == ["c.py"]
+    assert len(findings) == 2
+
+
+def test_incremental_falls_back_to_full_scan_on_config_change(tmp_path, monkeypatch):
+    (tmp_path / "a.py").write_text("x = 1\n", encoding="utf-8")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", "a.py")
+    _git(tmp_path, "commit", "-qm", "init")
+    scanned = _counting(monkeypatch)
+    incremental_scan(tmp_path, use_cache=False)
+
+    scanned.clear()
+    _, full = incremental_scan(tmp_path, use_cache=False, extra_exclude=["docs/**"])
+    assert full and scanned == ["a.py"]
+
+
+def test_incremental_scan_of_a_subdirectory(tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / "a.py").write_text("x = 1\n", encoding="utf-8")
+    (sub / "b.py").write_text("y = 1\n", encoding="utf-8")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "init")
+    assert incremental_scan(sub, use_cache=False) == ([], True)
+
+    # Both git diff and git status print paths from the top of the repository.
+    (sub / "a.py").write_text(f'token = "{TOKEN}"\n', encoding="utf-8")
+    _git(tmp_path, "commit", "-qam", "a")
+    (sub / "b.py").write_text(f'key = "{TOKEN}"\n', encoding="utf-8")
+    findings, full = incremental_scan(sub, use_cache=False)
+    assert not full
+    assert sorted(f.file for f in findings) == ["a.py", "b.py"]
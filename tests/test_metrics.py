@@ -0,0 +1,54 @@
+import json
+
+from secretscout.metrics import ScanMetrics
+from secretscout.scanner import scan_path
+
+TOKEN = "ghp_" + "a" * 36
+
+
+def _tree(root):
+    (root / "a.py").write_text(f'token = "{TOKEN}"\n', encoding="utf-8")
+    (root / "copy.py").write_text(f'token = "{TOKEN}"\n', encoding="utf-8")
+    (root / "clean.py").write_text("x = 1\n", encoding="utf-8")
+    (root / "blob.bin").write_bytes(b"\x00\x01" * 10)
+    (root / "big.txt").write_bytes(b"x" * 2048)
+    (root / "gen.py").write_text("# secretscout:ignore-file\n", encoding="utf-8")
+    (root / "skip.log").write_text("log\n", encoding="utf-8")
+    (root / ".secretscout.toml").write_text("[scan]\nmax_file_size = 1024\n", encoding="utf-8")
+    return root
+
+
+def test_scan_metrics_count_files_skips_cache_and_findings(tmp_path):
+    root = _tree(tmp_path)
+    m = ScanMetrics()
+    scan_path(root, mode="all", extra_exclude=["*.log"], metrics=m)
+
+    d = m.to_dict()
+    assert d["files"]["listed"] == 7
+    assert d["files"]["scanned"] == 4  # a.py, copy.py, clean.py, .secretscout.toml
+    assert d["files"]["deduplicated"] == 1
+    assert d["files"]["skipped"] == {"excluded": 1, "size": 1, "binary": 1, "ignore_marker": 1, "unreadable": 0, "time_budget": 0}
+    assert d["cache"] == {"hits": 0, "misses": 4, "hit_ratio": 0.0, "content_store_hits": 0}
+    assert d["findings"] == {"by_rule": {"github-token": 2}, "by_severity": {"high": 2}}
+    assert d["file_scan_seconds"]["count"] == 3
+    assert set(d["stages_s"]) >= {"walk", "read", "scan"}
+
+    warm = ScanMetrics()
+    scan_path(root, mode="all", extra_exclude=["*.log"], metrics=warm)
+    assert warm.cache_hit_ratio == 1.0
+
+
+def test_metrics_written_as_prometheus_textfile_or_json(tmp_path):
+    m = ScanMetrics(mode="all", files_scanned=3, finished_at=1792410000.5)
+    m.file_seconds.extend([0.0005, 0.2])
+
+    m.write(tmp_path / "scan.prom")
+    text = (tmp_path / "scan.prom").read_text(encoding="utf-8")
+    assert "# TYPE secretscout_files_scanned gauge" in text
+    assert 'secretscout_files_scanned{mode="all"} 3' in text
+    assert 'secretscout_last_run_timestamp_seconds{mode="all"} 1792410000.5' in text
+    assert 'secretscout_file_scan_seconds_bucket{le="0.001"} 1' in text
+    assert 'secretscout_file_scan_seconds_bucket{le="+Inf"} 2' in text
+
+    m.write(tmp_path / "scan.json")
+    assert json.loads((tmp_path / "scan.json").read_text(encoding="utf-8"))["files"]["scanned"] == 3
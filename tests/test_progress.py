@@ -0,0 +1,32 @@
+import io
+
+from secretscout.progress import ScanProgress
+from secretscout.scanner import scan_path
+
+TOKEN = "ghp_" + "a" * 36
+
+
+def test_progress_counts_every_listed_file(tmp_path):
+    for i in range(5):
+        (tmp_path / f"m{i}.py").write_text(f"x = {i}\n", encoding="utf-8")
+    (tmp_path / "dup.py").write_text("x = 0\n", encoding="utf-8")
+    (tmp_path / "leak.py").write_text(f'token = "{TOKEN}"\n', encoding="utf-8")
+    out = io.StringIO()
+
+    with ScanProgress(stream=out, interactive=False) as progress:
+        findings = scan_path(tmp_path, mode="all", use_cache=False, progress=progress)
+
+    assert not progress.listing
+    assert progress.files_done == progress.files_total == 7
+    assert progress.bytes_done == progress.bytes_total
+    assert progress.findings == len(findings) == 1
+    # Without a terminal a final line is logged on exit.
+    assert out.getvalue().startswith("secretscout: 7/7 files")
+    assert progress.eta == 0
+
+
+def test_progress_line_while_listing():
+    progress = ScanProgress(stream=io.StringIO(), interactive=False)
+    progress.discovered(3, 2 * 1024 * 1024)
+    assert progress.line() == "listing: 3 files, 2.0 MB found"
+    assert progress.eta is None
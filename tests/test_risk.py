@@ -0,0 +1,72 @@
+import json
+
+from secretscout.metrics import ScanMetrics
+from secretscout.models import Coverage
+from secretscout.reporting import emit, iter_report_findings
+from secretscout.risk import prioritise, risk_score
+from secretscout.rules import DEFAULT_RULES
+from secretscout.scanner import scan_bytes, scan_path
+
+TOKEN = "ghp_" + "a" * 36
+
+
+def test_risk_score_orders_secret_prone_files_first(tmp_path):
+    assert risk_score(".env.production", recent=False, past_findings=False) > risk_score("app.py", False, False)
+    assert risk_score("deploy/prod.tfvars", False, False) > risk_score("app.py", True, False)
+    assert risk_score("app.py", False, past_findings=True) > risk_score("app_config.py", False, False)
+
+    for name in ("main.py", "certs/server.pem", "settings.py"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("x\n", encoding="utf-8")
+    entries = [(n, None) for n in ("main.py", "certs/server.pem", "settings.py")]
+    ordered, sizes = prioritise(tmp_path, entries, recent=set(), committed={"main.py"}, past_findings=lambda r: False)
+    # main.py is committed and not changed recently; the others count as recently modified.
+    assert [e[0] for e in ordered] == ["certs/server.pem", "settings.py", "main.py"]
+    assert sizes == {"main.py": 2, "certs/server.pem": 2, "settings.py": 2}
+
+
+def test_time_budget_scans_riskiest_first_and_reports_coverage(tmp_path, monkeypatch):
+    (tmp_path / ".secretscout.toml").write_text("[scan]\nthreads = 1\n", encoding="utf-8")
+    (tmp_path / ".env").write_text(f"TOKEN={TOKEN}\n", encoding="utf-8")
+    for i in range(4):
+        (tmp_path / f"m{i}.py").write_text(f"token = '{TOKEN}{i}'\n", encoding="utf-8")
+    real = scan_bytes
+    now = [0.0]
+
+    def slow(rel, content, **kw):
+        now[0] += 1.0  # each file takes a second of the fake clock
+        return real(rel, content, **kw)
+
+    monkeypatch.setattr("secretscout.scanner.scan_bytes", slow)
+    m = ScanMetrics()
+    findings = scan_path(
+        tmp_path, mode="all", use_cache=False, metrics=m, time_budget=0.5, clock=lambda: now[0]
+    )
+
+    assert [f.file for f in findings] == [".env"]
+    cov = m.coverage
+    assert cov is not None and not cov.complete
+    assert (cov.files_scanned, cov.files_total) == (1, 6)
+    assert m.skipped["time_budget"] == 5
+    assert cov.bytes_total == sum(p.stat().st_size for p in tmp_path.iterdir())
+
+
+def test_coverage_in_every_format(tmp_path, capsys):
+    cov = Coverage(files_scanned=3, files_total=4, bytes_scanned=30, bytes_total=40)
+    assert json.loads(emit([], "json", 10, cov))["coverage"]["complete"] is False
+    assert json.loads(emit([], "sarif", 10, cov))["runs"][0]["properties"]["coverage"]["files_total"] == 4
+    assert "3/4 files" in emit([], "html", 10, cov)
+
+    report = tmp_path / "r.ndjson"
+    report.write_text(emit([], "ndjson", 10, cov), encoding="utf-8")
+    assert list(iter_report_findings(report)) == []
+    # The coverage record is recognised by content, wherever it is and however it is spaced.
+    found = scan_bytes("a.py", f't = "{TOKEN}"\n'.encode(), DEFAULT_RULES, [], [], set(), 4, 4)
+    lines = emit(found, "ndjson", 10, cov).splitlines()
+    report.write_text("\n".join([lines[0], "{ " + lines[-1][1:], *lines[:-1]]))
+    assert [f.file for f in iter_report_findings(report)] == ["a.py"] * 2
+
+    emit([], "minimal", 10, cov)
+    out = capsys.readouterr()
+    assert out.out == "OK\n"
+    assert out.err.startswith("Coverage: 3/4 files")
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from secretscout.rulepacks import RulePackError, load_rule_packs
+from secretscout.scanner import scan_path
+
+PACK = """
+[[rules]]
+id = "acme-api-key"
+title = "ACME API key"
+severity = "high"
+pattern = "\\\\bacme_[a-z0-9]{32}\\\\b"
+keywords = ["acme_"]
+tags = ["acme"]
+tests.positive = ["key = acme_0123456789abcdef0123456789abcdef"]
+tests.negative = ["acme_short"]
+"""
+
+
+def _project(tmp_path, pack=PACK):
+    (tmp_path / "rules.toml").write_text(pack, encoding="utf-8")
+    (tmp_path / ".secretscout.toml").write_text('[rules]\npacks = ["rules.toml"]\n', encoding="utf-8")
+    return tmp_path
+
+
+def test_rule_pack_is_scanned_and_cached(tmp_path):
+    root = _project(tmp_path)
+    (root / "app.py").write_text("ACME = 'acme_" + "a1" * 16 + "'\n", encoding="utf-8")
+
+    findings = scan_path(root, mode="all", use_cache=False)
+    assert [(f.file, f.rule_id) for f in findings if f.file == "app.py"] == [("app.py", "acme-api-key")]
+
+    rules = load_rule_packs(root, ["rules.toml"])
+    assert [r.id for r in rules] == ["acme-api-key"]
+    (artifact,) = (root / ".secretscout-cache" / "rulepacks").glob("*.json")
+    assert set(json.loads(artifact.read_text(encoding="utf-8"))) == {"version", "rules"}
+    assert load_rule_packs(root, ["rules.toml"]) == rules
+
+
+def test_rule_pack_change_invalidates_file_cache(tmp_path):
+    root = _project(tmp_path, PACK.replace('severity = "high"', 'severity = "low"'))
+    (root / "app.py").write_text("ACME = 'acme_" + "a1" * 16 + "'\n", encoding="utf-8")
+    assert {f.severity.value for f in scan_path(root, mode="all")} == {"low"}
+
+    _project(tmp_path)
+    assert {f.severity.value for f in scan_path(root, mode="all")} == {"high"}
+
+
+@pytest.mark.parametrize(
+    ("change", "message"),
+    [
+        (('id = "acme-api-key"', 'id = "github-token"'), "duplicate rule id"),
+        (('severity = "high"', 'severity = "urgent"'), "severity"),
+        (('"acme_short"', '"acme_' + "b" * 32 + '"'), "negative test vector matches"),
+        (('keywords = ["acme_"]', 'keywords = ["ACME_"]'), "lowercase"),
+        (('keywords = ["acme_"]', 'keywords = "acme_"'), "'keywords' must be a list of strings"),
+        (('keywords = ["acme_"]', 'keywords = [1]'), "'keywords' must be a list of strings"),
+        (('tests.negative = ["acme_short"]', 'tests.negative = "acme_short"'), "'negative' must be a list"),
+        (('tags = ["acme"]', 'tags = "acme"'), "'tags' must be a list of strings"),
+    ],
+)
+def test_rule_pack_validation(tmp_path, change, message):
+    root = _project(tmp_path, PACK.replace(*change))
+    with pytest.raises(RulePackError, match=message):
+        load_rule_packs(root, ["rules.toml"])
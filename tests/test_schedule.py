@@ -0,0 +1,35 @@
+from secretscout.profiling import Profiler
+from secretscout.scanner import scan_path
+from secretscout.schedule import CHUNK_FILES, auto_workers, plan_chunks
+
+
+def test_chunks_are_largest_first_and_batch_small_files():
+    sizes = [10] * 500 + [2_000_000, 300_000]
+    chunks = plan_chunks(sizes, workers=4)
+
+    assert chunks[0] == [500] and chunks[1] == [501]
+    assert sorted(i for c in chunks for i in c) == list(range(len(sizes)))
+    assert all(len(c) <= CHUNK_FILES for c in chunks)
+    assert len(chunks) < 20
+
+
+def test_auto_workers_follow_cpus_and_amount_of_content():
+    assert auto_workers(100, files=50, cpus=8) == 1
+    assert auto_workers(3 * 1024 * 1024, files=50, cpus=8) == 3
+    assert auto_workers(1 << 30, files=50, cpus=8) == 8
+    assert auto_workers(1 << 30, files=2, cpus=8) == 2
+    # Process pools are not limited by the GIL: every CPU, whatever the amount of content.
+    assert auto_workers(100, files=50, cpus=8, processes=True) == 8
+    assert auto_workers(100, files=3, cpus=8, processes=True) == 3
+
+
+def test_profile_reports_pool_utilisation(tmp_path):
+    for i in range(20):
+        (tmp_path / f"m{i}.py").write_text(f"x = {i}\n" * 50, encoding="utf-8")
+    profiler = Profiler()
+    scan_path(tmp_path, mode="all", use_cache=False, profiler=profiler)
+
+    pool = profiler.to_dict()["pool"]
+    assert pool["workers"] == 1
+    assert pool["chunks"] >= 1
+    assert 0 < pool["utilisation"] <= 1.0
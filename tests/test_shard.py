@@ -0,0 +1,60 @@
+import pytest
+
+from secretscout.commands import cmd_merge
+from secretscout.reporting import iter_report_findings, to_json, to_ndjson
+from secretscout.scanner import scan_path
+from secretscout.shard import parse_shard, select_shard
+
+TOKEN = "ghp_" + "d" * 36
+
+
+def _repo(tmp_path, n=40):
+    for i in range(n):
+        body = f'k = "{TOKEN}"\n' if i % 3 == 0 else "x = 1\n" * (i + 1)
+        (tmp_path / f"m{i}.py").write_text(body, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.mark.parametrize("by", ["hash", "size"])
+def test_shards_partition_the_scan(tmp_path, by):
+    root = _repo(tmp_path)
+    full = sorted(f.fingerprint for f in scan_path(root, mode="all", use_cache=False))
+    parts = [
+        sorted(f.fingerprint for f in scan_path(root, mode="all", use_cache=False, shard=parse_shard(f"{i}/3", by)))
+        for i in (1, 2, 3)
+    ]
+    assert sorted(fp for p in parts for fp in p) == full
+    assert all(parts)
+
+    entries = [(f"m{i}.py", None) for i in range(40)]
+    sizes = [
+        sum((root / rel).stat().st_size for rel, _ in select_shard(root, entries, parse_shard(f"{i}/3", by)))
+        for i in (1, 2, 3)
+    ]
+    if by == "size":
+        assert max(sizes) - min(sizes) <= max((root / rel).stat().st_size for rel, _ in entries)
+
+
+def test_parse_shard_rejects_bad_values():
+    for value in ("0/3", "4/3", "1", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_merge_json_and_ndjson_reports(tmp_path, capsys):
+    root = tmp_path / "repo"
+    root.mkdir()
+    _repo(root)
+    s1 = scan_path(root, mode="all", use_cache=False, shard=parse_shard("1/2"))
+    s2 = scan_path(root, mode="all", use_cache=False, shard=parse_shard("2/2"))
+    (tmp_path / "a.json").write_text(to_json(s1), encoding="utf-8")
+    (tmp_path / "b.ndjson").write_text(to_ndjson(s2), encoding="utf-8")
+    (tmp_path / "b-retry.ndjson").write_text(to_ndjson(s2), encoding="utf-8")
+
+    reports = [tmp_path / "a.json", tmp_path / "b.ndjson", tmp_path / "b-retry.ndjson"]
+    merged = tmp_path / "merged.json"
+    assert cmd_merge(reports, fmt="json", output=merged, fail_on="high", max_findings=None) == 1
+    assert sorted(f.fingerprint for f in iter_report_findings(merged)) == sorted(
+        f.fingerprint for f in [*s1, *s2]
+    )
+    assert cmd_merge(reports, fmt="json", output=merged, fail_on="critical", max_findings=None) == 0
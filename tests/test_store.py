@@ -0,0 +1,81 @@
+from secretscout.models import Finding, Severity
+from secretscout.store import ResultsStore
+
+
+def _finding(file: str, rule_id: str = "github-token") -> Finding:
+    return Finding(
+        rule_id=rule_id,
+        rule_title="GitHub token",
+        severity=Severity.high,
+        file=file,
+        line=1,
+        col=1,
+        match="ghp_…abcd",
+        snippet="ghp_…abcd",
+        fingerprint=file * 4,
+    )
+
+
+def test_store_returns_last_scan_per_mode(tmp_path):
+    store = ResultsStore(tmp_path)
+    store.record("tracked", [_finding("a.py")], started_at="t1", duration=0.1, config_hash="h")
+    last_id = store.record("tracked", [_finding("b.py"), _finding("c.py")], started_at="t2", duration=0.2, config_hash="h")
+    store.record("all", [], started_at="t3", duration=0.3, config_hash="h")
+
+    last = store.last_scan(mode="tracked")
+    assert last is not None
+    assert last.id == last_id
+    assert last.finding_count == 2
+    assert sorted(f.file for f in store.findings(last.id)) == ["b.py", "c.py"]
+    assert [s.mode for s in store.history()] == ["all", "tracked", "tracked"]
+    store.close()
+
+
+def test_store_keeps_the_newest_scans(tmp_path):
+    store = ResultsStore(tmp_path)
+    for i in range(5):
+        store.record("tracked", [_finding(f"{i}.py")], started_at=f"t{i}", duration=0.1, config_hash="h", keep=3)
+    scans = store.history()
+    assert [s.started_at for s in scans] == ["t4", "t3", "t2"]
+    assert store._db().execute("SELECT COUNT(*) FROM findings").fetchone()[0] == 3
+    store.close()
+
+
+def test_store_round_trips_optional_fields_and_migrates_old_stores(tmp_path):
+    import sqlite3
+
+    from secretscout.store import SCHEMA
+
+    store = ResultsStore(tmp_path)
+    # A store written before offset, layer and match_hash were recorded.
+    store.dir.mkdir()
+    old = sqlite3.connect(store.path)
+    old.executescript(SCHEMA.replace(",\n    offset INTEGER,\n    layer TEXT,\n    match_hash TEXT", ""))
+    old.close()
+
+    f = _finding("a.py")
+    f.offset, f.layer, f.match_hash = 42, "sha256:ab", "0123456789abcdef"
+    scan_id = store.record("all", [f], started_at="t", duration=0.1, config_hash="h")
+    assert store.findings(scan_id) == [f]
+    store.close()
+
+
+def test_from_last_applies_the_baseline_and_checks_the_config(tmp_path):
+    from secretscout.baseline import write_baseline
+    from secretscout.commands import load_last, run_and_record
+
+    token = "ghp_" + "a" * 36
+    (tmp_path / "a.py").write_text(f'token = "{token}"\n', encoding="utf-8")
+    (tmp_path / "b.py").write_text(f'key = "{token}"\n', encoding="utf-8")
+    found = run_and_record(tmp_path, "all", None, [], use_cache=True)
+    baseline = tmp_path / "baseline.json"
+    write_baseline(baseline, [f.fingerprint for f in found if f.file == "a.py"])
+
+    # Recorded before filtering: another baseline later still sees everything else.
+    assert [f.file for f in run_and_record(tmp_path, "all", baseline, [], use_cache=True)] == ["b.py"]
+    assert len(load_last(tmp_path, "all", None)) == 2
+    assert [f.file for f in load_last(tmp_path, "all", baseline)] == ["b.py"]
+
+    assert load_last(tmp_path, "all", None, exclude=["b.py"]) is None
+    (tmp_path / ".secretscout.toml").write_text("[rules]\ndisable = []\n", encoding="utf-8")
+    assert load_last(tmp_path, "all", None) is None
@@ -0,0 +1,56 @@
+import io
+
+from secretscout.models import Rule, Severity
+from secretscout.rules import DEFAULT_RULES
+from secretscout.scanner import scan_bytes
+from secretscout.stream import scan_stream
+
+TOKEN = "ghp_" + "a" * 36
+KW = {"allowlist": [], "path_allowlist": [], "baseline": set(), "redact_head": 4, "redact_tail": 4}
+
+
+class ChunkReader:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.reads = 0
+
+    def read1(self, n):
+        self.reads += 1
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+def test_stream_matches_file_scan_with_offsets():
+    content = "".join(f"line {i}\n" if i % 50 else f'token = "{TOKEN}"\n' for i in range(1, 400)).encode()
+    expected = scan_bytes("<stdin>", content, rules=DEFAULT_RULES, **KW)
+    found = list(scan_stream(io.BytesIO(content), {**KW, "rules": DEFAULT_RULES}, chunk_size=100))
+
+    assert [(f.rule_id, f.line, f.col) for f in found] == [(f.rule_id, f.line, f.col) for f in expected]
+    for f in found:
+        assert content[f.offset :].startswith(b'token = "ghp_')
+
+
+def test_findings_are_yielded_before_the_stream_ends():
+    reader = ChunkReader([f'a = "{TOKEN}"\n'.encode(), b"more\n", b"and more\n"])
+    it = scan_stream(reader, {**KW, "rules": DEFAULT_RULES})
+    assert next(it).rule_id == "github-token"
+    assert reader.reads == 1
+
+
+def test_multiline_rule_across_blocks_and_long_lines():
+    rule = Rule(
+        id="two-line",
+        title="Two line secret",
+        description="",
+        severity=Severity.high,
+        pattern=r"^BEGIN-SECRET\n[0-9a-f]{8}$",
+        multiline=True,
+    )
+    filler = b"x" * 5000  # one long line without a newline, split into pieces
+    content = filler + b"\nnoise\nBEGIN-SECRET\n" + b"0123abcd\n" + f'k="{TOKEN}"'.encode()
+    chunks = [content[i : i + 7] for i in range(0, len(content), 7)]
+    found = list(
+        scan_stream(ChunkReader(chunks), {**KW, "rules": [rule, *DEFAULT_RULES]}, max_line=1024, lookbehind=64)
+    )
+
+    assert [(f.rule_id, f.line) for f in found] == [("two-line", 3), ("github-token", 5)]
+    assert found[0].offset == content.index(b"BEGIN-SECRET")
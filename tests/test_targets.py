@@ -0,0 +1,121 @@
+import subprocess
+
+from typer.testing import CliRunner
+
+from secretscout.cli import app
+from secretscout.commands import read_file_list
+from secretscout.fix import PRE_COMMIT_SNIPPET, apply_fix
+from secretscout.hook import main as hook_main
+from secretscout.scanner import scan_path
+
+TOKEN = "ghp_" + "a" * 36
+
+
+def _git(root, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _monorepo(root):
+    for rel in ("services/payments/app.py", "services/search/app.py", "top.py"):
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(f'token = "{TOKEN}"\n', encoding="utf-8")
+
+
+def test_pathspecs_tracked_and_walked(tmp_path, monkeypatch):
+    _monorepo(tmp_path)
+    # Without git the pathspec is matched while walking only services/payments.
+    found = scan_path(tmp_path, mode="all", use_cache=False, pathspecs=["services/payments/**"])
+    assert [f.file for f in found] == ["services/payments/app.py"]
+
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "init")
+    calls = []
+    real = subprocess.run
+
+    def spy(args, **kw):
+        calls.append(args)
+        return real(args, **kw)
+
+    monkeypatch.setattr(subprocess, "run", spy)
+    found = scan_path(tmp_path, mode="tracked", use_cache=False, pathspecs=["services/payments/**", "top.py"])
+    assert sorted(f.file for f in found) == ["services/payments/app.py", "top.py"]
+    ls_files = [c for c in calls if "ls-files" in c]
+    assert ls_files and all(c[-3:] == ["--", "services/payments/**", "top.py"] for c in ls_files)
+
+
+def test_file_arguments_and_files_from(tmp_path, monkeypatch):
+    _monorepo(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    listing = tmp_path / "list.bin"
+    listing.write_bytes(b"services/search/app.py\0top.py\0")
+    assert read_file_list(listing, null_separated=True) == ["services/search/app.py", "top.py"]
+
+    runner = CliRunner()
+    res = runner.invoke(app, ["scan", ".", "services/payments/app.py", "--all", "--format", "minimal", "--no-cache"])
+    assert res.exit_code == 1
+    assert "services/payments/app.py" in res.output and "top.py" not in res.output
+
+    res = runner.invoke(
+        app, ["scan", ".", "--all", "--files-from", str(listing), "-z", "--format", "minimal", "--no-cache"]
+    )
+    assert res.exit_code == 1
+    assert "services/search/app.py" in res.output and "payments" not in res.output
+
+    res = runner.invoke(app, ["scan", "top.py", "services/payments/app.py", "--all", "--no-cache"])
+    assert res.exit_code == 2
+    assert "PATH must be a directory" in res.output
+
+
+def test_staged_files_from_a_subdirectory(tmp_path):
+    _monorepo(tmp_path)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    sub = tmp_path / "services" / "payments"
+    # The worktree no longer has the secret; the index still does.
+    (sub / "app.py").write_text("token = None\n", encoding="utf-8")
+
+    for only in (["app.py"], None):
+        found = scan_path(sub, mode="staged", use_cache=False, only=only)
+        assert [(f.file, f.line) for f in found] == [("app.py", 1)]
+
+
+def test_hook_scans_passed_filenames(tmp_path, monkeypatch, capsys):
+    assert "pass_filenames: true" in PRE_COMMIT_SNIPPET
+    _monorepo(tmp_path)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    monkeypatch.chdir(tmp_path)
+    assert hook_main(["--no-cache", "top.py"]) == 1
+    out = capsys.readouterr().out
+    assert "top.py" in out and "services/" not in out
+
+
+def test_fix_upgrades_serial_hook(tmp_path):
+    head = PRE_COMMIT_SNIPPET[: PRE_COMMIT_SNIPPET.index("      entry:")]
+    serial = (
+        "repos:\n"
+        + head
+        + "      entry: secretscout-hook --fail-on high\n"
+        + "      language: system\n"
+        + "      pass_filenames: false\n"
+        + "- repo: https://example.com/other\n"
+        + "  hooks:\n"
+        + "    - id: other\n"
+    )
+    pc = tmp_path / ".pre-commit-config.yaml"
+    pc.write_text(serial, encoding="utf-8")
+
+    changes = apply_fix(tmp_path)
+    assert any("now takes file names" in c for c in changes)
+    text = pc.read_text(encoding="utf-8")
+    assert text == "repos:\n" + PRE_COMMIT_SNIPPET + serial[serial.index("- repo: https") :]
+    assert "pass_filenames: false" not in text and text.count("id: secretscout") == 1
+
+    apply_fix(tmp_path)
+    assert pc.read_text(encoding="utf-8") == text